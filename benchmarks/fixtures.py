@@ -0,0 +1,76 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Fixed end date so a fixture covers the same days whenever it is built
+END_DATE = "2024-12-31"
+SCALES = (1, 10, 30)
+
+
+def synthetic_prices(years: int, seed: int = 0, end: str = END_DATE) -> pd.DataFrame:
+    """
+    Deterministic business-day OHLCV bars from a seeded geometric random
+    walk, shaped like PriceStore.get() output.
+    """
+    index = pd.bdate_range(end=end, periods=int(round(years * 252)), name="Date")
+    n = len(index)
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n)))
+    open_ = close * np.exp(rng.normal(0.0, 0.005, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0.0, 0.005, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0.0, 0.005, n)))
+    volume = rng.integers(100_000, 10_000_000, n)
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def fixture_path(ticker: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+    return os.path.join(FIXTURE_DIR, f"{safe}.csv.gz")
+
+
+def recorded_tickers() -> list:
+    """Tickers with a recorded fixture file."""
+    if not os.path.isdir(FIXTURE_DIR):
+        return []
+    return sorted(name[: -len(".csv.gz")] for name in os.listdir(FIXTURE_DIR) if name.endswith(".csv.gz"))
+
+
+def record_fixture(ticker: str, years: int = max(SCALES), end: str = END_DATE) -> str:
+    """
+    Download ``years`` of daily bars up to ``end`` once and save them as a
+    fixture, so later benchmark runs replay real prices offline.
+    """
+    from price_store import yahoo_downloader
+
+    start = pd.Timestamp(end) - pd.DateOffset(years=years)
+    df = yahoo_downloader(ticker, start=start.date().isoformat(), end=end)
+    if df.empty:
+        raise ValueError(f"No price data found for ticker: {ticker}")
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    path = fixture_path(ticker)
+    df.rename_axis("Date").to_csv(path, float_format="%.6f")
+    return path
+
+
+def recorded_prices(ticker: str, years: int, end: str = END_DATE) -> pd.DataFrame:
+    """The last ``years`` of a recorded fixture (fewer if the recording is shorter)."""
+    df = pd.read_csv(fixture_path(ticker), index_col="Date", parse_dates=True)
+    start = pd.Timestamp(end) - pd.DateOffset(years=years)
+    return df[(df.index > start) & (df.index <= pd.Timestamp(end))]
+
+
+def fixture_downloader(prices: pd.DataFrame):
+    """PriceStore downloader that serves ``prices``, so simulators run offline."""
+
+    def download(ticker: str, start=None, end=None) -> pd.DataFrame:
+        df = prices
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df.index < pd.Timestamp(end)]
+        return df.copy()
+
+    return download
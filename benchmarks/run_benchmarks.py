@@ -0,0 +1,226 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+# The apps use flat imports from their own folders, plus shared/ for the modules they have in common
+sys.path.extend([os.path.join(ROOT, "clip_creator"), os.path.join(ROOT, "price_tracker"), os.path.join(ROOT, "shared")])
+
+from fixtures import SCALES, fixture_downloader, record_fixture, recorded_prices, recorded_tickers, synthetic_prices
+from price_store import PriceStore
+from simulator import InvestmentSimulator
+from plotter import PlotBuilderOneDay
+from renderers import make_renderer
+from utils import simulate_lumpsum, simulate_sip  # price_tracker/utils.py
+
+import logging
+
+RESULTS_DIR = os.path.join(HERE, "results")
+CASES = ("simulate", "stats", "get_results", "simulate_sip", "simulate_lumpsum", "create_plot", "render_frame", "reel")
+TICKER = "BENCH"
+
+
+def _timings(fn, setup=None, repeat: int = 5) -> list:
+    """Seconds per call of ``fn(setup())``; the setup is not timed."""
+    timings = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+class Suite:
+    """
+    All benchmark cases for one price fixture.
+
+    Prices are served to InvestmentSimulator through a PriceStore with a
+    fixture downloader in a scratch folder, so nothing touches the network
+    and every run sees the same rows.
+    """
+
+    def __init__(self, prices: pd.DataFrame, folder: str, repeat: int = 5, frames: int = 30, backends=("agg",)):
+        self.prices = prices
+        self.folder = folder
+        self.repeat = repeat
+        self.frames = frames
+        self.backends = backends
+        self.store = PriceStore(root=os.path.join(folder, "prices"), downloader=fixture_downloader(prices))
+        self.start_year = prices.index[0].year
+        self.df = self._simulated().get_results()[3]
+
+    def _simulator(self) -> InvestmentSimulator:
+        simulator = InvestmentSimulator(TICKER, self.start_year, daily_investment=100.0, store=self.store)
+        simulator.fetch_data()
+        return simulator
+
+    def _simulated(self) -> InvestmentSimulator:
+        simulator = self._simulator()
+        simulator.simulate()
+        return simulator
+
+    def _plot(self) -> PlotBuilderOneDay:
+        return PlotBuilderOneDay(self.df, ticker=TICKER, start_year=self.start_year, name="Benchmark Ltd",
+                                 daily_investment=100.0, currency="INR")
+
+    def _reel(self, backend: str):
+        from clip_creator_rs1 import render_video
+
+        render_video(self.df, stock_name="Benchmark Ltd", ticker=TICKER, start_year=self.start_year,
+                     output=os.path.join(self.folder, "reel.mp4"), num_frames=self.frames,
+                     daily_investment=100.0, currency="INR", backend=backend)
+
+    def cases(self):
+        """(name, fn, setup, rows) for every case."""
+        close = self.prices["Close"]
+        yield "simulate", lambda s: s.simulate(), self._simulator, len(self.df)
+        yield "stats", lambda s: s.stats(), self._simulated, len(self.df)
+        yield "get_results", lambda s: s.get_results(), self._simulated, len(self.df)
+        yield "simulate_sip", lambda _: simulate_sip(close, 5000), None, len(close)
+        yield "simulate_lumpsum", lambda _: simulate_lumpsum(close, 100000), None, len(close)
+        yield "create_plot", lambda plot: plot.create_plot(), self._plot, len(self.df)
+        for backend in self.backends:
+            # The last frame draws every row: the most expensive one of a reel
+            yield (f"render_frame[{backend}]", lambda r: r.render(len(self.df)),
+                   lambda b=backend: make_renderer(self._plot(), b), len(self.df))
+            yield f"reel[{backend}]", lambda _, b=backend: self._reel(b), None, len(self.df)
+
+    def run(self, selected=CASES) -> dict:
+        results = {}
+        for name, fn, setup, rows in self.cases():
+            if name.split("[")[0] not in selected:
+                continue
+            # A whole reel is slow; a few runs are enough to see a change
+            repeat = min(self.repeat, 3) if name.startswith("reel") else self.repeat
+            try:
+                timings = np.array(_timings(fn, setup, repeat)) * 1000
+            except Exception as e:
+                # e.g. Kaleido without Chrome or moviepy without ffmpeg; report it and keep going
+                results[name] = dict(rows=rows, error=str(e).strip().splitlines()[0] if str(e).strip() else repr(e))
+                continue
+            results[name] = dict(
+                rows=rows, repeat=repeat, min_ms=timings.min(), median_ms=float(np.median(timings)),
+                mean_ms=timings.mean(),
+            )
+        return results
+
+
+def _fixtures(kinds, scales):
+    """(fixture name, years, prices) for every requested fixture and scale."""
+    for years in scales:
+        if "synthetic" in kinds:
+            yield "synthetic", years, synthetic_prices(years)
+        if "recorded" in kinds:
+            for ticker in recorded_tickers():
+                yield f"recorded:{ticker}", years, recorded_prices(ticker, years)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def latest_results(exclude: str = None):
+    """Path of the newest results file, or None."""
+    paths = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, "bench-*.json")) if p != exclude)
+    return paths[-1] if paths else None
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.2, min_delta_ms: float = 1.0) -> list:
+    """
+    (key, baseline ms, current ms, ratio, flag) for every benchmark present in
+    both runs; ``flag`` is "regression" / "improved" when the median moved by
+    more than ``threshold`` (0.2 = 20%) and by more than ``min_delta_ms``
+    (sub-millisecond cases are mostly timer noise), else "".
+    """
+    rows = []
+    for key, current in results.items():
+        before = baseline.get(key, {})
+        if "median_ms" not in current or "median_ms" not in before:
+            continue
+        ratio = current["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        flag = ""
+        if abs(current["median_ms"] - before["median_ms"]) > min_delta_ms:
+            flag = "regression" if ratio > 1 + threshold else "improved" if ratio < 1 - threshold else ""
+        rows.append((key, before["median_ms"], current["median_ms"], ratio, flag))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmarks on synthetic and recorded price fixtures")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="Years of daily data")
+    parser.add_argument("--fixtures", nargs="+", default=["synthetic", "recorded"], choices=["synthetic", "recorded"])
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=CASES)
+    parser.add_argument("--backends", nargs="+", default=["agg", "agg-layered"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--frames", type=int, default=30, help="Frames per benchmark reel")
+    parser.add_argument("--output", default=None, help="Results file (default: results/bench-<time>.json)")
+    parser.add_argument("--baseline", default=None, help="Results file to compare with (default: the latest one)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative median change that gets flagged")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Smaller absolute changes are never flagged")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on any regression")
+    parser.add_argument("--record", nargs="+", metavar="TICKER",
+                        help="Download and save recorded fixtures for these tickers (needs network), then exit")
+    args = parser.parse_args()
+
+    if args.record:
+        for ticker in args.record:
+            print(f"✅ Recorded {ticker}: {record_fixture(ticker)}")
+        sys.exit(0)
+
+    # Simulator/store INFO lines would drown the table
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for name, years, prices in _fixtures(args.fixtures, args.scales):
+            suite = Suite(prices, os.path.join(folder, f"{name.replace(':', '_')}-{years}y"),
+                          repeat=args.repeat, frames=args.frames, backends=args.backends)
+            for case, result in suite.run(args.cases).items():
+                key = f"{case}/{name}/{years}y"
+                results[key] = result
+                timing = f"{result['median_ms']:10.2f} ms" if "median_ms" in result else f"failed ({result['error']})"
+                print(f"{key:>45}: {timing}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    baseline_path = args.baseline or latest_results(exclude=os.path.abspath(output))
+    report = dict(
+        meta=dict(
+            started=time.strftime("%Y-%m-%dT%H:%M:%S"), commit=_git_commit(), python=platform.python_version(),
+            platform=platform.platform(), cpu_count=os.cpu_count(), numpy=np.__version__, pandas=pd.__version__,
+            args=vars(args), baseline=baseline_path,
+        ),
+        results=results,
+    )
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=float)
+    print(f"\n✅ Results saved to {output}")
+
+    regressions = []
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        print(f"📊 Compared with {baseline_path} (threshold {args.threshold:.0%}):")
+        for key, before, after, ratio, flag in compare(results, baseline, args.threshold, args.min_delta_ms):
+            marker = {"regression": "❌", "improved": "✅"}.get(flag, "  ")
+            print(f"{marker} {key:>45}: {before:10.2f} -> {after:10.2f} ms ({ratio:5.2f}x) {flag}")
+            if flag == "regression":
+                regressions.append(key)
+        print(f"{len(regressions)} regression(s)")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
@@ -0,0 +1,319 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from profiling import Profiler
+from results_index import save_financial_summary
+from simulator import InvestmentSimulator
+from ticker_info import get_default_info_cache
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+_DONE = object()
+
+# Render workers start from a fresh interpreter: forking while the fetch and
+# simulate threads run could copy a lock one of them holds (logging,
+# PriceStore, BLAS) into the child, where nothing would ever release it
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+class BatchState:
+    """
+    Per-ticker progress of a batch, persisted as JSON after every change so
+    an interrupted or partly failed run can be resumed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.tickers = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.tickers = {}
+
+    def is_done(self, ticker: str) -> bool:
+        entry = self.tickers.get(ticker, {})
+        return entry.get("status") == "done" and os.path.exists(entry.get("video") or "")
+
+    def update(self, ticker: str, **fields):
+        with self._lock:
+            self.tickers.setdefault(ticker, {}).update(fields, updated=time.time())
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.tickers, f, indent=2, default=str)
+            os.replace(tmp, self.path)
+
+
+class _RenderPool:
+    """
+    Process pool that is replaced when it breaks.
+
+    A worker that dies (e.g. killed for memory inside ffmpeg or Matplotlib)
+    breaks the whole ProcessPoolExecutor and every job in flight on it; the
+    first caller to see that swaps in a fresh executor so queued jobs never
+    see the broken pool (the affected ones are retried by the caller).
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=_MP_CONTEXT)
+
+    def replace(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self.executor is broken:
+                logging.warning("Render pool broke (a worker died); starting a fresh one")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_MP_CONTEXT)
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+def _render_reel(df, ticker: str, stock_name: str, start_year: int, daily_investment: float,
+                 currency: str, output: str, options: dict) -> tuple:
+    """
+    Render-stage job, run in a worker process: frames straight into the
+    encoder. Returns the output path and the worker's stage timings.
+    """
+    # Imported in the worker so the parent process does not load the plotting stack
+    from clip_creator_rs1 import render_video
+
+    profiler = Profiler()
+    render_video(
+        df, stock_name=stock_name, ticker=ticker, start_year=start_year, output=output,
+        daily_investment=daily_investment, currency=currency, profiler=profiler, **options,
+    )
+    return output, profiler.stages, profiler.frames
+
+
+class ReelPipeline:
+    """
+    Batch reel production with overlapping stages.
+
+    fetch (threads, I/O bound) -> simulate + summary (threads, light CPU) ->
+    render + encode (processes, heavy CPU). Stages are connected by bounded
+    queues, so a slow stage holds the earlier ones back instead of piling up
+    data in memory. Encoding overlaps with rendering inside each render job
+    (render_video streams frames to an ffmpeg consumer thread), keeping every
+    render worker's frames off the disk.
+
+    A ticker that fails in any stage is recorded with the stage and error and
+    skipped; the rest of the batch carries on. A render worker that dies
+    breaks its process pool: the pool is replaced and only the reels that
+    were in flight on it are retried, each alone in its own process (up to
+    ``render_retries`` times), so the crashing reel fails by itself. Finished
+    tickers are recorded in ``out_dir/batch_state.json`` and skipped on the
+    next run. Each finished reel gets a ``TICKER.profile.json`` report with
+    its stage timings (see profiling.Profiler).
+
+    Drafts (``render_options["draft"]``) are a separate set of outputs:
+    ``TICKER.draft.mp4`` and ``TICKER.draft.profile.json``, tracked in
+    ``batch_state.draft.json``, so a draft pass never replaces a final reel
+    or makes the final pass skip a ticker. Drafts write no
+    ``summaryTICKER.txt`` and add no results index record; the final pass
+    does both.
+    """
+
+    def __init__(self, out_dir: str = "reels", start_year: int = 2005, daily_investment: float = 100.0,
+                 currency: str = "INR", fetch_workers: int = 8, simulate_workers: int = 2,
+                 render_workers: int = None, queue_size: int = None, render_options: dict = None,
+                 render_retries: int = 1):
+        self.out_dir = out_dir
+        self.start_year = start_year
+        self.daily_investment = daily_investment
+        self.currency = currency
+        self.fetch_workers = fetch_workers
+        self.simulate_workers = simulate_workers
+        self.render_workers = render_workers or max(1, (os.cpu_count() or 2) - 1)
+        # Enough buffered tickers to keep every render worker fed
+        self.queue_size = queue_size or self.render_workers
+        # One encoder thread per reel: the parallelism comes from rendering several reels
+        self.render_options = {"backend": "agg", "threads": 1, **(render_options or {})}
+        self.render_retries = render_retries
+        self.suffix = ".draft" if self.render_options.get("draft") else ""
+        self.state = BatchState(os.path.join(out_dir, f"batch_state{self.suffix}.json"))
+        self._profilers = {}
+
+    def _fail(self, ticker: str, stage: str, error: Exception):
+        logging.error(f"{ticker}: {stage} failed: {error}")
+        self._profilers.pop(ticker, None)
+        self.state.update(ticker, status="failed", stage=stage, error=str(error),
+                          traceback=traceback.format_exc())
+
+    def _fetch(self, ticker: str):
+        profiler = self._profilers[ticker] = Profiler(os.path.join(self.out_dir, f"{ticker}{self.suffix}.profile.json"))
+        simulator = InvestmentSimulator(ticker, self.start_year, daily_investment=self.daily_investment)
+        with profiler.stage("fetch_data"):
+            simulator.fetch_data()
+        return simulator
+
+    def _simulate(self, simulator: InvestmentSimulator) -> dict:
+        profiler = self._profilers[simulator.ticker]
+        with profiler.stage("simulate"):
+            simulator.simulate()
+        final_value, total_invested, cagr, df, desc = simulator.get_results()
+        stock_name = simulator.get_stock_info() or simulator.ticker
+        with profiler.stage("stats"):
+            mean, stdev, _ = simulator.stats()
+            risk = simulator.risk_metrics()
+        summary = None
+        if not self.suffix:  # a draft is a preview of the reel, not a run to record
+            summary = os.path.join(self.out_dir, f"summary{simulator.ticker}.txt")
+            save_financial_summary(summary, self.currency, final_value, total_invested, cagr,
+                                   final_value - total_invested, stock_name, desc, mean, stdev, risk)
+        return dict(ticker=simulator.ticker, df=df, stock_name=stock_name, summary=summary)
+
+    def _render_alone(self, ticker: str, args: tuple, error: Exception) -> tuple:
+        """Retry a render from a broken pool in a process of its own."""
+        for attempt in range(self.render_retries):
+            logging.warning(f"{ticker}: render pool broke ({error}), retrying alone ({attempt + 1}/{self.render_retries})")
+            with ProcessPoolExecutor(max_workers=1, mp_context=_MP_CONTEXT) as executor:
+                try:
+                    return executor.submit(_render_reel, *args).result()
+                except BrokenProcessPool as e:
+                    error = e
+        raise error
+
+    def _run_stage(self, name: str, inbox: queue.Queue, outbox: queue.Queue, fn):
+        """Worker loop: take (ticker, item), put (ticker, fn(item)); failures stay per ticker."""
+        while True:
+            entry = inbox.get()
+            if entry is _DONE:
+                inbox.put(_DONE)  # let the stage's other workers stop too
+                return
+            ticker, item = entry
+            try:
+                self.state.update(ticker, status=name)
+                result = fn(item)
+            except Exception as e:
+                self._fail(ticker, name, e)
+                continue
+            outbox.put((ticker, result))
+
+    def run(self, tickers) -> dict:
+        """Produce a reel per ticker; returns ``{ticker: state entry}`` for this batch."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        todo = [t for t in tickers if not self.state.is_done(t)]
+        logging.info(f"{len(tickers) - len(todo)} of {len(tickers)} reels already done, {len(todo)} to go")
+        if not todo:
+            return {t: self.state.tickers[t] for t in tickers}
+
+        # One batched metadata lookup up front instead of one per ticker in the workers
+        get_default_info_cache().infos(todo)
+
+        fetch_q = queue.Queue()
+        simulate_q = queue.Queue(maxsize=self.queue_size)
+        render_q = queue.Queue(maxsize=self.queue_size)
+        results_q = queue.Queue()
+        for ticker in todo:
+            fetch_q.put((ticker, ticker))
+        fetch_q.put(_DONE)
+
+        stages = [
+            ("fetch", self.fetch_workers, fetch_q, simulate_q, self._fetch),
+            ("simulate", self.simulate_workers, simulate_q, render_q, self._simulate),
+        ]
+        threads = {}
+        for name, workers, inbox, outbox, fn in stages:
+            threads[name] = [
+                threading.Thread(target=self._run_stage, args=(name, inbox, outbox, fn), name=f"{name}-{i}", daemon=True)
+                for i in range(workers)
+            ]
+            for t in threads[name]:
+                t.start()
+
+        pool = _RenderPool(self.render_workers)
+        try:
+            def render(job):
+                ticker = job["ticker"]
+                output = os.path.join(self.out_dir, f"{ticker}{self.suffix}.mp4")
+                args = (job["df"], ticker, job["stock_name"], self.start_year,
+                        self.daily_investment, self.currency, output, self.render_options)
+                executor = pool.executor
+                try:
+                    video, stages, frames = executor.submit(_render_reel, *args).result()
+                except BrokenProcessPool as e:
+                    # This reel may just have shared the pool with the one that crashed
+                    pool.replace(executor)
+                    video, stages, frames = self._render_alone(ticker, args, e)
+                profiler = self._profilers.pop(ticker)
+                profiler.merge(stages, frames)
+                profiler.save()
+                # Recorded as soon as it exists so an interrupted batch resumes after it
+                self.state.update(ticker, status="done", stage=None, error=None, traceback=None,
+                                  summary=job["summary"], video=video, profile=profiler.path)
+                return video
+
+            # One dispatcher thread per render process keeps exactly that many reels in flight
+            threads["render"] = [
+                threading.Thread(target=self._run_stage, args=("render", render_q, results_q, render), name=f"render-{i}", daemon=True)
+                for i in range(self.render_workers)
+            ]
+            for t in threads["render"]:
+                t.start()
+
+            # Close each stage once the previous one has drained
+            for name, next_q in (("fetch", simulate_q), ("simulate", render_q), ("render", results_q)):
+                for t in threads[name]:
+                    t.join()
+                next_q.put(_DONE)
+        finally:
+            pool.shutdown()
+
+        done = sum(self.state.is_done(t) for t in tickers)
+        logging.info(f"Batch finished: {done} of {len(tickers)} reels done, results in {self.state.path}")
+        return {t: self.state.tickers.get(t, {}) for t in tickers}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Produce reels for many tickers with overlapping stages")
+    parser.add_argument("tickers", nargs="*", help="Tickers; omit to draw them with TickerSelector")
+    parser.add_argument("--region", default="India", help="TickerSelector region when no tickers are given")
+    parser.add_argument("--count", type=int, default=50, help="How many tickers to draw")
+    parser.add_argument("--exclude-file", default="utils/exclude.txt")
+    parser.add_argument("--out-dir", default="reels")
+    parser.add_argument("--start-year", type=int, default=2005)
+    parser.add_argument("--daily-investment", type=float, default=100.0)
+    parser.add_argument("--currency", default="INR")
+    parser.add_argument("--render-workers", type=int, default=None)
+    parser.add_argument("--num-frames", type=int, default=200)
+    parser.add_argument("--backend", default="agg")
+    parser.add_argument("--draft", action="store_true", help="Low-resolution previews with the same frame plan")
+    args = parser.parse_args()
+
+    tickers = args.tickers
+    if not tickers:
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils"))
+        from random_stock_selection import TickerSelector
+
+        tickers = TickerSelector(exclude_file=args.exclude_file).get_random_tickers(region=args.region, n=args.count)
+
+    pipeline = ReelPipeline(
+        out_dir=args.out_dir, start_year=args.start_year, daily_investment=args.daily_investment,
+        currency=args.currency, render_workers=args.render_workers,
+        render_options=dict(num_frames=args.num_frames, backend=args.backend, draft=args.draft),
+    )
+    results = pipeline.run(tickers)
+    failed = {t: r for t, r in results.items() if r.get("status") == "failed"}
+    for ticker, entry in failed.items():
+        print(f"❌ {ticker}: {entry['stage']} failed: {entry['error']}")
+    print(f"✅ {len(results) - len(failed)} of {len(results)} reels done")
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+
+def simulate_grid(prices: pd.DataFrame, start_dates, amounts, mode: str = "sip",
+                  days_per_year: float = 365.4) -> pd.DataFrame:
+    """
+    Run every (ticker, start date, amount) scenario of InvestmentSimulator in one pass.
+
+    ``prices`` is a wide Close matrix (dates x tickers), e.g. from
+    ``PriceStore.get_close_matrix``. As in InvestmentSimulator the series are
+    forward-filled to calendar days, ``mode="sip"`` invests ``amount`` every
+    day from the start date, and CAGR uses ``days / days_per_year`` years.
+    ``mode="lumpsum"`` invests ``amount`` once on the start date instead.
+    A ticker whose history begins after a start date starts on its first price.
+
+    Returns a frame indexed by (ticker, start_date, amount) with columns
+    first_date, n_days, final_value, total_invested and cagr.
+    """
+    if mode not in ("sip", "lumpsum"):
+        raise ValueError(f"Unknown mode: {mode}")
+
+    prices = prices.sort_index()
+    start_dates = pd.DatetimeIndex(start_dates)
+    amounts = np.asarray(amounts, dtype=float)
+
+    # Each start date begins on the first trading session on or after it
+    trading_days = prices.index
+    first_session = trading_days.searchsorted(start_dates)
+
+    prices = prices.resample("D").ffill()
+    close = prices.to_numpy(dtype=float)  # (days, tickers)
+    n, n_tickers = close.shape
+    start_pos = np.full(len(start_dates), n)
+    in_range = first_session < len(trading_days)
+    start_pos[in_range] = prices.index.searchsorted(trading_days[first_session[in_range]])
+
+    # Start position per (ticker, start date): the later of the requested
+    # start and the ticker's first available price
+    has_price = ~np.isnan(close)
+    first_valid = np.where(has_price.any(axis=0), has_price.argmax(axis=0), n)
+    pos = np.maximum(start_pos[None, :], first_valid[:, None])
+    valid = pos < n
+    pos_c = np.minimum(pos, n - 1)
+    cols = np.arange(n_tickers)[:, None]
+    n_days = np.where(valid, n - pos, 0)
+
+    last_close = close[-1][:, None]
+    if mode == "sip":
+        # Suffix sums of 1/Close: shares bought per unit of daily amount from each day on
+        with np.errstate(divide="ignore"):
+            inv_close = np.where(has_price, 1.0 / close, 0.0)
+        shares_per_unit = np.cumsum(inv_close[::-1], axis=0)[::-1]
+        value_per_unit = shares_per_unit[pos_c, cols] * last_close
+        invested_per_unit = n_days.astype(float)
+    else:
+        value_per_unit = last_close / close[pos_c, cols]
+        invested_per_unit = np.ones_like(value_per_unit)
+
+    value_per_unit = np.where(valid, value_per_unit, np.nan)
+    invested_per_unit = np.where(valid, invested_per_unit, np.nan)
+
+    # Broadcast over amounts: (tickers, starts, 1) * (amounts,)
+    final_value = value_per_unit[..., None] * amounts
+    total_invested = invested_per_unit[..., None] * amounts
+    years = (n_days / days_per_year)[..., None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cagr = (final_value / total_invested) ** (1 / years) - 1
+
+    first_date = np.where(valid, prices.index.values[pos_c], np.datetime64("NaT"))
+    shape = final_value.shape
+    index = pd.MultiIndex.from_product(
+        [prices.columns, start_dates, amounts], names=["ticker", "start_date", "amount"]
+    )
+    return pd.DataFrame({
+        "first_date": np.broadcast_to(first_date[..., None], shape).ravel(),
+        "n_days": np.broadcast_to(n_days[..., None], shape).ravel(),
+        "final_value": final_value.ravel(),
+        "total_invested": total_invested.ravel(),
+        "cagr": cagr.ravel(),
+    }, index=index)
@@ -4,23 +4,26 @@ import plotly.graph_objects as go
 import yfinance as yf
 import os
 import shutil
+import sys
 from moviepy import ImageSequenceClip
 # from moviepy.video.fx.resize import resize
 
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
 from plotter import PlotBuilder  
+from price_store import get_default_store
+from ticker_info import get_default_info_cache
+from renderers import make_renderer
+from video_writer import write_video
 
 # --- Get Company Name ---
 def get_stock_info(ticker):
-    try:
-        stock_info = yf.Ticker(ticker).info
-        return stock_info.get("longName", ticker)
-    except:
-        return ticker
+    return get_default_info_cache().long_name(ticker, default=ticker)
 
 
 # --- Fetch Stock Data ---
 def fetch_data(ticker, start="2024-01-01", end="2024-1-31", freq='W'):
-    df = yf.download(ticker, start=start, end=end)[['Close']]
+    df = get_default_store().get(ticker, start=start, end=end)[['Close']]
     df = df.resample(freq).first().dropna()
     if isinstance(df.index, pd.PeriodIndex):
         df.index = df.index.to_timestamp()
@@ -46,27 +49,32 @@ def calculate_investments(df, lump_sum_amt=10000, sip_amt=500):
 
 
 # --- Generate Frames using PlotBuilder ---
-def generate_frames(df, stock_name, ticker, start_year, folder='frames'):
+def generate_frames(df, stock_name, ticker, start_year, folder='frames', backend='kaleido'):
     if os.path.exists(folder):
         shutil.rmtree(folder)
     os.makedirs(folder)
 
-    for i in range(1, len(df) + 1):
-        df_clip = df.iloc[:i].copy()
-
-        # 🔁 Use PlotBuilder to generate annotated Reel plot
-        plot = PlotBuilder(df_clip, ticker=ticker, start_year=start_year, name=stock_name)
-        fig = plot.create_plot()
+    # 🔁 Build the annotated Reel plot once; each frame only updates it
+    plot = PlotBuilder(df, ticker=ticker, start_year=start_year, name=stock_name)
 
-        # 🖼 Format for Instagram Reels
-        fig.update_layout(width=1080, height=1920)
+    # 🖼 Format for Instagram Reels
+    renderer = make_renderer(plot, backend, width=1080, height=1920)
 
+    for i in range(1, len(df) + 1):
         frame_path = f"{folder}/frame_{i:03d}.png"
-        fig.write_image(frame_path, width=1080, height=1920, scale=1)
+        renderer.save(i, frame_path)
 
         print(f"✅ Saved: {frame_path}")
 
 
+# --- Render Straight into the MP4 Reel (no PNG frames on disk) ---
+def render_video(df, stock_name, ticker, start_year, output='investment_growth_reel.mp4', fps=10,
+                 backend='agg', crf=23, preset='medium', threads=None):
+    plot = PlotBuilder(df, ticker=ticker, start_year=start_year, name=stock_name)
+    renderer = make_renderer(plot, backend, width=1080, height=1920)
+    return write_video(renderer, range(1, len(df) + 1), output, fps=fps, crf=crf, preset=preset, threads=threads)
+
+
 # --- Compile Frames into MP4 Reel ---
 def create_video(folder='frames', output='investment_growth_reel.mp4', fps=10):
     frames = sorted([f"{folder}/{f}" for f in os.listdir(folder) if f.endswith(".png")])
@@ -1,51 +1,53 @@
+import os
+import sys
+
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
 from plotter import PlotBuilderOneDay
+from downsample import DEFAULT_MAX_POINTS
+from renderers import RENDERERS, frame_size, make_renderer
+from frame_cache import CachedRenderer, FrameCache, frame_key
+from video_writer import VideoWriter, write_video
+from frame_pool import render_frames_parallel
+from frame_plan import plan_frames
+from profiling import Profiler
+from results_index import save_financial_summary
 from simulator import InvestmentSimulator
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import yfinance as yf
-import os
+import imageio.v3 as iio
 import shutil
+from io import BytesIO
 from moviepy import ImageSequenceClip
-from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 
+# Draft previews: the final reel's frame plan and layout at half the resolution, with
+# fewer distinct states and line points, encoded with a fast preset
+DRAFT_SCALE = 0.5
+DRAFT_STATES = 40
+DRAFT_PRESET = "ultrafast"
 
 
-def save_financial_summary(file_name, currency, final_value, total_invested, cagr, returns, stock_name, desc, mean, stdev):
+def draft_plan(plan, plot_kwargs: dict, draft: bool = True):
+    """
+    (plan, plot_kwargs, scale) to render: unchanged for the final pass, or
+    thinned to DRAFT_STATES states with a smaller point budget at DRAFT_SCALE
+    for a draft. Either way the frame schedule is the one in ``plan``.
+    """
+    if not draft:
+        return plan, plot_kwargs, 1.0
+    max_points = int(plot_kwargs.get("max_points", DEFAULT_MAX_POINTS) * DRAFT_SCALE)
+    return plan.thin(DRAFT_STATES), dict(plot_kwargs, max_points=max_points), DRAFT_SCALE
 
-    def format_dict_content(d):
-        return '\n'.join(f"{k}: {v}" for k, v in d.items())
 
-    percentage_return = (returns / total_invested) * 100
-    desc_str = format_dict_content(desc) if isinstance(desc, dict) else desc
-    content = (
-        f"📈 Final Value: {currency} {final_value:,.2f}\n"
-        f"💰 Total Invested: {currency} {total_invested:,.2f}\n"
-        f"📊 CAGR: {cagr:.2%}\n"
-        f"📉 Total Returns: {currency} {returns:,.2f}\n"
-        f"📈 Percentage Return: {percentage_return:.2f}%\n"
-        f"📊 Company: {stock_name}\n\n"
-        f"🧮  Average Annualized Log Return: {mean:.2%} & Annualized Standard Deviation: {stdev:.2%}\n"
-        f"ℹ️ Description: {desc_str}\n\n"
-        f"Data Source: Yahoo Finance\n"
-        f"Don't Wait, start investing today!\n"
-        f"Follow us for more stock price animations\n"
-        f"⚠️ Disclaimer: For informational and entertainment pusposes only. Not Financial advice. Past Performance is no guarantee of future results.\n"
-        f"#finance #fintech #returns #risk #markets #trends"
-    )
-    with open(file_name, 'w', encoding='utf-8') as file:
-        file.write(content)
-    print(f"✅ Summary saved to {file_name}")
-
-
-def generate_single_frame(df: pd.DataFrame, idx: int, frame_num: int, folder: str, ticker: str, stock_name: str, start_year: int, daily_investment: float, currency: str):
+
+def generate_single_frame(df: pd.DataFrame, idx: int, frame_num: int, folder: str, ticker: str, stock_name: str, start_year: int, daily_investment: float, currency: str, backend: str = "kaleido"):
     df_clip = df.iloc[:idx].copy()
     plot = PlotBuilderOneDay(df_clip, ticker=ticker, start_year=start_year, name=stock_name, daily_investment=daily_investment, currency=currency)
-    fig = plot.create_plot()
-    fig.update_layout(width=1080, height=1920)
+    renderer = make_renderer(plot, backend, width=1080, height=1920)
     frame_path = os.path.join(folder, f"frame_{frame_num:03d}.png")
-    fig.write_image(frame_path, width=1080, height=1920, scale=1)
+    renderer.save(len(plot._pv), frame_path)
     print(f"✅ Saved: {frame_path}")
     return frame_path
 
@@ -58,33 +60,51 @@ def generate_frames_parallel(
     num_frames: int = 200,
     daily_investment: float = 1.0,
     currency: str = "USD",
-    max_workers: int = os.cpu_count()
+    max_workers: int = os.cpu_count(),
+    backend: str = "kaleido",
+    chunk_size: int = None,
+    schedule: str = "linear",
+    hold_end: int = 0,
+    cache: FrameCache = None,
+    profiler: Profiler = None,
+    draft: bool = False
 ):
+    profiler = profiler or Profiler(enabled=False)
     # 1. Clean and create folder
     if os.path.exists(folder):
         shutil.rmtree(folder)
     os.makedirs(folder)
 
-    n = len(df)
-    if n >= num_frames:
-        cut_points = np.linspace(1, n, num=num_frames, dtype=int, endpoint=True)
-    else:
-        cut_points = np.arange(1, n + 1, dtype=int)
-        pad = np.full(num_frames - n, n, dtype=int)
-        cut_points = np.concatenate([cut_points, pad])
-
-    # 2. Prepare partial function for multiprocessing
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        tasks = [
-            executor.submit(
-                generate_single_frame, df, idx, frame_num, folder, ticker, stock_name, start_year, daily_investment, currency
-            )
-            for frame_num, idx in enumerate(cut_points, start=1)
-        ]
-        for task in tasks:
-            task.result()  # To ensure exceptions are caught
-
-    print(f"\n🎉 Generated {len(cut_points)} frames in '{folder}'")
+    # Repeated cut points (padding, holds) are rendered once and linked
+    plan = plan_frames(df, num_frames, schedule=schedule, hold_end=hold_end)
+
+    plot_kwargs = dict(ticker=ticker, start_year=start_year, name=stock_name, daily_investment=daily_investment, currency=currency)
+    plan, plot_kwargs, scale = draft_plan(plan, plot_kwargs, draft)
+    paths = [os.path.join(folder, f"frame_{frame_num:03d}.png") for frame_num in plan.first_frames]
+    todo = np.arange(len(plan))
+    if cache is not None:
+        # Frames whose data slice and style are unchanged come from the cache
+        plot = PlotBuilderOneDay(df, **plot_kwargs)
+        renderer_cls = RENDERERS[backend][PlotBuilderOneDay]
+        keys = [frame_key(plot, n_rows, renderer_cls, *frame_size(1080, 1920, scale)) for n_rows in plan.rows]
+        todo = np.array([i for i in todo if not cache.fetch(keys[i], paths[i])], dtype=int)
+
+    # 2. Warm worker pool: df is shared once, frames go out in contiguous chunks
+    if len(todo):
+        # Frames are timed as a whole here; worker CPU shows up as child CPU once the pool exits
+        with profiler.stage("generate_frames_parallel", output=folder):
+            list(render_frames_parallel(
+                df, plan.rows[todo], plot_kwargs, folder=folder, backend=backend, max_workers=max_workers,
+                chunk_size=chunk_size, frame_numbers=plan.first_frames[todo], scale=scale
+            ))
+    if cache is not None:
+        for i in todo:
+            cache.store(keys[i], paths[i])
+        cache.report()
+    plan.link_holds(folder, paths)
+
+    print(f"\n🎉 Generated {plan.n_frames} frames ({len(plan)} rendered) in '{folder}'")
+    return paths
 
 def generate_frames(
     df: pd.DataFrame,
@@ -94,46 +114,127 @@ def generate_frames(
     folder: str = "frames",
     num_frames: int = 200,
     daily_investment: float = 1.0,
-    currency: str = "USD"
+    currency: str = "USD",
+    backend: str = "kaleido",
+    schedule: str = "linear",
+    hold_end: int = 0,
+    cache: FrameCache = None,
+    profiler: Profiler = None,
+    draft: bool = False
 ):
+    profiler = profiler or Profiler(enabled=False)
     # 1. Clean output folder
     if os.path.exists(folder):
         shutil.rmtree(folder)
     os.makedirs(folder)
 
-    n = len(df)
-    # 2. Decide which slice endpoints to use
-    if n >= num_frames:
-        # even‐spaced cuts from 1…n
-        cut_points = np.linspace(1, n, num=num_frames, dtype=int, endpoint=True)
-    else:
-        # fewer rows than frames: use every row, then duplicate last
-        cut_points = np.arange(1, n + 1, dtype=int)
-        # pad with the final index to reach exactly num_frames
-        pad = np.full(num_frames - n, n, dtype=int)
-        cut_points = np.concatenate([cut_points, pad])
-
-    # 3. Generate one image per cut point
-    for frame_num, idx in enumerate(cut_points, start=1):
-        df_clip = df.iloc[:idx].copy()
-        plot = PlotBuilderOneDay(df_clip, ticker=ticker, start_year=start_year, name=stock_name,daily_investment=daily_investment, currency=currency)
-        fig = plot.create_plot()
-
-        # Ensure reel dimensions
-        fig.update_layout(width=1080, height=1920)
-
-        frame_path = os.path.join(folder, f"frame_{frame_num:03d}.png")
-        fig.write_image(frame_path, width=1080, height=1920, scale=1)
-        print(f"✅ Saved: {frame_path}")
-
-    print(f"\n🎉 Generated {len(cut_points)} frames in '{folder}'")
+    # 2. Decide which slice endpoints to use; repeated ones become holds of one render
+    plan = plan_frames(df, num_frames, schedule=schedule, hold_end=hold_end)
+    plot_kwargs = dict(ticker=ticker, start_year=start_year, name=stock_name, daily_investment=daily_investment, currency=currency)
+    plan, plot_kwargs, scale = draft_plan(plan, plot_kwargs, draft)
+
+    # 3. Prepare the series and the figure once
+    with profiler.stage("create_plot"):
+        plot = PlotBuilderOneDay(df, **plot_kwargs)
+
+        # Reel dimensions; "agg" draws straight to a pixel buffer instead of going through Kaleido
+        renderer = make_renderer(plot, backend, width=1080, height=1920, scale=scale)
+    if cache is not None:
+        renderer = CachedRenderer(renderer, cache)
+
+    # 4. Generate one image per distinct state, updating only the frame-dependent parts
+    paths = []
+    with profiler.stage("generate_frames", output=folder):
+        for frame_num, n_rows in zip(plan.first_frames, plan.rows):
+            frame_path = os.path.join(folder, f"frame_{frame_num:03d}.png")
+            with profiler.frame(n_rows, output=frame_path):
+                renderer.save(n_rows, frame_path)
+            paths.append(frame_path)
+            print(f"✅ Saved: {frame_path}")
+        plan.link_holds(folder, paths)
+    if cache is not None:
+        cache.report()
+    profiler.profile_frame(renderer)
+
+    print(f"\n🎉 Generated {plan.n_frames} frames ({len(plan)} rendered) in '{folder}'")
+
+# --- Render Straight into the MP4 Reel (no PNG frames on disk) ---
+def render_video(
+    df: pd.DataFrame,
+    stock_name: str,
+    ticker: str,
+    start_year: int,
+    output: str = "investment_growth_reel.mp4",
+    num_frames: int = 200,
+    daily_investment: float = 1.0,
+    currency: str = "USD",
+    fps: int = 10,
+    backend: str = "agg",
+    crf: int = 23,
+    preset: str = "medium",
+    threads: int = None,
+    max_workers: int = 1,
+    schedule: str = "linear",
+    hold_end: int = 0,
+    cache: FrameCache = None,
+    profiler: Profiler = None,
+    draft: bool = False
+):
+    profiler = profiler or Profiler(enabled=False)
+    # Each distinct state is rendered once and repeated in the encoder for its hold
+    plan = plan_frames(df, num_frames, schedule=schedule, hold_end=hold_end)
+    plot_kwargs = dict(ticker=ticker, start_year=start_year, name=stock_name, daily_investment=daily_investment, currency=currency)
+    plan, plot_kwargs, scale = draft_plan(plan, plot_kwargs, draft)
+    preset = DRAFT_PRESET if draft else preset
+    if max_workers > 1:
+        # Frames come back from the pool in order and go straight into the encoder
+        width, height = frame_size(1080, 1920, scale)
+        todo = np.arange(len(plan))
+        cached = {}
+        if cache is not None:
+            # Cached states are read up front (as PNG bytes) so only the misses go to the pool
+            plot = PlotBuilderOneDay(df, **plot_kwargs)
+            renderer_cls = RENDERERS[backend][PlotBuilderOneDay]
+            keys = [frame_key(plot, n_rows, renderer_cls, width, height) for n_rows in plan.rows]
+            cached = {i: data for i in todo if (data := cache.read(keys[i])) is not None}
+            todo = np.array([i for i in todo if i not in cached], dtype=int)
+        with profiler.stage("render_video", output=output), \
+                VideoWriter(output, width=width, height=height, fps=fps, crf=crf, preset=preset, threads=threads) as writer:
+            rendered = iter(render_frames_parallel(df, plan.rows[todo], plot_kwargs, backend=backend,
+                                                   max_workers=max_workers, scale=scale) if len(todo) else ())
+            for i, hold in enumerate(plan.holds):
+                if i in cached:
+                    frame = iio.imread(BytesIO(cached.pop(i)))[..., :3]
+                else:
+                    frame = next(rendered)
+                    if cache is not None:
+                        cache.store_bytes(keys[i], iio.imwrite("<bytes>", frame, extension=".png"))
+                writer.write(frame, repeat=int(hold))
+        if cache is not None:
+            cache.report()
+        print(f"🎬 Reel saved to: {output} ({writer.frames_written} frames)")
+        return writer.frames_written
+
+    with profiler.stage("create_plot"):
+        renderer = make_renderer(PlotBuilderOneDay(df, **plot_kwargs), backend, width=1080, height=1920, scale=scale)
+    if cache is not None:
+        renderer = CachedRenderer(renderer, cache)
+    with profiler.stage("render_video", output=output):
+        frames_written = write_video(renderer, plan.rows, output, fps=fps, holds=plan.holds, profiler=profiler,
+                                     crf=crf, preset=preset, threads=threads)
+    if cache is not None:
+        cache.report()
+    profiler.profile_frame(renderer)
+    return frames_written
 
 # --- Compile Frames into MP4 Reel ---
-def create_video(folder='frames', output='investment_growth_reel.mp4', fps=10):
+def create_video(folder='frames', output='investment_growth_reel.mp4', fps=10, profiler: Profiler = None, draft: bool = False):
+    profiler = profiler or Profiler(enabled=False)
     frames = sorted([f"{folder}/{f}" for f in os.listdir(folder) if f.endswith(".png")])
-    clip = ImageSequenceClip(frames, fps=fps)
-    # clip = clip.fx(resize, (1080, 1920))  # Ensure 9:16 size
-    clip.write_videofile(output, codec='libx264', audio=False)
+    with profiler.stage("create_video", output=output):
+        clip = ImageSequenceClip(frames, fps=fps)
+        # clip = clip.fx(resize, (1080, 1920))  # Ensure 9:16 size
+        clip.write_videofile(output, codec='libx264', audio=False, preset=DRAFT_PRESET if draft else "medium")
     print(f"🎬 Reel saved to: {output}")
 
 #
@@ -144,11 +245,18 @@ if __name__ == "__main__":
     ticker = TICKER
     daily_investment = 100.0  # Daily investment amount
     currency = "INR"  # Currency for the investment
+    # Per-stage timings go to profile.json; pass profile_slowest=True for a cProfile of the slowest frame
+    profiler = Profiler("profile.json")
     simulator = InvestmentSimulator(ticker, start_year, daily_investment=daily_investment)
-    simulator.simulate()
+    with profiler.stage("fetch_data"):
+        simulator.fetch_data()
+    with profiler.stage("simulate"):
+        simulator.simulate()
     final_value, total_invested, cagr, df, desc = simulator.get_results()
     stock_name = simulator.get_stock_info()
-    mean, stdev, len_df_price = simulator.stats()
+    with profiler.stage("stats"):
+        mean, stdev, len_df_price = simulator.stats()
+        risk = simulator.risk_metrics()
 
     print('Description',desc)
 
@@ -168,13 +276,21 @@ if __name__ == "__main__":
     print(f"📈 Percentage Return: {percentage_return:.2f}%")
     print(f"Price Avaiable dates len: {len_df_price}")
     print(f"📊 Company: {stock_name}")
-    save_financial_summary(f"summary{TICKER}.txt", f"{currency}", final_value, total_invested, cagr, returns, stock_name, desc, mean,stdev)
+    save_financial_summary(f"summary{TICKER}.txt", f"{currency}", final_value, total_invested, cagr, returns, stock_name, desc, mean,stdev, risk)
 
 
     # print("🎨 Generating frames...")
-    # generate_frames_parallel(df, stock_name=stock_name, ticker=TICKER, start_year=start_year, daily_investment=daily_investment, currency=currency)
+    # generate_frames_parallel(df, stock_name=stock_name, ticker=TICKER, start_year=start_year, daily_investment=daily_investment, currency=currency, profiler=profiler)
 
     # print("🎞 Creating video...")
-    # create_video()
+    # create_video(profiler=profiler)
+
+    # Quick preview first (same frame plan, half resolution, fewer states), then the final pass:
+    # render_video(df, stock_name=stock_name, ticker=TICKER, start_year=start_year, daily_investment=daily_investment, currency=currency, output="draft_reel.mp4", draft=True)
+
+    # Or render and encode in one pass without the frames folder:
+    # render_video(df, stock_name=stock_name, ticker=TICKER, start_year=start_year, daily_investment=daily_investment, currency=currency, profiler=profiler)
+
+    profiler.save()
 
     print("✅ Done! Your Instagram Reel is ready.")
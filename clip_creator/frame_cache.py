@@ -0,0 +1,173 @@
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+DEFAULT_FRAME_CACHE_DIR = os.environ.get(
+    "FRAME_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "finance_analysis", "frames"),
+)
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+# Bump when a renderer's drawing code changes so old frames are not reused
+CACHE_VERSION = 2
+
+
+class FrameCache:
+    """
+    Size-bounded LRU cache of rendered frames as PNG files.
+
+    Frames are keyed by a hash of their inputs (see ``frame_key``), so a
+    re-run only renders frames whose data slice or style actually changed.
+    Recency is the file mtime, which survives across runs; once the cache
+    grows past ``max_bytes`` the least recently used frames are deleted.
+    """
+
+    def __init__(self, root: str = DEFAULT_FRAME_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+        entries = []
+        for name in os.listdir(root):
+            if name.endswith(".png"):
+                stat = os.stat(os.path.join(root, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        self._sizes = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self._bytes = sum(self._sizes.values())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.png")
+
+    def _touch(self, key: str):
+        os.utime(self._path(key))
+        self._sizes.move_to_end(key)
+
+    def _miss(self, key: str):
+        self.misses += 1
+        # Evicted by another process sharing the folder
+        self._bytes -= self._sizes.pop(key, 0)
+
+    def fetch(self, key: str, path: str) -> bool:
+        """Copy the cached frame to ``path``; False on a miss."""
+        try:
+            if key not in self._sizes:
+                raise FileNotFoundError(key)
+            shutil.copyfile(self._path(key), path)
+        except FileNotFoundError:
+            self._miss(key)
+            return False
+        self._touch(key)
+        self.hits += 1
+        return True
+
+    def read(self, key: str):
+        """PNG bytes of a cached frame, or None on a miss."""
+        try:
+            if key not in self._sizes:
+                raise FileNotFoundError(key)
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self._miss(key)
+            return None
+        self._touch(key)
+        self.hits += 1
+        return data
+
+    def store(self, key: str, path: str):
+        """Add a rendered PNG file to the cache."""
+        tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+        shutil.copyfile(path, tmp)
+        self._add(key, tmp)
+
+    def store_bytes(self, key: str, data: bytes):
+        tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        self._add(key, tmp)
+
+    def _add(self, key: str, tmp: str):
+        os.replace(tmp, self._path(key))
+        size = os.path.getsize(self._path(key))
+        self._bytes += size - self._sizes.pop(key, 0)
+        self._sizes[key] = size
+        self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._sizes) > 1:
+            key, size = self._sizes.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self._bytes -= size
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self):
+        logging.info(
+            f"Frame cache: {self.hits} hits, {self.misses} misses "
+            f"({self.hit_ratio:.0%} hit ratio), {self._bytes / 1024 ** 2:,.0f} MB in {self.root}"
+        )
+
+
+def frame_key(plot, n: int, renderer_cls, width: int, height: int) -> str:
+    """Hash of frame ``n``'s data slice, style values and render settings."""
+    arrays, style = plot.frame_inputs(n)
+    h = hashlib.blake2b(digest_size=20)
+    settings = (CACHE_VERSION, renderer_cls.__name__, renderer_cls.static_key(plot), width, height)
+    h.update(repr((settings, style)).encode())
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        if a.dtype == object:
+            h.update("\x1f".join(map(str, a)).encode())
+        else:
+            h.update(str(a.dtype).encode())
+            h.update(a.tobytes())
+    return h.hexdigest()
+
+
+class CachedRenderer:
+    """
+    Wraps a frame renderer (see renderers.make_renderer) so ``save`` and
+    ``render`` reuse cached frames and only draw on a miss.
+    """
+
+    def __init__(self, renderer, cache: FrameCache):
+        self.renderer = renderer
+        self.cache = cache
+        self.plot = renderer.plot
+        self.width = renderer.width
+        self.height = renderer.height
+
+    def key(self, n: int) -> str:
+        return frame_key(self.plot, n, type(self.renderer), self.width, self.height)
+
+    def save(self, n: int, path: str):
+        key = self.key(n)
+        if not self.cache.fetch(key, path):
+            self.renderer.save(n, path)
+            self.cache.store(key, path)
+
+    def render(self, n: int) -> np.ndarray:
+        import imageio.v3 as iio
+
+        key = self.key(n)
+        data = self.cache.read(key)
+        if data is not None:
+            return iio.imread(BytesIO(data))[..., :3]
+        frame = self.renderer.render(n)
+        self.cache.store_bytes(key, iio.imwrite("<bytes>", frame, extension=".png"))
+        return frame
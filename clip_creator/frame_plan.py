@@ -0,0 +1,99 @@
+import os
+import shutil
+
+import numpy as np
+
+from plotter import clean_rows_for_cuts
+
+SCHEDULES = ("linear", "ease_out")
+
+
+def cut_points(n: int, num_frames: int, schedule: str = "linear", hold_end: int = 0,
+               ease_power: float = 2.0) -> np.ndarray:
+    """
+    Raw ``df.iloc[:idx]`` cut point for every frame of a reel over ``n`` rows.
+
+    ``"linear"`` is the original spacing: evenly spread cuts, or every row
+    followed by the last one repeated when there are fewer rows than frames.
+    ``"ease_out"`` advances quickly at first and slows down towards the end
+    (progress ``1 - (1 - t) ** ease_power``). ``hold_end`` extra frames hold
+    the final state. Repeated cut points are expected; FramePlan folds them.
+    """
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Unknown schedule: {schedule}")
+    if n < 1 or num_frames < 1:
+        raise ValueError("Need at least one row and one frame")
+
+    if schedule == "ease_out":
+        t = np.linspace(0.0, 1.0, num=num_frames)
+        cuts = 1 + np.round((1 - (1 - t) ** ease_power) * (n - 1)).astype(int)
+    elif n >= num_frames:
+        cuts = np.linspace(1, n, num=num_frames, dtype=int, endpoint=True)
+    else:
+        cuts = np.concatenate([np.arange(1, n + 1, dtype=int), np.full(num_frames - n, n, dtype=int)])
+    return np.concatenate([cuts, np.full(hold_end, cuts[-1], dtype=int)])
+
+
+class FramePlan:
+    """
+    Run-length view of a frame schedule: each distinct consecutive state is
+    rendered once (``rows``) and shown for ``holds`` frames.
+    """
+
+    def __init__(self, frame_rows):
+        frame_rows = np.asarray(frame_rows, dtype=int)
+        starts = np.flatnonzero(np.r_[True, frame_rows[1:] != frame_rows[:-1]]) if len(frame_rows) else np.array([], dtype=int)
+        self.frame_rows = frame_rows
+        self.rows = frame_rows[starts]
+        self.holds = np.diff(np.r_[starts, len(frame_rows)])
+        self.first_frames = starts + 1  # 1-based frame number of each state
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.frame_rows)
+
+    def durations(self, fps: float) -> np.ndarray:
+        """Seconds each rendered state stays on screen."""
+        return self.holds / fps
+
+    def thin(self, max_states: int) -> "FramePlan":
+        """
+        The same schedule with at most ``max_states`` evenly picked states
+        rendered, each held until the next picked one. Frame count, timing
+        and the first and last states are unchanged, so a draft made from the
+        thinned plan previews the full-quality reel frame for frame.
+        """
+        if len(self) <= max_states:
+            return self
+        keep = np.unique(np.linspace(0, len(self) - 1, max(2, max_states)).round().astype(int))
+        state_of_frame = np.repeat(np.arange(len(self)), self.holds)
+        shown = keep[np.searchsorted(keep, state_of_frame, side="right") - 1]
+        return FramePlan(self.rows[shown])
+
+    def expand(self, rendered):
+        """Yield each rendered state ``hold`` times, i.e. one item per output frame."""
+        for item, hold in zip(rendered, self.holds):
+            for _ in range(hold):
+                yield item
+
+    def link_holds(self, folder: str, paths):
+        """
+        Fill the held frame numbers of a PNG folder with hard links to the
+        rendered frame (copies where links are unsupported). ``paths`` are
+        the rendered files, one per state, named by their first frame.
+        """
+        for path, first, hold in zip(paths, self.first_frames, self.holds):
+            for frame_num in range(first + 1, first + hold):
+                target = os.path.join(folder, f"frame_{frame_num:03d}.png")
+                try:
+                    os.link(path, target)
+                except OSError:
+                    shutil.copyfile(path, target)
+
+
+def plan_frames(df, num_frames: int, schedule: str = "linear", hold_end: int = 0) -> FramePlan:
+    """FramePlan over the rows PlotBuilderOneDay keeps for ``df``."""
+    return FramePlan(clean_rows_for_cuts(df, cut_points(len(df), num_frames, schedule, hold_end)))
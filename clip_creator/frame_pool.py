@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from plotter import PlotBuilderOneDay
+from renderers import make_renderer
+
+# Per-process state set up once by _init_worker
+_worker = {}
+
+
+class MappedFrame:
+    """
+    The columns a reel needs, written once to memory-mapped ``.npy`` files.
+
+    Worker processes open the same files read-only instead of receiving a
+    pickled copy of the DataFrame with every task.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns=PlotBuilderOneDay.REQUIRED_COLS):
+        self.folder = tempfile.mkdtemp(prefix="reel_frame_")
+        self.columns = list(columns)
+        index = pd.DatetimeIndex(df.index).as_unit("ns")
+        np.save(os.path.join(self.folder, "index.npy"), index.asi8)
+        np.save(os.path.join(self.folder, "values.npy"), df[self.columns].to_numpy(dtype=float))
+
+    @property
+    def spec(self) -> tuple:
+        return self.folder, self.columns
+
+    @staticmethod
+    def load(spec) -> pd.DataFrame:
+        folder, columns = spec
+        index = np.load(os.path.join(folder, "index.npy"), mmap_mode="r")
+        values = np.load(os.path.join(folder, "values.npy"), mmap_mode="r")
+        return pd.DataFrame(values, index=pd.DatetimeIndex(index.view("datetime64[ns]")), columns=columns)
+
+    def close(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _init_worker(spec, plot_kwargs: dict, backend: str, width: int, height: int, scale: float = 1.0):
+    """Build the plot and renderer once per process and warm the backend up."""
+    plot = PlotBuilderOneDay(MappedFrame.load(spec), **plot_kwargs)
+    renderer = make_renderer(plot, backend, width=width, height=height, scale=scale)
+    # The first image pays the backend start-up (Kaleido launches Chrome)
+    renderer.render(1)
+    _worker["renderer"] = renderer
+
+
+def _render_chunk(frame_numbers, rows, folder: str = None):
+    """Render a run of frames; PNG paths when ``folder`` is given, RGB arrays otherwise."""
+    renderer = _worker["renderer"]
+    if folder is None:
+        return [renderer.render(n) for n in rows]
+    paths = []
+    for frame_num, n in zip(frame_numbers, rows):
+        path = os.path.join(folder, f"frame_{frame_num:03d}.png")
+        renderer.save(n, path)
+        paths.append(path)
+    return paths
+
+
+def render_frames_parallel(df: pd.DataFrame, rows, plot_kwargs: dict, folder: str = None,
+                           backend: str = "kaleido", width: int = 1080, height: int = 1920,
+                           max_workers: int = os.cpu_count(), chunk_size: int = None, frame_numbers=None,
+                           scale: float = 1.0):
+    """
+    Render frame ``i`` as the first ``rows[i]`` rows of ``df`` on a warm process pool.
+
+    ``df`` is shared through memory-mapped files and frames go out in
+    contiguous chunks of ``chunk_size``. Yields one result per frame in
+    frame order: RGB arrays ready for VideoWriter.write, or PNG paths when
+    ``folder`` is given (named by ``frame_numbers``, 1..n by default). At
+    most two chunks per worker are in flight, so a slow consumer does not let
+    rendered frames pile up. ``scale`` renders at a fraction of the
+    resolution (see renderers.frame_size).
+    """
+    rows = np.asarray(rows, dtype=int)
+    frame_numbers = np.arange(1, len(rows) + 1) if frame_numbers is None else np.asarray(frame_numbers)
+    max_workers = max(1, max_workers or 1)
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(rows) // (max_workers * 4)))
+    starts = range(0, len(rows), chunk_size)
+
+    with MappedFrame(df) as frame, ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(frame.spec, plot_kwargs, backend, width, height, scale),
+    ) as executor:
+        pending = []
+        for start in starts:
+            chunk = slice(start, start + chunk_size)
+            pending.append(executor.submit(_render_chunk, frame_numbers[chunk].tolist(), rows[chunk].tolist(), folder))
+            if len(pending) >= max_workers * 2:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
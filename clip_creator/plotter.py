@@ -2,22 +2,38 @@ import plotly.graph_objects as go
 import numpy as np
 from io import BytesIO
 import pandas as pd
+import os
+import sys
+
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from downsample import DEFAULT_MAX_POINTS, PrefixDownsampler, downsample_indices
 
 class PlotBuilder:
-    def __init__(self, df, ticker, start_year, name=""):
+    def __init__(self, df, ticker, start_year, name="", max_points=DEFAULT_MAX_POINTS):
         self.df = df.copy()
         self.ticker = ticker
         self.start_year = start_year
         self.name = name or ticker
+        self.max_points = max_points
         self.df['Formatted_Date'] = self.df.index.strftime('%d-%m-%Y')
+        self._downsampler = None
+
+    def _visible(self, n: int):
+        """Rows of the first ``n`` that are actually drawn (LTTB, ends kept, stable across frames)."""
+        if self._downsampler is None or self._downsampler.max_points != self.max_points:
+            cols = ('Value_SIP', 'Value_Lump')
+            self._downsampler = PrefixDownsampler(np.arange(len(self.df)), [self.df[c] for c in cols], self.max_points)
+        return self._downsampler.indices(n)
 
     def create_plot(self):
         fig = go.Figure()
+        shown = self.df.iloc[self._visible(len(self.df))]
 
         # Add SIP trace
         fig.add_trace(go.Scatter(
-            x=self.df['Formatted_Date'],
-            y=self.df['Value_SIP'],
+            x=shown['Formatted_Date'],
+            y=shown['Value_SIP'],
             mode='lines+markers',
             name='SIP Investment',
             line=dict(color='dodgerblue', width=4)
@@ -25,8 +41,8 @@ class PlotBuilder:
 
         # Add Lump Sum trace
         fig.add_trace(go.Scatter(
-            x=self.df['Formatted_Date'],
-            y=self.df['Value_Lump'],
+            x=shown['Formatted_Date'],
+            y=shown['Value_Lump'],
             mode='lines+markers',
             name='Lump Sum Investment',
             line=dict(color='tomato', width=4, dash='dot')
@@ -86,12 +102,43 @@ class PlotBuilder:
 
         fig.update_xaxes(
             type="category",
+            # Every date keeps its slot even when only some points are drawn
+            categoryorder="array",
+            categoryarray=self.df['Formatted_Date'].tolist(),
             tickangle=-45,
             tickvals=tickvals,
             ticktext=tickvals
         )
 
         return fig
+
+    def update_plot(self, fig: go.Figure, n: int) -> go.Figure:
+        """
+        Mutate a figure from create_plot() in place to show only the first ``n``
+        rows, as create_plot() on ``df.iloc[:n]`` would.
+        """
+        n = max(1, min(int(n), len(self.df)))
+        dates = self.df['Formatted_Date'].to_numpy()[:n]
+        sip = self.df['Value_SIP'].to_numpy(dtype=float)[:n]
+        lump = self.df['Value_Lump'].to_numpy(dtype=float)[:n]
+        tickvals = dates[::max(1, n // 6)]
+        shown = self._visible(n)
+
+        with fig.batch_update():
+            fig.data[0].update(x=dates[shown], y=sip[shown])
+            fig.data[1].update(x=dates[shown], y=lump[shown])
+            fig.layout.annotations[0].update(x=dates[-1], y=sip[-1], text=f"SIP: ₹{sip[-1]:,.0f}")
+            fig.layout.annotations[1].update(x=dates[-1], y=lump[-1], text=f"Lump Sum: ₹{lump[-1]:,.0f}")
+            fig.update_xaxes(tickvals=tickvals, ticktext=tickvals, categoryarray=dates)
+        return fig
+
+    def frame_inputs(self, n: int):
+        """Everything frame ``n`` depends on: (data arrays, style values), for cache keys."""
+        n = max(1, min(int(n), len(self.df)))
+        arrays = [self.df[c].to_numpy()[:n] for c in ('Formatted_Date', 'Value_SIP', 'Value_Lump')]
+        # The drawn rows also depend on the rung the selection was made on
+        arrays.append(self._visible(n))
+        return arrays, (type(self).__name__, self.ticker, self.start_year, self.name, self.max_points)
     
 import os
 import shutil
@@ -114,7 +161,7 @@ class PlotBuilderOneDay:
 
     def __init__(self, df: pd.DataFrame, ticker: str, start_year: int, 
                  name: str = None, daily_investment: float = 100,
-                 currency: str = "INR"
+                 currency: str = "INR", max_points: int = DEFAULT_MAX_POINTS
                  ):
         self.df = df.copy()
         self.ticker = ticker
@@ -122,6 +169,7 @@ class PlotBuilderOneDay:
         self.ticker_name = name or ticker
         self.daily_investment = daily_investment
         self.currency = currency
+        self.max_points = max_points
 
         # ---- sanity checks ----
         missing = [c for c in self.REQUIRED_COLS if c not in self.df.columns]
@@ -138,6 +186,40 @@ class PlotBuilderOneDay:
         # ---- add a human‐readable date column ----
         self.df['Formatted_Date'] = self.df.index.strftime('%d-%m-%Y')
 
+        # ---- contiguous arrays for update_plot() ----
+        self._x = self.df.index
+        self._pv = self.df["Portfolio Value"].to_numpy(dtype=float)
+        self._ti = self.df["Total Invested"].to_numpy(dtype=float)
+        self._dates = self.df["Formatted_Date"].to_numpy()
+        self._pv_running_max = np.maximum.accumulate(self._pv) if len(self._pv) else self._pv
+        self._xf = self._x.asi8.astype(float)
+        self._downsampler = None
+
+    def _visible(self, n: int) -> np.ndarray:
+        """
+        Rows of the first ``n`` that are actually drawn: an LTTB selection
+        capped at ``max_points`` per line, always including the first and
+        last row so the annotations sit on the line. Selections come from
+        PrefixDownsampler, so consecutive frames keep the same points.
+        """
+        if self._downsampler is None or self._downsampler.max_points != self.max_points:
+            self._downsampler = PrefixDownsampler(self._xf, (self._pv, self._ti), self.max_points)
+        return self._downsampler.indices(n)
+
+    def _title(self, n: int) -> str:
+        start_date_str = self._dates[0]
+        return (
+            f"{self.currency} {self.daily_investment}/day in {self.ticker_name} ({self.ticker}) since {start_date_str} "
+            f"(DATA from {self.start_year}) • Duration: {n} days"
+        )
+
+    def frame_inputs(self, n: int):
+        """Everything frame ``n`` depends on: (data arrays, style values), for cache keys."""
+        n = max(1, min(int(n), len(self._pv)))
+        # The drawn rows also depend on the rung the selection was made on
+        arrays = [self._x.asi8[:n], self._pv[:n], self._ti[:n], self._visible(n)]
+        return arrays, (type(self).__name__, self._title(n), self.ticker, self.currency, self.max_points)
+
     def _ensure_datetime_index(self):
         """Make df.index a datetime index, inferring from ints if needed."""
         idx = self.df.index
@@ -158,12 +240,13 @@ class PlotBuilderOneDay:
     def create_plot(self) -> go.Figure:
         fig = go.Figure()
         draw_mode = "lines+markers"
+        shown = self.df.iloc[self._visible(len(self.df))]
 
         # Portfolio Value line
         fig.add_trace(go.Scatter(
-            x=self.df.index,
-            y=self.df["Portfolio Value"],
-            customdata=self.df["Formatted_Date"],
+            x=shown.index,
+            y=shown["Portfolio Value"],
+            customdata=shown["Formatted_Date"],
             mode=draw_mode,
             name="Portfolio Value",
             line=dict(color="green", width=4),
@@ -174,9 +257,9 @@ class PlotBuilderOneDay:
 
         # Total Invested line
         fig.add_trace(go.Scatter(
-            x=self.df.index,
-            y=self.df["Total Invested"],
-            customdata=self.df["Formatted_Date"],
+            x=shown.index,
+            y=shown["Total Invested"],
+            customdata=shown["Formatted_Date"],
             mode=draw_mode,
             name="Total Invested",
             line=dict(color="red", width=4, dash="dot"),
@@ -238,12 +321,8 @@ class PlotBuilderOneDay:
         )
 
         # FINAL LAYOUT
-        start_date_str = self.df["Formatted_Date"].iloc[0]
         fig.update_layout(
-            title=(
-                f"{self.currency} {self.daily_investment}/day in {self.ticker_name} ({self.ticker}) since {start_date_str} "
-                f"(DATA from {self.start_year}) • Duration: {len(self.df)} days"
-            ),
+            title=self._title(len(self.df)),
             autosize=False, width=1080, height=1920,
             margin=dict(l=50, r=50, b=120, t=120, pad=5),
             # paper_bgcolor="#2c3548", plot_bgcolor="#c1c9d9",
@@ -256,6 +335,34 @@ class PlotBuilderOneDay:
 
         return fig
 
+    def update_plot(self, fig: go.Figure, n: int) -> go.Figure:
+        """
+        Mutate a figure from create_plot() in place so it shows only the first
+        ``n`` rows, exactly as create_plot() on ``df.iloc[:n]`` would.
+
+        Only trace data, ticks, y-range, annotations and title change, so a
+        reel builds the figure once and calls this per frame.
+        """
+        n = max(1, min(int(n), len(self._pv)))
+        x, dates = self._x[:n], self._dates[:n]
+        pv, ti = self._pv[:n], self._ti[:n]
+        step = max(1, n // 10)  # same tick density as create_plot()
+        shown = self._visible(n)
+
+        with fig.batch_update():
+            fig.data[0].update(x=x[shown], y=pv[shown], customdata=dates[shown])
+            fig.data[1].update(x=x[shown], y=ti[shown], customdata=dates[shown])
+            fig.update_xaxes(tickvals=x[::step], ticktext=dates[::step])
+            fig.update_yaxes(range=[0, self._pv_running_max[n - 1] * 1.1])
+            fig.layout.annotations[0].update(
+                x=x[-1], y=pv[-1], text=f"{dates[-1]}<br><b>{self.currency}{pv[-1]:,.0f}</b>",
+            )
+            fig.layout.annotations[1].update(
+                x=x[-1], y=ti[-1], text=f"{dates[-1]}<br><b>{self.currency}{ti[-1]:,.0f}</b>",
+            )
+            fig.layout.title.text = self._title(n)
+        return fig
+
     def get_image_bytes(self, fmt: str = "png") -> BytesIO:
         fig = self.create_plot()
         buf = BytesIO()
@@ -264,6 +371,97 @@ class PlotBuilderOneDay:
         return buf
 
 
+class PlotBuilderStartDate:
+    """CAGR of a daily SIP held to the end, for every possible start date."""
+
+    def __init__(self, curve: pd.DataFrame, ticker: str, name: str = None,
+                 currency: str = "INR", min_years: float = 1.0, max_points: int = DEFAULT_MAX_POINTS):
+        # Very short holding periods give meaningless annualized numbers
+        self.df = curve[curve["Years"] >= min_years]
+        self.ticker = ticker
+        self.ticker_name = name or ticker
+        self.currency = currency
+        self.max_points = max_points
+
+    def create_plot(self) -> go.Figure:
+        fig = go.Figure()
+        cagr_pct = self.df["CAGR"] * 100
+        shown = downsample_indices(self.df.index, [cagr_pct.to_numpy()], self.max_points)
+
+        fig.add_trace(go.Scatter(
+            x=self.df.index[shown],
+            y=cagr_pct.iloc[shown],
+            customdata=(self.df["Final Value"] / self.df["Total Invested"]).iloc[shown],
+            mode="lines",
+            name="CAGR if started on this date",
+            line=dict(color="green", width=4),
+            hovertemplate="%{x|%d-%m-%Y}<br>CAGR %{y:.2f}%<br>%{customdata:.2f}x invested<extra></extra>",
+        ))
+
+        median = float(cagr_pct.median())
+        fig.add_hline(
+            y=median, line_dash="dot", line_color="red", line_width=3,
+            annotation_text=f"Median {median:.2f}%", annotation_position="top left",
+            annotation_font=dict(size=20, color="red"),
+        )
+
+        fig.update_xaxes(title="SIP start date", showgrid=True, tickangle=45, tickfont=dict(size=12))
+        fig.update_yaxes(title="CAGR (%)", showgrid=True, tickfont=dict(size=12))
+        fig.update_layout(
+            title=(
+                f"Daily SIP in {self.ticker_name} ({self.ticker}): CAGR by start date "
+                f"(held until {self.df.index[-1].strftime('%d-%m-%Y')})"
+            ),
+            autosize=False, width=1080, height=1920,
+            margin=dict(l=50, r=50, b=120, t=120, pad=5),
+            plot_bgcolor='whitesmoke',
+            paper_bgcolor='whitesmoke',
+            xaxis_gridcolor='lightgrey',
+            yaxis_gridcolor='lightgrey',
+            font=dict(color="black"), legend=dict(x=0, y=1.1, orientation="h"),
+        )
+        return fig
+
+
+def add_projection_bands(fig: go.Figure, bands: pd.DataFrame) -> go.Figure:
+    """
+    Overlay projection.project() percentile bands (P5-P95 and P25-P75 fans
+    plus the median) on a PlotBuilderOneDay figure.
+    """
+    fills = [("P5", "P95", 0.15), ("P25", "P75", 0.3)]
+    for low, high, alpha in fills:
+        if low not in bands.columns or high not in bands.columns:
+            continue
+        fig.add_trace(go.Scatter(
+            x=bands.index, y=bands[high], mode="lines", line=dict(width=0),
+            showlegend=False, hoverinfo="skip",
+        ))
+        fig.add_trace(go.Scatter(
+            x=bands.index, y=bands[low], mode="lines", line=dict(width=0),
+            fill="tonexty", fillcolor=f"rgba(0,128,0,{alpha})",
+            name=f"Projected {low[1:]}-{high[1:]}th pct", hoverinfo="skip",
+        ))
+    fig.add_trace(go.Scatter(
+        x=bands.index, y=bands["Portfolio Value"], mode="lines",
+        name="Projected median", line=dict(color="green", width=3, dash="dash"),
+    ))
+    # Widen a pinned y-axis so the upper band stays visible
+    top = float(bands[[c for c in ("P95", "Portfolio Value") if c in bands.columns]].max().max()) * 1.1
+    if fig.layout.yaxis.range is not None:
+        top = max(top, fig.layout.yaxis.range[1])
+    fig.update_yaxes(range=[0, top])
+    return fig
+
+
+def clean_rows_for_cuts(df: pd.DataFrame, cut_points) -> np.ndarray:
+    """
+    Map raw ``df.iloc[:idx]`` cut points to row counts of the cleaned frame
+    PlotBuilderOneDay keeps (rows with both required columns present).
+    """
+    valid = df[list(PlotBuilderOneDay.REQUIRED_COLS)].notna().all(axis=1).to_numpy()
+    return np.cumsum(valid)[np.asarray(cut_points) - 1]
+
+
 def generate_frames(
     df: pd.DataFrame,
     stock_name: str,
@@ -271,27 +469,29 @@ def generate_frames(
     start_year: int,
     folder: str = "frames",
     num_frames: int = 100,
+    backend: str = "kaleido",
 ):
+    # Imported here: both modules import the plot builders from this one
+    from renderers import make_renderer
+    from frame_plan import plan_frames
+
     if os.path.exists(folder):
         shutil.rmtree(folder)
     os.makedirs(folder)
 
-    n = len(df)
-    if n >= num_frames:
-        cut_points = np.linspace(1, n, num=num_frames, dtype=int, endpoint=True)
-    else:
-        cut_points = np.arange(1, n + 1, dtype=int)
-        pad = np.full(num_frames - n, n, dtype=int)
-        cut_points = np.concatenate([cut_points, pad])
+    # Repeated cut points are rendered once and hard-linked for the held frames
+    plan = plan_frames(df, num_frames)
 
-    for frame_num, idx in enumerate(cut_points, start=1):
-        df_clip = df.iloc[:idx].copy()
-        plot = PlotBuilderOneDay(df_clip, ticker=ticker, start_year=start_year, name=stock_name)
-        fig = plot.create_plot()
-        fig.update_layout(width=1080, height=1920)
+    # Prepare the series and the figure once; each frame only updates them
+    plot = PlotBuilderOneDay(df, ticker=ticker, start_year=start_year, name=stock_name)
+    renderer = make_renderer(plot, backend, width=1080, height=1920)
 
+    paths = []
+    for frame_num, n_rows in zip(plan.first_frames, plan.rows):
         frame_path = os.path.join(folder, f"frame_{frame_num:03d}.png")
-        fig.write_image(frame_path, width=1080, height=1920, scale=1)
+        renderer.save(n_rows, frame_path)
+        paths.append(frame_path)
         print(f"✅ Saved: {frame_path}")
+    plan.link_holds(folder, paths)
 
-    print(f"\n🎉 Generated {num_frames} frames in '{folder}'")
+    print(f"\n🎉 Generated {plan.n_frames} frames ({len(plan)} rendered) in '{folder}'")
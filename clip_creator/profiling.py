@@ -0,0 +1,192 @@
+import cProfile
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows: no rusage, RSS and child CPU are left out
+    resource = None
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def _peak_rss_mb(who=None):
+    """Peak resident set size so far in MB (this process, or its reaped children)."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF if who is None else who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    return maxrss / 1024 ** 2 if sys.platform == "darwin" else maxrss / 1024
+
+
+def _children_cpu() -> float:
+    """CPU seconds of reaped child processes (pool workers, ffmpeg)."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _size(path: str) -> int:
+    """Bytes in a file, or in all files under a folder."""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+class Profiler:
+    """
+    Per-stage timings of one reel run, saved as a JSON report.
+
+    Every ``stage(name)`` block adds its wall time, CPU time of this process
+    and of reaped child processes (pool workers, ffmpeg), and the bytes of
+    its ``output`` file or folder; the peak RSS is sampled when it ends.
+    ``frame(n)`` blocks additionally keep per-frame wall times, so the report
+    has frame percentiles and the slowest frame, which ``profile_frame``
+    can re-render under cProfile.
+
+    CPU time is process-wide: stages running concurrently in threads (the
+    batch runner) each see the others' CPU as well.
+
+    A disabled profiler (``Profiler(enabled=False)``) records nothing, so
+    instrumented code never needs to check for one.
+    """
+
+    def __init__(self, path: str = None, profile_slowest: bool = False, enabled: bool = True):
+        self.path = path
+        self.profile_slowest = profile_slowest
+        self.enabled = enabled
+        self.stages = {}
+        self.frames = []  # (row count, wall seconds) per rendered frame
+        self.slowest_profile = None
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._wall = time.perf_counter()
+
+    def _add(self, name: str, wall: float, cpu: float, child_cpu: float, nbytes: int):
+        with self._lock:
+            record = self.stages.setdefault(
+                name, dict(calls=0, wall_s=0.0, cpu_s=0.0, child_cpu_s=0.0, bytes_written=0, peak_rss_mb=None)
+            )
+            record["calls"] += 1
+            record["wall_s"] += wall
+            record["cpu_s"] += cpu
+            record["child_cpu_s"] += child_cpu
+            record["bytes_written"] += nbytes
+            record["peak_rss_mb"] = _peak_rss_mb()
+
+    @contextmanager
+    def stage(self, name: str, output: str = None):
+        """Time the block as ``name``; ``output`` is a file or folder it writes."""
+        if not self.enabled:
+            yield
+            return
+        wall, cpu, child_cpu = time.perf_counter(), time.process_time(), _children_cpu()
+        try:
+            yield
+        finally:
+            self._add(
+                name, time.perf_counter() - wall, time.process_time() - cpu, _children_cpu() - child_cpu,
+                _size(output) if output else 0,
+            )
+
+    @contextmanager
+    def frame(self, n: int, output: str = None, name: str = "write_image"):
+        """A ``stage(name)`` for one frame of ``n`` rows, also kept in the per-frame list."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        with self.stage(name, output):
+            yield
+        with self._lock:
+            self.frames.append((int(n), time.perf_counter() - start))
+
+    def merge(self, stages: dict, frames=()):
+        """Add the stages and frames of another profiler, e.g. one run in a worker process."""
+        with self._lock:
+            self.frames.extend(frames)
+            for name, other in stages.items():
+                record = self.stages.setdefault(name, dict(other, calls=0, wall_s=0.0, cpu_s=0.0, child_cpu_s=0.0, bytes_written=0))
+                for field in ("calls", "wall_s", "cpu_s", "child_cpu_s", "bytes_written"):
+                    record[field] += other[field]
+                peaks = [p for p in (record["peak_rss_mb"], other["peak_rss_mb"]) if p is not None]
+                record["peak_rss_mb"] = max(peaks) if peaks else None
+
+    @property
+    def slowest_frame(self):
+        """(row count, wall seconds) of the slowest frame, or None."""
+        return max(self.frames, key=lambda f: f[1]) if self.frames else None
+
+    def profile_frame(self, renderer, path: str = None):
+        """
+        Re-render the slowest frame under cProfile and dump the stats to
+        ``path`` (next to the report by default). Only runs when the profiler
+        was created with ``profile_slowest=True``; returns the dump path.
+        """
+        if not (self.enabled and self.profile_slowest and self.frames):
+            return None
+        # Profile the drawing itself, not a cache hit
+        renderer = getattr(renderer, "renderer", renderer)
+        n, _ = self.slowest_frame
+        path = path or f"{os.path.splitext(self.path or 'profile.json')[0]}.slowest_frame.prof"
+        profile = cProfile.Profile()
+        profile.runcall(renderer.render, n)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        profile.dump_stats(path)
+        self.slowest_profile = path
+        logging.info(f"cProfile of the slowest frame ({n} rows) saved to {path}")
+        return path
+
+    def to_dict(self) -> dict:
+        report = dict(
+            run=dict(
+                started=time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self._started)),
+                wall_s=time.perf_counter() - self._wall,
+                argv=sys.argv,
+                python=platform.python_version(),
+                platform=platform.platform(),
+                cpu_count=os.cpu_count(),
+                peak_rss_mb=_peak_rss_mb(),
+                children_peak_rss_mb=_peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+            ),
+            stages=self.stages,
+        )
+        if self.frames:
+            wall = np.array([w for _, w in self.frames]) * 1000
+            n, slowest = self.slowest_frame
+            report["frames"] = dict(
+                count=len(wall), mean_ms=wall.mean(), p50_ms=np.percentile(wall, 50),
+                p95_ms=np.percentile(wall, 95), max_ms=slowest * 1000, slowest_rows=n,
+                cprofile=self.slowest_profile,
+            )
+        return report
+
+    def save(self, path: str = None) -> dict:
+        """Write the JSON report (atomically) and log a one-line-per-stage summary."""
+        path = path or self.path
+        report = self.to_dict()
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, default=float)
+            os.replace(tmp, path)
+        for name, r in self.stages.items():
+            logging.info(
+                f"{name:>24}: {r['calls']:>4} calls, {r['wall_s']:8.2f}s wall, {r['cpu_s']:8.2f}s cpu, "
+                f"{r['child_cpu_s']:8.2f}s child cpu, {r['bytes_written'] / 1024 ** 2:8.1f} MB written"
+            )
+        if path:
+            logging.info(f"Profile report saved to {path}")
+        return report
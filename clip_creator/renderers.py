@@ -0,0 +1,361 @@
+import hashlib
+from io import BytesIO
+
+import numpy as np
+
+from plotter import PlotBuilder, PlotBuilderOneDay
+
+PX_TO_PT = 0.72  # 1 px at the 100 dpi used below, in points
+
+
+def frame_size(width: int, height: int, scale: float = 1.0) -> tuple:
+    """
+    Pixel size of a frame laid out at ``width`` x ``height`` and rendered at
+    ``scale`` (e.g. 0.5 for drafts), rounded to even numbers for x264.
+    """
+    if scale == 1:
+        return width, height
+    return 2 * max(1, round(width * scale / 2)), 2 * max(1, round(height * scale / 2))
+
+
+class KaleidoRenderer:
+    """
+    Plotly figure exported through Kaleido (the original reel path).
+
+    ``width`` and ``height`` are the layout size; ``scale`` resizes the
+    exported image without changing the layout, so ``self.width`` and
+    ``self.height`` are the output pixels.
+    """
+
+    def __init__(self, plot, width: int = 1080, height: int = 1920, scale: float = 1.0):
+        self.plot = plot
+        self.layout_size = (width, height)
+        self.scale = scale
+        self.width, self.height = frame_size(width, height, scale)
+        self.fig = plot.create_plot()
+        self.fig.update_layout(width=width, height=height)
+
+    @staticmethod
+    def static_key(plot) -> tuple:
+        """Inputs beyond frame_inputs(n) that change every frame's pixels."""
+        return ()
+
+    def save(self, n: int, path: str):
+        self.plot.update_plot(self.fig, n)
+        self.fig.write_image(path, width=self.layout_size[0], height=self.layout_size[1], scale=self.scale)
+
+    def render(self, n: int) -> np.ndarray:
+        """RGB uint8 array of shape (height, width, 3)."""
+        import imageio.v3 as iio
+
+        self.plot.update_plot(self.fig, n)
+        png = self.fig.to_image(format="png", width=self.layout_size[0], height=self.layout_size[1], scale=self.scale)
+        return iio.imread(BytesIO(png))[..., :3]
+
+
+class _AggRenderer:
+    """
+    Shared Matplotlib/Agg plumbing: one figure and one set of artists per
+    reel, drawn straight into an RGB buffer for every frame.
+
+    The layout is specified in pixels of a ``width`` x ``height`` frame at
+    ``dpi``; ``scale`` only changes the resolution (the figure keeps its
+    size in inches and the dpi is scaled), so a draft looks like a smaller
+    copy of the final frame. ``self.width`` and ``self.height`` are the
+    output pixels.
+    """
+
+    def __init__(self, plot, width: int = 1080, height: int = 1920, dpi: int = 100, scale: float = 1.0):
+        # Imported here so Kaleido-only setups do not need Matplotlib. The
+        # canvas is created explicitly, so the process-wide backend is untouched
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.plot = plot
+        self.layout_size = (width, height)
+        self.scale = scale
+        self.width, self.height = frame_size(width, height, scale)
+        self.dpi = dpi
+        self.fig = Figure(figsize=(self.width / (dpi * scale), self.height / (dpi * scale)), dpi=dpi * scale)
+        self.canvas = FigureCanvasAgg(self.fig)
+
+    @staticmethod
+    def static_key(plot) -> tuple:
+        return ()
+
+    def _set_margins(self, left, right, bottom, top):
+        """Plotly-style pixel margins."""
+        width, height = self.layout_size
+        self.fig.subplots_adjust(
+            left=left / width, right=1 - right / width,
+            bottom=bottom / height, top=1 - top / height,
+        )
+
+    def render(self, n: int) -> np.ndarray:
+        """RGB uint8 array of shape (height, width, 3)."""
+        self._update(n)
+        self.canvas.draw()
+        return self._frame()
+
+    def _frame(self) -> np.ndarray:
+        # Copied out: the canvas buffer is overwritten by the next render()
+        return np.ascontiguousarray(np.asarray(self.canvas.buffer_rgba())[..., :3])
+
+    def save(self, n: int, path: str):
+        from matplotlib.image import imsave
+
+        imsave(path, self.render(n))
+
+    def _update(self, n: int):
+        raise NotImplementedError
+
+
+def _annotation_box(color):
+    return dict(boxstyle="square,pad=0.6", facecolor=color, edgecolor=color, linewidth=3 * PX_TO_PT, alpha=0.95)
+
+
+class AggRendererOneDay(_AggRenderer):
+    """Agg version of PlotBuilderOneDay.create_plot() with the same layout."""
+
+    def __init__(self, plot: PlotBuilderOneDay, width: int = 1080, height: int = 1920, dpi: int = 100,
+                 scale: float = 1.0):
+        super().__init__(plot, width, height, dpi, scale)
+        import matplotlib.dates as mdates
+
+        self.x = mdates.date2num(plot._x.to_pydatetime())
+        fig = self.fig
+        fig.set_facecolor("whitesmoke")
+        self._set_margins(left=50 + 60, right=50, bottom=120 + 60, top=120)
+
+        ax = self.ax = fig.add_subplot()
+        ax.set_facecolor("whitesmoke")
+        ax.grid(True, color="lightgrey")
+        ax.set_axisbelow(True)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        ax.tick_params(labelsize=12 * PX_TO_PT, length=0)
+        ax.set_xlabel("Date", fontsize=14 * PX_TO_PT)
+        ax.set_ylabel(plot.currency, fontsize=14 * PX_TO_PT)
+        ax.yaxis.set_major_formatter(lambda v, _: f"{v:,.0f}")
+
+        line_kw = dict(linewidth=4 * PX_TO_PT, marker="o", markersize=8 * PX_TO_PT)
+        (self.pv_line,) = ax.plot([], [], color="green", label="Portfolio Value", **line_kw)
+        (self.ti_line,) = ax.plot([], [], color="red", linestyle=":", label="Total Invested", **line_kw)
+        ax.legend(loc="lower left", bbox_to_anchor=(0, 1.01), ncol=2, frameon=False, fontsize=12 * PX_TO_PT)
+
+        arrow = dict(arrowstyle="-|>", linewidth=1.5)
+        # Offsets in points (px at 100 dpi) so they scale with the resolution
+        text_kw = dict(textcoords="offset points", ha="center", va="center", color="white",
+                       fontsize=20 * PX_TO_PT, fontweight="bold", zorder=5)
+        self.pv_note = ax.annotate("", xy=(0, 0), xytext=(-70 * PX_TO_PT, 40 * PX_TO_PT), bbox=_annotation_box("green"),
+                                   arrowprops=dict(color="green", **arrow), **text_kw)
+        self.ti_note = ax.annotate("", xy=(0, 0), xytext=(-70 * PX_TO_PT, -40 * PX_TO_PT), bbox=_annotation_box("red"),
+                                   arrowprops=dict(color="red", **arrow), **text_kw)
+        self.title = fig.suptitle("", x=50 / width, y=1 - 40 / height, ha="left", fontsize=17 * PX_TO_PT)
+
+    def _update(self, n: int):
+        p = self.plot
+        n = max(1, min(int(n), len(p._pv)))
+        x, dates = self.x[:n], p._dates[:n]
+        pv, ti = p._pv[:n], p._ti[:n]
+        step = max(1, n // 10)
+        shown = p._visible(n)
+
+        self.pv_line.set_data(x[shown], pv[shown])
+        self.ti_line.set_data(x[shown], ti[shown])
+        pad = max((x[-1] - x[0]) * 0.02, 1)
+        self.ax.set_xlim(x[0] - pad, x[-1] + pad)
+        self.ax.set_ylim(0, p._pv_running_max[n - 1] * 1.1)
+        self.ax.set_xticks(x[::step], dates[::step], rotation=45, ha="right")
+
+        self.pv_note.xy = (x[-1], pv[-1])
+        self.pv_note.set_text(f"{dates[-1]}\n{p.currency}{pv[-1]:,.0f}")
+        self.ti_note.xy = (x[-1], ti[-1])
+        self.ti_note.set_text(f"{dates[-1]}\n{p.currency}{ti[-1]:,.0f}")
+        self.title.set_text(p._title(n))
+
+
+class AggRenderer(_AggRenderer):
+    """Agg version of PlotBuilder.create_plot() (SIP vs lump sum, dark theme)."""
+
+    def __init__(self, plot: PlotBuilder, width: int = 1080, height: int = 1920, dpi: int = 100,
+                 scale: float = 1.0):
+        super().__init__(plot, width, height, dpi, scale)
+        self.dates = plot.df['Formatted_Date'].to_numpy()
+        self.sip = plot.df['Value_SIP'].to_numpy(dtype=float)
+        self.lump = plot.df['Value_Lump'].to_numpy(dtype=float)
+
+        fig = self.fig
+        fig.set_facecolor("#111111")
+        self._set_margins(left=60 + 90, right=60, bottom=100 + 120, top=120)
+
+        ax = self.ax = fig.add_subplot()
+        ax.set_facecolor("#111111")
+        ax.grid(True, color="#283442")
+        ax.set_axisbelow(True)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        ax.tick_params(colors="#f2f5fa", labelsize=24 * PX_TO_PT, length=0)
+        ax.set_xlabel("Date", color="#f2f5fa", fontsize=24 * PX_TO_PT)
+        ax.set_ylabel("Portfolio Value (₹)", color="#f2f5fa", fontsize=24 * PX_TO_PT)
+        ax.yaxis.set_major_formatter(lambda v, _: f"{v:,.0f}")
+
+        line_kw = dict(linewidth=4 * PX_TO_PT, marker="o", markersize=6 * PX_TO_PT)
+        (self.sip_line,) = ax.plot([], [], color="dodgerblue", label="SIP Investment", **line_kw)
+        (self.lump_line,) = ax.plot([], [], color="tomato", linestyle=":", label="Lump Sum Investment", **line_kw)
+        ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.2), ncol=2, frameon=False,
+                  fontsize=20 * PX_TO_PT, labelcolor="#f2f5fa")
+
+        # Right-aligned so the end-point labels stay on the canvas
+        text_kw = dict(textcoords="offset points", ha="right", fontsize=36 * PX_TO_PT, zorder=5)
+        self.sip_note = ax.annotate("", xy=(0, 0), xytext=(0, 40 * PX_TO_PT), color="dodgerblue",
+                                    arrowprops=dict(arrowstyle="-|>", color="dodgerblue"), **text_kw)
+        self.lump_note = ax.annotate("", xy=(0, 0), xytext=(0, -40 * PX_TO_PT), color="tomato", va="top",
+                                     arrowprops=dict(arrowstyle="-|>", color="tomato"), **text_kw)
+        # The 📊 prefix is left out: emoji are not in Matplotlib's default fonts
+        fig.suptitle(f"{plot.name}\nLump Sum vs SIP", x=0.1, y=1 - 40 / height, ha="left", va="top", color="#f2f5fa", fontsize=36 * PX_TO_PT)
+
+    def _update(self, n: int):
+        n = max(1, min(int(n), len(self.sip)))
+        x = np.arange(n)
+        sip, lump, dates = self.sip[:n], self.lump[:n], self.dates[:n]
+        step = max(1, n // 6)
+        shown = self.plot._visible(n)
+
+        self.sip_line.set_data(x[shown], sip[shown])
+        self.lump_line.set_data(x[shown], lump[shown])
+        self.ax.set_xlim(-0.5, n - 0.5)
+        top = max(sip.max(), lump.max())
+        self.ax.set_ylim(min(sip.min(), lump.min()) * 0.95, top * 1.1 if top > 0 else 1)
+        self.ax.set_xticks(x[::step], dates[::step], rotation=45, ha="right")
+
+        self.sip_note.xy = (x[-1], sip[-1])
+        self.sip_note.set_text(f"SIP: ₹{sip[-1]:,.0f}")
+        self.lump_note.xy = (x[-1], lump[-1])
+        self.lump_note.set_text(f"Lump Sum: ₹{lump[-1]:,.0f}")
+
+
+class LayeredRendererOneDay(AggRendererOneDay):
+    """
+    Fixed-axis PlotBuilderOneDay reel drawn in layers.
+
+    The axes are pinned to the full date range and the final y-range, so the
+    background, grid, ticks, labels and legend are rasterized once. The lines
+    only grow, and are cached as layers at fixed points of the line (every
+    ``LAYER_POINTS`` selected points), each drawn from the one before. A frame
+    restores the layer below its row count, draws the rest of the line on it,
+    then the annotations and title. Because the layers sit at fixed points, a
+    frame's pixels depend only on ``n``, not on which frames came before.
+    Frames are cheapest in increasing order; going backwards rebuilds the
+    layers from the static one.
+
+    With fixed axes the point density does not change between frames, so the
+    LTTB selection is made once over the whole series; each frame draws the
+    selected points before row ``n`` plus a short tail to the exact last row.
+    """
+
+    LAYER_POINTS = 32
+
+    def __init__(self, plot: PlotBuilderOneDay, width: int = 1080, height: int = 1920, dpi: int = 100,
+                 scale: float = 1.0):
+        super().__init__(plot, width, height, dpi, scale)
+        x, dates = self.x, plot._dates
+        pad = max((x[-1] - x[0]) * 0.02, 1)
+        step = max(1, len(x) // 10)
+        self.ax.set_xlim(x[0] - pad, x[-1] + pad)
+        self.ax.set_ylim(0, plot._pv_running_max[-1] * 1.1)
+        self.ax.set_xticks(x[::step], dates[::step], rotation=45, ha="right")
+
+        self._shown = plot._visible(len(plot._pv))
+        tail_kw = dict(linewidth=4 * PX_TO_PT, marker="o", markersize=8 * PX_TO_PT, markevery=[1])
+        (self.pv_tail,) = self.ax.plot([], [], color="green", **tail_kw)
+        (self.ti_tail,) = self.ax.plot([], [], color="red", linestyle=":", **tail_kw)
+
+        self._dynamic = [self.pv_line, self.ti_line, self.pv_tail, self.ti_tail, self.pv_note, self.ti_note, self.title]
+        for artist in self._dynamic:
+            artist.set_animated(True)
+        self.canvas.draw()
+        self._static = self.canvas.copy_from_bbox(self.fig.bbox)
+        # Lines layer holding the first _layer_points selected points (a multiple of LAYER_POINTS)
+        self._lines_layer, self._layer_points = self._static, 0
+
+    @staticmethod
+    def static_key(plot) -> tuple:
+        # Pinned axes and the line's point selection depend on the whole
+        # series, not just the first n rows
+        h = hashlib.sha1()
+        for a in (plot._xf, plot._pv, plot._ti):
+            h.update(np.ascontiguousarray(a).tobytes())
+        return (len(plot._pv), plot.max_points, h.hexdigest())
+
+    def _draw_lines(self, start: int, stop: int):
+        """Draw selected points ``start..stop`` of both lines, joined to the point before."""
+        p = self.plot
+        rows = self._shown[max(start - 1, 0):stop]
+        self.pv_line.set_data(self.x[rows], p._pv[rows])
+        self.ti_line.set_data(self.x[rows], p._ti[rows])
+        self.ax.draw_artist(self.pv_line)
+        self.ax.draw_artist(self.ti_line)
+
+    def _update(self, n: int):
+        p = self.plot
+        n = max(1, min(int(n), len(p._pv)))
+        # Number of selected points before row n
+        k = int(np.searchsorted(self._shown, n))
+        base = k - k % self.LAYER_POINTS
+        if base < self._layer_points:
+            self._lines_layer, self._layer_points = self._static, 0
+
+        # Cached layers up to the last fixed point below k, always built the same way
+        while self._layer_points < base:
+            self.canvas.restore_region(self._lines_layer)
+            self._draw_lines(self._layer_points, self._layer_points + self.LAYER_POINTS)
+            self._lines_layer = self.canvas.copy_from_bbox(self.fig.bbox)
+            self._layer_points += self.LAYER_POINTS
+
+        # This frame's part of the line on top of it (not cached)
+        self.canvas.restore_region(self._lines_layer)
+        if k > base:
+            self._draw_lines(base, k)
+
+        # Moving parts on top: tail to the exact last row, annotations, title
+        tail = [self._shown[k - 1], n - 1]
+        self.pv_tail.set_data(self.x[tail], p._pv[tail])
+        self.ti_tail.set_data(self.x[tail], p._ti[tail])
+        self.ax.draw_artist(self.pv_tail)
+        self.ax.draw_artist(self.ti_tail)
+        date = p._dates[n - 1]
+        self.pv_note.xy = (self.x[n - 1], p._pv[n - 1])
+        self.pv_note.set_text(f"{date}\n{p.currency}{p._pv[n - 1]:,.0f}")
+        self.ti_note.xy = (self.x[n - 1], p._ti[n - 1])
+        self.ti_note.set_text(f"{date}\n{p.currency}{p._ti[n - 1]:,.0f}")
+        self.title.set_text(p._title(n))
+        self.ax.draw_artist(self.pv_note)
+        self.ax.draw_artist(self.ti_note)
+        self.fig.draw_artist(self.title)
+
+    def render(self, n: int) -> np.ndarray:
+        """RGB uint8 array of shape (height, width, 3)."""
+        self._update(n)
+        return self._frame()
+
+
+RENDERERS = {
+    "kaleido": {PlotBuilderOneDay: KaleidoRenderer, PlotBuilder: KaleidoRenderer},
+    "agg": {PlotBuilderOneDay: AggRendererOneDay, PlotBuilder: AggRenderer},
+    "agg-layered": {PlotBuilderOneDay: LayeredRendererOneDay},
+}
+
+
+def make_renderer(plot, backend: str = "kaleido", width: int = 1080, height: int = 1920, scale: float = 1.0):
+    """
+    Frame renderer for a PlotBuilderOneDay/PlotBuilder: ``"kaleido"``,
+    ``"agg"`` or (PlotBuilderOneDay only, fixed axes) ``"agg-layered"``.
+    ``scale`` renders the ``width`` x ``height`` layout at a fraction of the
+    resolution (see frame_size).
+    """
+    if backend not in RENDERERS:
+        raise ValueError(f"Unknown render backend: {backend}")
+    if type(plot) not in RENDERERS[backend]:
+        raise ValueError(f"Backend {backend} does not support {type(plot).__name__}")
+    return RENDERERS[backend][type(plot)](plot, width=width, height=height, scale=scale)
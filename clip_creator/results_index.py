@@ -0,0 +1,388 @@
+import argparse
+import glob
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from price_store import _has_parquet_engine
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+DEFAULT_RESULTS_DIR = os.environ.get(
+    "RESULTS_INDEX_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "finance_analysis", "results"),
+)
+
+# Column -> dtype of the results table, in display order
+COLUMNS = {
+    "run_id": "string",
+    "recorded_at": "datetime64[ns]",
+    "ticker": "string",
+    "stock_name": "string",
+    "currency": "string",
+    "start_year": "Int64",
+    "daily_investment": "float64",
+    "calendar": "string",
+    "final_value": "float64",
+    "total_invested": "float64",
+    "returns": "float64",
+    "pct_return": "float64",
+    "cagr": "float64",
+    "mean_log_return": "float64",
+    "stdev_log_return": "float64",
+    "max_drawdown": "float64",
+    "volatility": "float64",
+    "sharpe": "float64",
+    "sortino": "float64",
+    "start_date": "datetime64[ns]",
+    "end_date": "datetime64[ns]",
+    "rows": "Int64",
+    "years": "float64",
+    "description": "string",  # only for runs whose description was free text
+    "source": "string",
+}
+RISK_COLUMNS = ("max_drawdown", "volatility", "sharpe", "sortino")
+
+
+def make_record(currency, final_value, total_invested, cagr, returns, stock_name, desc, mean, stdev,
+                risk=None, source: str = None) -> dict:
+    """
+    One typed results row from the values save_financial_summary() gets:
+    ``desc`` is InvestmentSimulator.description() and ``risk`` its
+    risk_metrics(), or None.
+    """
+    record = dict.fromkeys(COLUMNS)
+    record.update(
+        run_id=uuid.uuid4().hex[:12],
+        recorded_at=pd.Timestamp.now(),
+        stock_name=stock_name,
+        currency=currency,
+        final_value=final_value,
+        total_invested=total_invested,
+        returns=returns,
+        pct_return=returns / total_invested * 100,
+        cagr=cagr,
+        mean_log_return=mean,
+        stdev_log_return=stdev,
+        source=source,
+    )
+    if isinstance(desc, dict):
+        record.update(
+            ticker=desc.get("ticker"),
+            start_year=desc.get("start_year"),
+            daily_investment=desc.get("daily_investment"),
+            calendar=desc.get("calendar"),
+            start_date=desc.get("start_date"),
+            end_date=desc.get("end_date"),
+            rows=desc.get("data_length"),
+            years=desc.get("Duration"),
+        )
+    else:
+        record["description"] = desc
+    if risk is not None:
+        record.update({k: risk[k] for k in RISK_COLUMNS})
+    return record
+
+
+def _present(value) -> bool:
+    return not pd.isna(value)
+
+
+def _description(record) -> dict:
+    """Rebuild InvestmentSimulator.description() from a results row."""
+    desc = {
+        "ticker": record["ticker"],
+        "start_year": int(record["start_year"]) if _present(record["start_year"]) else None,
+        "daily_investment": record["daily_investment"],
+        "data_available": True,
+        "data_length": int(record["rows"]) if _present(record["rows"]) else None,
+        "start_date": record["start_date"],
+        "end_date": record["end_date"],
+        "final_value": record["final_value"],
+        "total_invested": record["total_invested"],
+        "calendar": record["calendar"],
+        "Duration": record["years"],
+        "cagr": record["cagr"] * 100,
+    }
+    if not _present(desc["calendar"]):
+        del desc["calendar"]  # runs from before the calendar option
+    return desc
+
+
+def render_caption(record) -> str:
+    """The reel caption (the summary*.txt text) for a results row or record."""
+    currency = record["currency"]
+    desc = record["description"] if _present(record["description"]) else _description(record)
+    desc_str = '\n'.join(f"{k}: {v}" for k, v in desc.items()) if isinstance(desc, dict) else desc
+    # Imported summaries may predate the log-return and risk lines
+    stats_str = (
+        f"🧮  Average Annualized Log Return: {record['mean_log_return']:.2%} & Annualized Standard Deviation: {record['stdev_log_return']:.2%}\n"
+        if _present(record["mean_log_return"]) else ""
+    )
+    risk_str = (
+        f"📉 Max Drawdown: {record['max_drawdown']:.2%} | Volatility: {record['volatility']:.2%} | "
+        f"Sharpe: {record['sharpe']:.2f} | Sortino: {record['sortino']:.2f}\n"
+        if _present(record["max_drawdown"]) else ""
+    )
+    return (
+        f"📈 Final Value: {currency} {record['final_value']:,.2f}\n"
+        f"💰 Total Invested: {currency} {record['total_invested']:,.2f}\n"
+        f"📊 CAGR: {record['cagr']:.2%}\n"
+        f"📉 Total Returns: {currency} {record['returns']:,.2f}\n"
+        f"📈 Percentage Return: {record['pct_return']:.2f}%\n"
+        f"📊 Company: {record['stock_name']}\n\n"
+        f"{stats_str}"
+        f"{risk_str}"
+        f"ℹ️ Description: {desc_str}\n\n"
+        f"Data Source: Yahoo Finance\n"
+        f"Don't Wait, start investing today!\n"
+        f"Follow us for more stock price animations\n"
+        f"⚠️ Disclaimer: For informational and entertainment pusposes only. Not Financial advice. Past Performance is no guarantee of future results.\n"
+        f"#finance #fintech #returns #risk #markets #trends"
+    )
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.reindex(columns=list(COLUMNS))
+    return df.astype({c: t for c, t in COLUMNS.items() if not t.startswith("datetime")}).assign(
+        **{c: pd.to_datetime(df[c]).astype(t) for c, t in COLUMNS.items() if t.startswith("datetime")}
+    )
+
+
+class ResultsIndex:
+    """
+    Every summarized run as one row of a columnar table.
+
+    Each append writes its rows to a new Parquet part file (pickle without a
+    Parquet engine) under ``root``, so an append costs the size of the new
+    rows and concurrent writers, even across processes, never touch the same
+    file. Reads join the parts, re-reading only new ones; once there are more
+    than ``max_parts`` the next append compacts them into one. Rows are
+    de-duplicated by ``run_id``, so a part seen twice around a concurrent
+    compaction is harmless. Filters and rankings run on the loaded DataFrame,
+    which is fast for thousands of runs.
+    """
+
+    def __init__(self, root: str = DEFAULT_RESULTS_DIR, max_parts: int = 64):
+        self.root = root
+        self.max_parts = max_parts
+        self.ext = "parquet" if _has_parquet_engine() else "pkl"
+        self._lock = threading.Lock()
+        self._parts = {}  # path -> (mtime_ns, DataFrame)
+        os.makedirs(root, exist_ok=True)
+
+    def _part_paths(self) -> list:
+        # runs.<ext> is the single-file table written by earlier versions
+        return sorted(glob.glob(os.path.join(self.root, f"runs*.{self.ext}")))
+
+    def _read(self, path: str) -> pd.DataFrame:
+        return pd.read_parquet(path) if self.ext == "parquet" else pd.read_pickle(path)
+
+    def _write(self, df: pd.DataFrame) -> str:
+        path = os.path.join(self.root, f"runs-{time.time_ns()}-{uuid.uuid4().hex[:8]}.{self.ext}")
+        # Written under a temp name so readers never pick up a partial part
+        tmp = f"{path}.tmp"
+        if self.ext == "parquet":
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, path)
+        return path
+
+    def load(self) -> pd.DataFrame:
+        """All runs, oldest first."""
+        frames = []
+        seen = set()
+        for path in self._part_paths():
+            try:
+                mtime = os.stat(path).st_mtime_ns
+                cached = self._parts.get(path)
+                if cached is None or cached[0] != mtime:
+                    cached = self._parts[path] = (mtime, self._read(path))
+            except FileNotFoundError:
+                continue  # compacted away by another writer; its rows are in the new part
+            seen.add(path)
+            frames.append(cached[1])
+        for path in set(self._parts) - seen:
+            del self._parts[path]
+        if not frames:
+            return _typed(pd.DataFrame(columns=list(COLUMNS)))
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        df = df.drop_duplicates("run_id", keep="first")
+        return df.sort_values("recorded_at", kind="stable").reset_index(drop=True)
+
+    def append(self, *records: dict) -> pd.DataFrame:
+        """Add runs (see make_record) and return them as typed rows."""
+        new = _typed(pd.DataFrame(list(records)))
+        with self._lock:
+            self._write(new)
+            if len(self._part_paths()) > self.max_parts:
+                self.compact()
+        return new
+
+    def compact(self):
+        """Merge all part files into one."""
+        paths = self._part_paths()
+        if len(paths) < 2:
+            return
+        df = self.load()
+        self._write(df)
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def runs(self, query: str = None, latest: bool = False, **equals) -> pd.DataFrame:
+        """
+        Runs matching ``column=value`` filters and an optional
+        ``DataFrame.query`` expression (e.g. ``"cagr > 0.12 and years >= 10"``);
+        ``latest`` keeps only the newest run per ticker and parameter set.
+        """
+        df = self.load()
+        for column, value in equals.items():
+            if column not in COLUMNS:
+                raise ValueError(f"Unknown results column: {column}")
+            df = df[df[column] == value]
+        if query:
+            df = df.query(query)
+        if latest:
+            df = df.drop_duplicates(["ticker", "currency", "start_year", "daily_investment", "calendar"], keep="last")
+        return df
+
+    def rank(self, by: str = "cagr", top: int = 10, ascending: bool = False, query: str = None,
+             **equals) -> pd.DataFrame:
+        """Best ``top`` tickers by ``by`` among their latest matching runs."""
+        if by not in COLUMNS:
+            raise ValueError(f"Unknown results column: {by}")
+        df = self.runs(query=query, latest=True, **equals)
+        return df.sort_values(by, ascending=ascending, na_position="last").head(top)
+
+    def caption(self, ticker: str = None, run_id: str = None) -> str:
+        """Caption of a run: by ``run_id``, else the newest run of ``ticker``."""
+        df = self.runs(run_id=run_id) if run_id else self.runs(ticker=ticker.upper())
+        if df.empty:
+            raise ValueError(f"No results for {run_id or ticker}")
+        return render_caption(df.iloc[-1])
+
+
+_default_index = None
+
+
+def get_default_results_index() -> ResultsIndex:
+    global _default_index
+    if _default_index is None:
+        _default_index = ResultsIndex()
+    return _default_index
+
+
+def save_financial_summary(file_name, currency, final_value, total_invested, cagr, returns, stock_name, desc, mean, stdev, risk=None, results: ResultsIndex = None):
+    # Every run is also a typed row of the results index; the caption is rendered from that row
+    record = make_record(currency, final_value, total_invested, cagr, returns, stock_name, desc, mean, stdev, risk, source=file_name)
+    (results or get_default_results_index()).append(record)
+    content = render_caption(record)
+    with open(file_name, 'w', encoding='utf-8') as file:
+        file.write(content)
+    print(f"✅ Summary saved to {file_name}")
+
+
+_NUMBER = r"(-?[\d,]+(?:\.\d+)?)"
+
+
+def _percent(value):
+    """A parsed percentage as a decimal (None stays None)."""
+    return None if value is None else value / 100
+
+
+def parse_summary(path: str) -> dict:
+    """
+    Best-effort record from an existing summary*.txt, for importing runs made
+    before the results index existed. Fields the file lacks stay empty.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    def find(pattern, cast=float):
+        m = re.search(pattern, text)
+        return cast(m.group(1).replace(",", "")) if m else None
+
+    final_value = find(rf"Final Value: \S+ {_NUMBER}")
+    total_invested = find(rf"Total Invested: \S+ {_NUMBER}")
+    if final_value is None or total_invested is None:
+        raise ValueError(f"Not a financial summary: {path}")
+    record = make_record(
+        currency=find(r"Final Value: (\S+) ", str),
+        final_value=final_value,
+        total_invested=total_invested,
+        cagr=_percent(find(rf"CAGR: {_NUMBER}%")),
+        returns=final_value - total_invested,
+        stock_name=find(r"Company: (.*)", str),
+        desc={},
+        mean=_percent(find(rf"Log Return: {_NUMBER}%")),
+        stdev=_percent(find(rf"Standard Deviation: {_NUMBER}%")),
+        source=path,
+    )
+    name = os.path.basename(path)
+    ticker = find(r"'?ticker'?: '?([^',\s]+)", str) or re.sub(r"^summary|\.txt$", "", name)
+    date = r"(?:Timestamp\(')?(\d{4}-\d{2}-\d{2})"
+    record.update(
+        recorded_at=pd.Timestamp(os.path.getmtime(path), unit="s"),
+        ticker=ticker.upper(),
+        start_year=find(r"'?start_year'?: (\d+)", int),
+        daily_investment=find(rf"'?daily_investment'?: {_NUMBER}"),
+        calendar=find(r"'?calendar'?: '?(\w+)", str),
+        start_date=find(rf"'?start_date'?: {date}", pd.Timestamp),
+        end_date=find(rf"'?end_date'?: {date}", pd.Timestamp),
+        rows=find(r"'?data_length'?: (\d+)", int),
+        years=find(rf"'?Duration'?: {_NUMBER}"),
+    )
+    record.update(
+        max_drawdown=_percent(find(rf"Max Drawdown: {_NUMBER}%")),
+        volatility=_percent(find(rf"Volatility: {_NUMBER}%")),
+        sharpe=find(rf"Sharpe: {_NUMBER}"), sortino=find(rf"Sortino: {_NUMBER}"),
+    )
+    return record
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the results index of summarized runs")
+    parser.add_argument("--import", dest="import_paths", nargs="+", metavar="PATH",
+                        help="Import summary*.txt files or folders of them")
+    parser.add_argument("--query", default=None, help='e.g. "cagr > 0.1 and currency == \'INR\'"')
+    parser.add_argument("--by", default="cagr")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--ascending", action="store_true")
+    parser.add_argument("--caption", metavar="TICKER", help="Print the caption of TICKER's latest run")
+    args = parser.parse_args()
+
+    index = get_default_results_index()
+    if args.import_paths:
+        paths = []
+        for path in args.import_paths:
+            paths += sorted(glob.glob(os.path.join(path, "summary*.txt"))) if os.path.isdir(path) else [path]
+        records = []
+        for path in paths:
+            try:
+                records.append(parse_summary(path))
+            except ValueError as e:
+                logging.warning(str(e))
+        if records:
+            index.append(*records)
+        print(f"✅ Imported {len(records)} of {len(paths)} summaries into {index.root}")
+    elif args.caption:
+        print(index.caption(args.caption))
+    else:
+        columns = ["ticker", "stock_name", "currency", "start_year", "cagr", "final_value", "total_invested",
+                   "stdev_log_return", "max_drawdown", "years"]
+        ranked = index.rank(by=args.by, top=args.top, ascending=args.ascending, query=args.query)
+        print(ranked[columns].to_string(index=False))
@@ -1,44 +1,152 @@
-import yfinance as yf
 import pandas as pd
 import copy
+import os
+import sys
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from price_store import PriceStore, get_default_store
+from ticker_info import get_default_info_cache
+from metrics import log_return_moments, risk_metrics
 import numpy as np 
 import logging
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
+class SimulationResult:
+    """
+    Daily SIP simulation held as two contiguous arrays (Close and Cumulative
+    Shares). Investment, Shares, Portfolio Value and Total Invested are derived
+    on access, and ``dtype=np.float32`` halves the footprint again.
+    """
+    COLUMNS = ("Close", "Investment", "Shares", "Cumulative Shares", "Portfolio Value", "Total Invested")
+
+    def __init__(self, index, close, daily_investment: float, dtype=np.float64,
+                 weights=None, periods_per_year: float = 365.4):
+        self.index = pd.DatetimeIndex(index)
+        self.daily_investment = daily_investment
+        self.dtype = np.dtype(dtype)
+        self.periods_per_year = periods_per_year
+        # Contributions per row (trading-calendar mode); None means one per row
+        self.weights = None if weights is None or np.all(weights == 1) else np.asarray(weights, dtype=self.dtype)
+        close = np.asarray(close, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=self.dtype)
+        # Accumulate in float64 even in float32 mode to keep the running sum accurate
+        investment = daily_investment if self.weights is None else daily_investment * np.asarray(weights, dtype=np.float64)
+        self.cumulative_shares = np.cumsum(investment / close).astype(self.dtype, copy=False)
+
+    def __len__(self):
+        return len(self.close)
+
+    @property
+    def nbytes(self) -> int:
+        weights = 0 if self.weights is None else self.weights.nbytes
+        return self.close.nbytes + self.cumulative_shares.nbytes + self.index.nbytes + weights
+
+    def column(self, name: str) -> np.ndarray:
+        if name == "Close":
+            return self.close
+        if name == "Investment":
+            if self.weights is not None:
+                return self.daily_investment * self.weights
+            return np.full(len(self), self.daily_investment, dtype=self.dtype)
+        if name == "Shares":
+            return self.column("Investment") / self.close
+        if name == "Cumulative Shares":
+            return self.cumulative_shares
+        if name == "Portfolio Value":
+            return self.cumulative_shares * self.close
+        if name == "Total Invested":
+            if self.weights is not None:
+                return self.daily_investment * np.cumsum(self.weights)
+            return self.daily_investment * np.arange(1, len(self) + 1, dtype=self.dtype)
+        raise KeyError(name)
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return pd.Series(self.column(name), index=self.index, name=name)
+
+    @property
+    def final_value(self) -> float:
+        return float(self.cumulative_shares[-1]) * float(self.close[-1])
+
+    @property
+    def total_invested(self) -> float:
+        if self.weights is not None:
+            return self.daily_investment * float(self.weights.sum())
+        return self.daily_investment * len(self)
+
+    def stats(self):
+        """Annualized mean and standard deviation of log returns, as InvestmentSimulator.stats()."""
+        count, mean, m2 = log_return_moments(self.column("Portfolio Value").astype(np.float64))
+        periods = self.periods_per_year
+        std = (m2 / (count - 1)) ** 0.5 if count > 1 else np.nan
+        return mean * periods, std * (periods ** 0.5), len(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The DataFrame InvestmentSimulator.simulate() would have produced."""
+        return pd.DataFrame(
+            {name: self.column(name).astype(np.float64, copy=False) for name in self.COLUMNS},
+            index=self.index,
+        )
+
+
 class InvestmentSimulator:
-    def __init__(self, ticker: str, start_year: int, daily_investment: float = 1.0):
+    """
+    Simulate investing ``daily_investment`` every day in ``ticker``.
+
+    ``calendar="daily"`` (default) forward-fills prices to every calendar day
+    and annualizes with 365.4 rows per year. ``calendar="trading"`` keeps only
+    real sessions and annualizes from elapsed time; ``contribution`` then picks
+    how days without a session are handled: ``"session"`` invests once per
+    session, ``"accumulate"`` rolls the contributions of non-trading days into
+    the next session.
+    """
+    CALENDARS = ("daily", "trading")
+    CONTRIBUTIONS = ("session", "accumulate")
+
+    def __init__(self, ticker: str, start_year: int, daily_investment: float = 1.0, store: PriceStore = None,
+                 calendar: str = "daily", contribution: str = "session"):
+        if calendar not in self.CALENDARS:
+            raise ValueError(f"Unknown calendar: {calendar}")
+        if contribution not in self.CONTRIBUTIONS:
+            raise ValueError(f"Unknown contribution rule: {contribution}")
         self.ticker = ticker.upper()
         self.start_year = start_year
         self.daily_investment = daily_investment
+        self.store = store or get_default_store()
+        self.calendar = calendar
+        self.contribution = contribution
         self.data = None
+        self._return_stats = None  # running (count, mean, M2) of daily log returns
+
+    @property
+    def data(self) -> pd.DataFrame:
+        # Rows added by append() are kept as chunks and joined on first read
+        if self._chunks:
+            self._data = pd.concat([self._data, *self._chunks])
+            self._chunks = []
+        return self._data
+
+    @data.setter
+    def data(self, df: pd.DataFrame):
+        self._data = df
+        self._chunks = []
 
     def fetch_data(self):
-        df = yf.download(self.ticker, start=f"{self.start_year}-01-01", interval='1d')
+        df = self.store.get(self.ticker, start=f"{self.start_year}-01-01")
+        if df.empty:
+            raise ValueError(f"No price data found for ticker: {self.ticker}")
         df = df[['Close']].dropna()
-        df = df.resample('D').ffill()
+        if self.calendar == "daily":
+            df = df.resample('D').ffill()
         self.data = df
         return df
     
     def get_stock_info(self):
+        return get_default_info_cache().long_name(self.ticker)
 
-        try:
-            stock_info = yf.Ticker(self.ticker).info
-            stock_name = stock_info.get("longName", "")
-        except:
-            stock_name = ""
-
-        return stock_name
-
-
-    def simulate(self):
-        # Step 1: Fetch if not already available
-        if self.data is None:
-            self.fetch_data()
-
-        df = self.data.copy()
 
+    def _prepare_prices(self, df: pd.DataFrame) -> pd.DataFrame:
         # Step 2: Handle yfinance's MultiIndex columns (e.g., ('Close', 'ROST'))
         if isinstance(df.columns, pd.MultiIndex):
             df.columns = df.columns.droplevel(1)  # Drop the first level ("Ticker")
@@ -53,11 +161,52 @@ class InvestmentSimulator:
             raise ValueError(f"All Close values are null for ticker: {self.ticker}")
 
         # Step 5: Ensure index is datetime and resample to daily frequency
+        # (fetch_data already returns daily rows, so skip the second pass)
         df.index.name = None
-        df = df.resample('D').ffill()
+        if self.calendar == "trading":
+            df = df.dropna(subset=['Close'])
+        elif df.index.freqstr != 'D':
+            df = df.resample('D').ffill()
+        return df
+
+    def _contribution_weights(self, index: pd.DatetimeIndex, previous=None) -> np.ndarray:
+        """Number of daily contributions invested on each row of ``index``."""
+        if self.calendar == "daily" or self.contribution == "session":
+            return np.ones(len(index))
+        days = np.diff(index.values).astype('timedelta64[D]').astype(float)
+        first = 1.0 if previous is None else float((index[0] - previous).days)
+        return np.concatenate([[first], days])
+
+    def _years(self, index: pd.DatetimeIndex) -> float:
+        return self._span_years(index[0], index[-1], len(index))
+
+    def _span_years(self, first, last, rows: int) -> float:
+        if self.calendar == "trading":
+            return ((last - first).days + 1) / 365.25
+        return rows / 365.4  # Approximate number of years based on daily data
+
+    def _periods_per_year(self, index: pd.DatetimeIndex) -> float:
+        return self._span_periods_per_year(index[0], index[-1], len(index))
+
+    def _span_periods_per_year(self, first, last, rows: int) -> float:
+        if self.calendar == "trading":
+            return max(rows - 1, 1) / self._span_years(first, last, rows)
+        return 365.4
+
+    def _span(self):
+        """(first date, last date, rows) of the simulated history, without joining appended chunks."""
+        last = self._chunks[-1] if self._chunks else self._data
+        return self._data.index[0], last.index[-1], len(self._data) + sum(len(c) for c in self._chunks)
+
+    def simulate(self):
+        # Step 1: Fetch if not already available
+        if self.data is None:
+            self.fetch_data()
+
+        df = self._prepare_prices(self.data.copy())
 
         # Step 6: Ensure 'Investment' is a Series aligned to the index
-        df['Investment'] = pd.Series(self.daily_investment, index=df.index)
+        df['Investment'] = self.daily_investment * self._contribution_weights(df.index)
 
         # Step 7: Perform calculations
         df['Shares'] = df['Investment'] / df['Close']
@@ -67,6 +216,77 @@ class InvestmentSimulator:
 
         # Step 8: Save back
         self.data = df
+        self._return_stats = None
+
+    def simulate_compact(self, dtype=np.float64) -> "SimulationResult":
+        """
+        Same simulation as simulate(), returned as an array-backed SimulationResult.
+
+        Nothing is written to self.data; use this for large batch runs and call
+        ``to_frame()`` on the result when the full DataFrame is needed.
+        """
+        if self.data is None:
+            self.fetch_data()
+        df = self._prepare_prices(self.data.copy(deep=False))
+        return SimulationResult(df.index, df['Close'].to_numpy(), self.daily_investment, dtype=dtype,
+                                weights=self._contribution_weights(df.index),
+                                periods_per_year=self._periods_per_year(df.index))
+
+    def append(self, new_prices):
+        """
+        Extend a simulated history with new closes without recomputing it.
+
+        Cumulative shares, the invested total and the running log-return
+        moments used by stats() are carried forward, so only the new rows are
+        computed. They are kept as a chunk and joined to ``data`` on its next
+        read, so an append costs the size of the new rows, not of the history.
+        Returns the new rows.
+        """
+        if self._data is None or 'Portfolio Value' not in self._data.columns:
+            self.simulate()
+        df = self._chunks[-1] if self._chunks else self._data
+
+        close = new_prices['Close'] if isinstance(new_prices, pd.DataFrame) else new_prices
+        if isinstance(close, pd.DataFrame):
+            close = close.iloc[:, 0]
+        close = close.dropna()
+        close = close[close.index > df.index[-1]]
+        if close.empty:
+            return df.iloc[:0]
+
+        # Forward-fill calendar days exactly as simulate() would, seeded by the last stored close
+        last = df.iloc[-1]
+        if self.calendar == "daily":
+            close = pd.concat([pd.Series([last['Close']], index=[df.index[-1]]), close])
+            close = close.resample('D').ffill().iloc[1:]
+
+        new = pd.DataFrame({'Close': close.to_numpy(dtype=float)}, index=close.index)
+        new['Investment'] = self.daily_investment * self._contribution_weights(new.index, previous=df.index[-1])
+        new['Shares'] = new['Investment'] / new['Close']
+        new['Cumulative Shares'] = last['Cumulative Shares'] + new['Shares'].cumsum()
+        new['Portfolio Value'] = new['Cumulative Shares'] * new['Close']
+        new['Total Invested'] = last['Total Invested'] + new['Investment'].cumsum()
+
+        if self._return_stats is not None:
+            values = np.concatenate([[last['Portfolio Value']], new['Portfolio Value'].to_numpy()])
+            self._update_return_stats(np.log(values[1:] / values[:-1]))
+
+        new = new[self._data.columns.intersection(new.columns)]
+        self._chunks.append(new)
+        return new
+
+    def _update_return_stats(self, log_returns):
+        """Merge a batch of log returns into the running (count, mean, M2)."""
+        log_returns = log_returns[~np.isnan(log_returns)]
+        n_b = len(log_returns)
+        if n_b == 0:
+            return
+        mean_b = log_returns.mean()
+        m2_b = ((log_returns - mean_b) ** 2).sum()
+        n_a, mean_a, m2_a = self._return_stats or (0, 0.0, 0.0)
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        self._return_stats = (n, mean_a + delta * n_b / n, m2_a + m2_b + delta ** 2 * n_a * n_b / n)
 
     def stats(self):
         """
@@ -74,21 +294,70 @@ class InvestmentSimulator:
         """
         if self.data is None:
             self.simulate()
-        df = self.data
-        # Calculate log returns
-        df['log_return'] = np.log(df['Portfolio Value'] / df['Portfolio Value'].shift(1))
-        log_return_mean = df['log_return'].mean() * 365.4
-        log_return_std = df['log_return'].std() * (365.4 ** 0.5)
-        len_df = len(df)
+        if self._return_stats is None:
+            self._return_stats = log_return_moments(self.data['Portfolio Value'].to_numpy(dtype=float))
+        count, mean, m2 = self._return_stats
+        # After append() the moments are already current; don't join the chunks just for the span
+        first, last, len_df = self._span()
+        periods = self._span_periods_per_year(first, last, len_df)
+        log_return_mean = mean * periods
+        log_return_std = (m2 / (count - 1)) ** 0.5 * (periods ** 0.5) if count > 1 else np.nan
         return log_return_mean, log_return_std, len_df
 
+    def risk_metrics(self, risk_free: float = 0.0) -> pd.Series:
+        """
+        Mean return, volatility, downside deviation, Sharpe/Sortino and max
+        drawdown of the Close series, annualized on this simulator's calendar.
+        """
+        if self.data is None:
+            self.fetch_data()
+        close = self.data['Close']
+        if isinstance(close, pd.DataFrame):
+            close = close.iloc[:, 0]
+        return risk_metrics(close, periods_per_year=self._periods_per_year(close.index), risk_free=risk_free)
+
+    def start_date_curve(self) -> pd.DataFrame:
+        """
+        SIP outcome for every possible start date, investing daily until the end.
+
+        Uses suffix sums of contributions/Close, so the whole curve costs one
+        pass over the history instead of one simulate() per start date. Rows
+        follow the simulator's calendar and contribution rule, so the first
+        row matches get_results().
+        """
+        if self.data is None:
+            self.fetch_data()
+        close = self.data['Close']
+        if isinstance(close, pd.DataFrame):
+            close = close.iloc[:, 0]
+        prices = close.to_numpy(dtype=float)
+        index = close.index
+
+        # Contributions per row as simulate() would invest them; a run starting
+        # on row i invests one contribution there, whatever the gap before it
+        weights = self._contribution_weights(index)
+        later_shares = np.concatenate([np.cumsum((weights / prices)[:0:-1])[::-1], [0.0]])
+        later_contributions = np.concatenate([np.cumsum(weights[:0:-1])[::-1], [0.0]])
+        final_value = self.daily_investment * (1.0 / prices + later_shares) * prices[-1]
+        total_invested = self.daily_investment * (1.0 + later_contributions)
+        rows = np.arange(len(prices), 0, -1)
+        years = np.asarray(self._span_years(index, index[-1], rows), dtype=float)
+        cagr = (final_value / total_invested) ** (1 / years) - 1
+
+        return pd.DataFrame({
+            "Final Value": final_value,
+            "Total Invested": total_invested,
+            "Years": years,
+            "CAGR": cagr,
+        }, index=close.index)
+
     def get_results(self):
         if self.data is None:
             self.simulate()
         df = self.data
         final_value = df['Portfolio Value'].iloc[-1]
         total_invested = df['Total Invested'].iloc[-1]
-        years = len(df) / 365.4  # Approximate number of years based on daily data
+        years = self._years(df.index)
         logging.info(f"Final value: {final_value}, Total invested: {total_invested}, Years: {years}")
         cagr = ((((final_value / total_invested) ** (1 / years)) - 1)) 
         logging.info(f"CAGR: {cagr:.6f}")       # Decimal format
@@ -109,8 +378,9 @@ class InvestmentSimulator:
             "end_date": df.index.max() if not df.empty else None,
             "final_value": df['Portfolio Value'].iloc[-1] if not df.empty else None,
             "total_invested": df['Total Invested'].iloc[-1] if not df.empty else None,
-            "Duration": len(df) / 365.4,  # Approximate number of years based on daily data
-            "cagr": ((((df['Portfolio Value'].iloc[-1] / df['Total Invested'].iloc[-1]) ** (1 / (len(df) / 365.4))) - 1)) * 100 if not df.empty else None
+            "calendar": self.calendar,
+            "Duration": self._years(df.index) if not df.empty else None,
+            "cagr": ((((df['Portfolio Value'].iloc[-1] / df['Total Invested'].iloc[-1]) ** (1 / self._years(df.index))) - 1)) * 100 if not df.empty else None
         }
         return desc
         
\ No newline at end of file
@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# plotter/renderers live in clip_creator/, one level up from these scripts
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from plotter import PlotBuilderOneDay
+from renderers import make_renderer
+
+
+def synthetic_simulation(years: int = 10, daily_investment: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    """Daily frame shaped like InvestmentSimulator.simulate() output, from a random walk."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2015-01-01", periods=int(years * 365.4), freq="D")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, len(index))))
+    df = pd.DataFrame({"Close": close}, index=index)
+    df["Daily Investment"] = daily_investment
+    df["Total Invested"] = df["Daily Investment"].cumsum()
+    df["Portfolio Value"] = (df["Daily Investment"] / df["Close"]).cumsum() * df["Close"]
+    df["Formatted_Date"] = df.index.strftime("%d-%m-%Y")
+    return df
+
+
+def bench(backend: str, df: pd.DataFrame, num_frames: int, folder: str):
+    plot = PlotBuilderOneDay(df, ticker="BENCH", start_year=df.index[0].year, name="Benchmark Ltd")
+    renderer = make_renderer(plot, backend)
+    cut_points = np.linspace(1, len(plot._pv), num=num_frames, dtype=int)
+
+    start = time.perf_counter()
+    for frame_num, n in enumerate(cut_points, start=1):
+        renderer.save(n, os.path.join(folder, f"{backend}_{frame_num:03d}.png"))
+    return (time.perf_counter() - start) / num_frames
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time reel frame rendering per backend")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--backends", nargs="+", default=["kaleido", "agg", "agg-layered"])
+    args = parser.parse_args()
+
+    df = synthetic_simulation(args.years)
+    with tempfile.TemporaryDirectory() as folder:
+        for backend in args.backends:
+            try:
+                per_frame = bench(backend, df, args.frames, folder)
+            except Exception as e:
+                # Kaleido needs a working Chrome; report it and keep going
+                print(f"{backend:>8}: failed ({str(e).strip().splitlines()[0]})")
+                continue
+            print(f"{backend:>8}: {per_frame * 1000:.0f} ms/frame ({args.frames} frames, {len(df)} rows)")
@@ -1,6 +1,10 @@
-import yfinance as yf
 import requests
 import os
+import sys
+
+# ticker_info lives in shared/ at the repo root, two levels up from these scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "shared"))
+from ticker_info import get_default_info_cache
 
 class TickerLogo:
     
@@ -15,8 +19,7 @@ class TickerLogo:
 
     def download_and_save_logo(self, save_dir="logos"):
         try:
-            stock = yf.Ticker(self.ticker)
-            website = stock.info.get("website", "")
+            website = get_default_info_cache().website(self.ticker)
             logo_url = self.get_logo_from_clearbit(website)
             if not logo_url:
                 return None
@@ -0,0 +1,140 @@
+import os
+import queue
+import threading
+
+import numpy as np
+
+_STOP = object()
+
+
+class VideoWriter:
+    """
+    Streams RGB frames straight into an ffmpeg encoder.
+
+    Frames are handed to ``write`` in order and encoded by a background
+    thread fed through a bounded queue, so rendering the next frame overlaps
+    with encoding the previous ones without keeping the whole reel in memory
+    or writing PNGs to disk. ``crf``, ``preset`` and ``threads`` go to x264.
+
+    Use as a context manager; leaving the block flushes the queue and closes
+    the file, and any encoder error is re-raised in the caller. If the block
+    raises, the encoder is killed and the partial file removed instead, so
+    the original exception is the one that propagates.
+    """
+
+    def __init__(self, output: str, width: int = 1080, height: int = 1920, fps: float = 10,
+                 codec: str = "libx264", crf: int = 23, preset: str = "medium",
+                 threads: int = None, queue_size: int = 8):
+        self.output = output
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.codec = codec
+        self.crf = crf
+        self.preset = preset
+        self.threads = threads
+        self.frames_written = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._aborted = False
+        self._thread = None
+
+    def _encoder(self):
+        from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+        return FFMPEG_VideoWriter(
+            self.output, size=(self.width, self.height), fps=self.fps, codec=self.codec,
+            preset=self.preset, threads=self.threads, ffmpeg_params=["-crf", str(self.crf)],
+        )
+
+    def open(self):
+        self._writer = self._encoder()
+        self._thread = threading.Thread(target=self._consume, name="video-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def _consume(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            if self._error is not None or self._aborted:
+                continue  # keep draining so the producer never blocks
+            frame, repeat = item
+            try:
+                for _ in range(repeat):
+                    self._writer.write_frame(frame)
+                    self.frames_written += 1
+            except Exception as e:
+                self._error = e
+
+    def write(self, frame: np.ndarray, repeat: int = 1):
+        """
+        Queue one (height, width, 3) uint8 frame, shown for ``repeat`` frames
+        (a hold costs one copy, not one render). Blocks while the queue is full.
+        """
+        if self._error is not None:
+            raise self._error
+        if frame.shape[:2] != (self.height, self.width):
+            raise ValueError(f"Frame shape {frame.shape[:2]} does not match {(self.height, self.width)}")
+        # Copy: renderers reuse their pixel buffer for the next frame
+        self._queue.put((np.array(frame[..., :3], dtype=np.uint8, order="C"), repeat))
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._writer.close()
+        if self._error is not None:
+            raise self._error
+
+    def abort(self):
+        """Stop without finishing the file: kill the encoder and remove the partial output."""
+        if self._thread is None:
+            return
+        self._aborted = True
+        proc = getattr(self._writer, "proc", None)
+        if proc is not None:
+            proc.kill()
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        try:
+            self._writer.close()
+        except Exception:
+            pass  # a killed encoder complains on close; the caller's error is the one that matters
+        try:
+            os.remove(self.output)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def write_video(renderer, rows, output: str, fps: float = 10, holds=None, profiler=None, **writer_kwargs) -> int:
+    """
+    Render ``renderer.render(n)`` for each row count in ``rows`` and stream
+    the frames into ``output``, repeating state ``i`` ``holds[i]`` times
+    (e.g. a FramePlan's rows and holds). Each render is timed as a frame
+    when a ``profiling.Profiler`` is given. Returns the number of frames written.
+    """
+    holds = np.ones(len(rows), dtype=int) if holds is None else holds
+    with VideoWriter(output, width=renderer.width, height=renderer.height, fps=fps, **writer_kwargs) as writer:
+        for n, hold in zip(rows, holds):
+            if profiler is None:
+                frame = renderer.render(n)
+            else:
+                with profiler.frame(n):
+                    frame = renderer.render(n)
+            writer.write(frame, repeat=int(hold))
+    print(f"🎬 Reel saved to: {output} ({writer.frames_written} frames)")
+    return writer.frames_written
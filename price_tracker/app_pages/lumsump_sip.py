@@ -1,11 +1,78 @@
 import streamlit as st
-from utils import get_stock_data, simulate_lumpsum, simulate_sip, get_stock_info, standard_deviation_of_returns, mean_of_returns
+import os
+import sys
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "shared"))
+from utils import get_stock_data, simulate_lumpsum, simulate_sip, get_stock_info, risk_summary
+from downsample import downsample
+from range_cache import RangeCache, get_default_range_cache
+from projection import project
 import plotly.graph_objects as go
 from datetime import date
+import numpy as np
 import pandas as pd
 
 from dateutil.relativedelta import relativedelta
 
+def projection_chart(prices, start_value, start_invested, years, contribution=0.0, steps_per_year=252):
+    """
+    Plotly fan chart of projection.project() percentile bands, continuing
+    from the last price date with the drift/volatility of ``prices``.
+    """
+    log_returns = np.log(prices).diff().dropna()
+    bands = project(
+        start_value=start_value,
+        mu=float(log_returns.mean()) * 252,
+        sigma=float(log_returns.std()) * 252 ** 0.5,
+        years=years,
+        contribution=contribution,
+        n_paths=20_000,
+        steps_per_year=steps_per_year,
+        start_date=prices.index[-1],
+        start_invested=start_invested,
+        seed=0,  # same chart on every rerun
+    )
+
+    fig = go.Figure()
+    for low, high, alpha in [("P5", "P95", 0.15), ("P25", "P75", 0.3)]:
+        fig.add_trace(go.Scatter(
+            x=bands.index, y=bands[high], mode="lines", line=dict(width=0),
+            showlegend=False, hoverinfo="skip"
+        ))
+        fig.add_trace(go.Scatter(
+            x=bands.index, y=bands[low], mode="lines", line=dict(width=0),
+            fill="tonexty", fillcolor=f"rgba(65,105,225,{alpha})",
+            name=f"{low[1:]}-{high[1:]}th percentile", hoverinfo="skip"
+        ))
+    fig.add_trace(go.Scatter(
+        x=bands.index, y=bands["Portfolio Value"], mode="lines",
+        name="Median", line=dict(color="royalblue", width=3)
+    ))
+    fig.add_trace(go.Scatter(
+        x=bands.index, y=bands["Total Invested"], mode="lines",
+        name="Total Invested", line=dict(color="gray", dash="dot")
+    ))
+    fig.update_layout(
+        title=f"Projected Value over the next {years} years",
+        xaxis_title="Date",
+        yaxis_title="₹ Value",
+        template="plotly_white",
+        hovermode="x unified",
+        height=450,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=40, r=40, t=50, b=40)
+    )
+    return fig, bands
+
+
+def projection_caption(bands) -> str:
+    return (
+        f"Median ₹{bands['Portfolio Value'].iloc[-1]:,.0f}, 90% range "
+        f"₹{bands['P5'].iloc[-1]:,.0f} - ₹{bands['P95'].iloc[-1]:,.0f} "
+        f"(Monte Carlo on this stock's past daily returns)"
+    )
+
+
 def app():
     # --- Streamlit Page Config ---
 
@@ -15,7 +82,11 @@ def app():
 
     # --- User Inputs ---
     ticker = st.text_input("Enter Stock Symbol (e.g., TCS.NS, INFY.NS, AAPL)", "TCS.NS")
-    st.write("Name of the Company:",get_stock_info(ticker))
+    # Look the name up only when the ticker changes, not on every widget rerun
+    if st.session_state.get("company_ticker") != ticker:
+        st.session_state.company_ticker = ticker
+        st.session_state.company_name = get_stock_info(ticker)
+    st.write("Name of the Company:", st.session_state.company_name)
     start_date = st.date_input("Start Date", date(2015, 1, 1))
     end_date = st.date_input("End Date", date.today())
 
@@ -30,15 +101,27 @@ def app():
         duration = relativedelta(end_date, start_date)
         duration_months = duration.months + duration.years * 12
         st.write(f"Duration: {duration.years} years and {duration.months} months ({duration_months} months total)")
+    projection_years = st.number_input("Projection Years (0 to skip)", min_value=0, max_value=30, value=10)
 
     # --- Main Logic ---
     if st.button("Track"):
-        data = get_stock_data(ticker, start_date, end_date)
+        # Session cache over the process-wide one: date changes inside a range
+        # already fetched are slices, wider ranges fetch only the new edges
+        if "price_cache" not in st.session_state:
+            st.session_state.price_cache = RangeCache(source=get_default_range_cache(), max_tickers=8)
+        data = get_stock_data(ticker, start_date, end_date, cache=st.session_state.price_cache)
         # --- Display Inputs ---
         st.subheader("🔍 Investment Details")
         st.write(f"**Ticker:** {ticker.upper()}")
-        st.write(f'**Annualized Return:** {mean_of_returns(data):.2f}%')
-        st.write(f"**Standard Deviation of Returns:** {standard_deviation_of_returns(data):.2f}%")
+        if not data.empty:
+            risk = risk_summary(data)
+            st.write(f'**Annualized Return:** {risk["mean_return"] * 100:.2f}%')
+            st.write(f"**Standard Deviation of Returns:** {risk['volatility'] * 100:.2f}%")
+            st.write(
+                f"**Max Drawdown:** {risk['max_drawdown'] * 100:.2f}% "
+                f"(longest {int(risk['max_drawdown_duration'])} trading days below a peak)"
+            )
+            st.write(f"**Sharpe Ratio:** {risk['sharpe']:.2f} | **Sortino Ratio:** {risk['sortino']:.2f}")
 
 
         if data.empty:
@@ -55,10 +138,16 @@ def app():
             # Ensure it's a pandas Series (not a DataFrame column mistakenly wrapped)
             if isinstance(price_series, pd.DataFrame):
                 price_series = price_series.iloc[:, 0]
+            price_series_full = price_series  # the chart below keeps only a sample
 
-            # Calculate moving averages
-            ma30 = price_series.rolling(30).mean()
-            ma90 = price_series.rolling(90).mean()
+            # Calculate moving averages on the full series, then send only
+            # about one point per pixel of each line to the browser
+            chart = downsample(pd.DataFrame({
+                "close": price_series,
+                "ma30": price_series.rolling(30).mean(),
+                "ma90": price_series.rolling(90).mean(),
+            }))
+            price_series, ma30, ma90 = chart["close"], chart["ma30"], chart["ma90"]
 
             # Plotly figure
             fig = go.Figure()
@@ -121,6 +210,7 @@ def app():
                 )
 
                 st.subheader("📈 Lump Sum Portfolio Value Over Time")
+                lump_df = downsample(lump_df, columns=["Portfolio Value"])
 
                 fig3 = go.Figure()
                 fig3.add_trace(go.Scatter(
@@ -150,23 +240,30 @@ def app():
                     margin=dict(l=40, r=40, t=50, b=40)
                 )
                 st.plotly_chart(fig3, use_container_width=True)
+
+                if projection_years:
+                    st.subheader("🔮 Projected Lump Sum Value")
+                    fig4, bands = projection_chart(price_series_full, final_val, amount, projection_years)
+                    st.plotly_chart(fig4, use_container_width=True)
+                    st.caption(projection_caption(bands))
                 
 
             else:
                 sip_df = simulate_sip(data, amount)
                 st.subheader("📈 SIP Investment Growth Over Time")
+                sip_chart = downsample(sip_df, columns=["Invested", "Value"])
 
                 fig2 = go.Figure()
                 fig2.add_trace(go.Scatter(
-                    x=sip_df.index,
-                    y=sip_df["Invested"],
+                    x=sip_chart.index,
+                    y=sip_chart["Invested"],
                     mode="lines+markers",
                     name="Total Invested",
                     fill="tozeroy"
                 ))
                 fig2.add_trace(go.Scatter(
-                    x=sip_df.index,
-                    y=sip_df["Value"],
+                    x=sip_chart.index,
+                    y=sip_chart["Value"],
                     mode="lines+markers",
                     name="Portfolio Value",
                     fill="tonexty"
@@ -193,3 +290,11 @@ def app():
                     f"💸 Total Invested: ₹{total_inv:,.2f}\n\n"
                     f"📈 Gain: ₹{gain:,.2f} ({pct_gain:.2f}%)"
                 )
+
+                if projection_years:
+                    st.subheader("🔮 Projected SIP Value")
+                    # One step per month, so the SIP amount keeps going in every step
+                    fig4, bands = projection_chart(price_series_full, final_val, total_inv, projection_years,
+                                                   contribution=amount, steps_per_year=12)
+                    st.plotly_chart(fig4, use_container_width=True)
+                    st.caption(projection_caption(bands))
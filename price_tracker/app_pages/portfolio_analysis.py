@@ -4,7 +4,6 @@ import datetime as dt
 import pandas as pd
 
 # Yahoo Finance
-import yfinance as yf
 import financedatabase as fd
 
 # Data viz
@@ -12,6 +11,14 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+import os
+import sys
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "shared"))
+from price_store import get_default_store
+from ticker_info import get_default_info_cache
+from downsample import downsample
+
 def app():
 
     # App config
@@ -44,12 +51,14 @@ def app():
         # Portfolio builder
         sel_tickers = st.multiselect('Portfolio Builder', placeholder="Search tickers", options=ticker_list.symbol_name)
         sel_tickers_list = ticker_list[ticker_list.symbol_name.isin(sel_tickers)].symbol
+        # One batched metadata lookup per rerun, shared by every logo below
+        ticker_infos = get_default_info_cache().infos(sel_tickers_list)
 
         # Display logos
         cols = st.columns(4)
         for i, ticker in enumerate(sel_tickers_list):
             try:
-                cols[i % 4].image('https://logo.clearbit.com/' + yf.Ticker(ticker).info['website'].replace('https://www.', ''), width=65)
+                cols[i % 4].image('https://logo.clearbit.com/' + ticker_infos[ticker]['website'].replace('https://www.', ''), width=65)
             except:
                 cols[i % 4].subheader(ticker)
 
@@ -60,7 +69,7 @@ def app():
 
         # Select tickers data
         if len(sel_tickers) != 0:
-            yfdata = yf.download(list(sel_tickers_list), start=sel_dt1, end=sel_dt2)['Close'].reset_index().melt(id_vars = ['Date'], var_name = 'ticker', value_name='price')
+            yfdata = get_default_store().get_close_matrix(list(sel_tickers_list), start=sel_dt1, end=sel_dt2).reset_index().melt(id_vars = ['Date'], var_name = 'ticker', value_name='price')
             yfdata['price_start'] = yfdata.groupby('ticker').price.transform('first')
             yfdata['price_pct_daily'] = yfdata.groupby('ticker').price.pct_change()
             yfdata['price_pct'] = (yfdata.price - yfdata.price_start) / yfdata.price_start
@@ -80,7 +89,9 @@ def app():
         with tab1:
             # All stocks plot
             st.subheader('All Stocks')
-            fig = px.line(yfdata, x='Date', y='price_pct', color='ticker', markers=True)
+            # One LTTB-downsampled line per ticker keeps the chart payload small
+            chart_data = yfdata.set_index('Date').groupby('ticker', group_keys=False)[['ticker', 'price', 'price_pct']].apply(downsample, columns=['price_pct']).reset_index()
+            fig = px.line(chart_data, x='Date', y='price_pct', color='ticker', markers=True)
             fig.add_hline(y=0, line_dash="dash", line_color="white") 
             fig.update_layout(xaxis_title=None, yaxis_title=None)
             fig.update_yaxes(tickformat=',.0%') 
@@ -92,19 +103,18 @@ def app():
             for i, ticker in enumerate(sel_tickers_list):
                 # Adding logo
                 try:
-                    cols[i % 3].image('https://logo.clearbit.com/' + yf.Ticker(ticker).info['website'].replace('https://www.', ''), width=65)
+                    cols[i % 3].image('https://logo.clearbit.com/' + ticker_infos[ticker]['website'].replace('https://www.', ''), width=65)
                 except:
                     cols[i % 3].subheader(ticker)
 
                 # Stock metrics
                 cols2 = cols[i % 3].columns(3)
-                ticker = 'Close' if len(sel_tickers_list) == 1 else ticker
                 cols2[0].metric(label='50-Day Average', value=round(yfdata[yfdata.ticker == ticker].price.tail(50).mean(),2))
                 cols2[1].metric(label='1-Year Low', value=round(yfdata[yfdata.ticker == ticker].price.tail(365).min(),2))
                 cols2[2].metric(label='1-Year High', value=round(yfdata[yfdata.ticker == ticker].price.tail(365).max(),2))
 
                 # Stock plot
-                fig = px.line(yfdata[yfdata.ticker == ticker], x='Date', y='price', markers=True)
+                fig = px.line(chart_data[chart_data.ticker == ticker], x='Date', y='price', markers=True)
                 fig.update_layout(xaxis_title=None, yaxis_title=None)
                 cols[i % 3].plotly_chart(fig, use_container_width=True)
 
@@ -118,7 +128,7 @@ def app():
             for i, ticker in enumerate(sel_tickers_list):
                 cols = cols_tab2[0].columns((0.1,0.3))
                 try:
-                    cols[0].image('https://logo.clearbit.com/' + yf.Ticker(ticker).info['website'].replace('https://www.', ''), width=65)
+                    cols[0].image('https://logo.clearbit.com/' + ticker_infos[ticker]['website'].replace('https://www.', ''), width=65)
                 except:
                     cols[0].subheader(ticker)
 
@@ -0,0 +1,140 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from price_store import get_default_store
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def _now() -> pd.Timestamp:
+    return pd.Timestamp.now()
+
+
+class RangeCache:
+    """
+    In-memory price cache holding, per ticker, the widest ``[start, end)``
+    range requested so far.
+
+    A request inside that range is a slice of the held frame; otherwise only
+    the missing head and/or tail are asked from ``source`` (anything with
+    PriceStore's ``get(ticker, start, end, max_age)``, including another
+    RangeCache)
+    and merged in. An open or future ``end`` counts as covering up to today,
+    so the next day's first request fetches just the new tail. A last bar
+    fetched on its own trading day may be an intraday snapshot: once it is
+    ``live_ttl`` seconds old, a request reaching it fetches it again, passing
+    the same ``max_age`` on so ``source`` does not answer from its own
+    copy of the snapshot. At most
+    ``max_tickers`` tickers are held, least recently used first out.
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(self, source=None, max_tickers: int = 64, live_ttl: float = 15 * 60):
+        self.source = source or get_default_store()
+        self.max_tickers = max_tickers
+        self.live_ttl = live_ttl
+        # ticker -> (covered start, covered end, frame, when the tail was fetched)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # One fetch per ticker at a time from a fixed set of locks, so
+        # different tickers (mostly) download concurrently and nothing grows per ticker
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+
+    @staticmethod
+    def _bounds(start, end):
+        # Nothing after today can have been fetched, so a later end means "up to now"
+        tomorrow = _now().normalize() + pd.Timedelta(days=1)
+        start_ts = pd.Timestamp(start) if start is not None else None
+        end_ts = min(pd.Timestamp(end), tomorrow) if end is not None else tomorrow
+        return start_ts, end_ts
+
+    def _fetch(self, ticker: str, start, end, max_age: float) -> pd.DataFrame:
+        df = self.source.get(ticker, start=start, end=end, max_age=max_age)
+        return df if df is not None else pd.DataFrame()
+
+    @staticmethod
+    def _tail_start(df: pd.DataFrame, covered_end, end_ts, fetched_at, max_age: float):
+        """Where a tail fetch must start, or None if the held tail is still good."""
+        if not df.empty:
+            last = df.index[-1]
+            # Fetched on the bar's own day (so possibly mid-session) and now stale
+            live = last >= fetched_at.normalize()
+            if live and end_ts > last and (_now() - fetched_at).total_seconds() >= max_age:
+                return last
+        return covered_end if end_ts > covered_end else None
+
+    def get(self, ticker: str, start=None, end=None, max_age: float = None) -> pd.DataFrame:
+        """
+        Daily rows for ``start <= date < end``, like PriceStore.get();
+        ``max_age`` overrides ``live_ttl`` for this call.
+        """
+        ticker = ticker.upper()
+        start_ts, end_ts = self._bounds(start, end)
+        max_age = self.live_ttl if max_age is None else max_age
+        with self._locks[hash(ticker) % len(self._locks)]:
+            with self._lock:
+                entry = self._entries.get(ticker)
+            if entry is None:
+                fetched_at = _now()
+                df = self._fetch(ticker, start_ts, end_ts, max_age)
+                if df.empty:
+                    return df  # not held, so a fixed ticker or range is retried
+                covered = (start_ts, end_ts)
+            else:
+                covered_start, covered_end, df, fetched_at = entry
+                parts = [df]
+                # Head: an earlier (or open) start than anything held
+                if covered_start is not None and (start_ts is None or start_ts < covered_start):
+                    logging.info(f"RangeCache: head fetch for {ticker} before {covered_start.date()}")
+                    parts.insert(0, self._fetch(ticker, start_ts, covered_start, max_age))
+                    covered_start = start_ts
+                # Tail: a later end than anything held, or a stale live last bar
+                tail_start = self._tail_start(df, covered_end, end_ts, fetched_at, max_age)
+                if tail_start is not None:
+                    logging.info(f"RangeCache: tail fetch for {ticker} from {tail_start.date()}")
+                    fetched_at = _now()
+                    parts.append(self._fetch(ticker, tail_start, end_ts, max_age))
+                    covered_end = max(covered_end, end_ts)
+                if len(parts) > 1:
+                    parts = [p for p in parts if not p.empty]
+                    df = pd.concat(parts) if parts else df
+                    df = df[~df.index.duplicated(keep="last")].sort_index()
+                covered = (covered_start, covered_end)
+
+            with self._lock:
+                self._entries[ticker] = (*covered, df, fetched_at)
+                self._entries.move_to_end(ticker)
+                while len(self._entries) > self.max_tickers:
+                    self._entries.popitem(last=False)
+
+        if df.empty:
+            return df
+        lo = df.index.searchsorted(start_ts) if start_ts is not None else 0
+        hi = df.index.searchsorted(end_ts)
+        # Copy so callers can add columns without touching the cached frame
+        return df.iloc[lo:hi].copy()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_default_cache = None
+
+
+def get_default_range_cache() -> RangeCache:
+    """Process-wide cache over the default PriceStore, shared by all sessions."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RangeCache()
+    return _default_cache
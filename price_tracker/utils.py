@@ -1,19 +1,24 @@
 import yfinance as yf
+import numpy as np
 import pandas as pd
-
-def get_stock_data(ticker, start, end):
-    data = yf.download(ticker, start=start, end=end)
-    return data["Close"].dropna()
+import os
+import sys
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from range_cache import get_default_range_cache
+from ticker_info import get_default_info_cache
+from metrics import risk_metrics
+
+def get_stock_data(ticker, start, end, cache=None):
+    # Served from the widest range already held in memory; only missing edges are fetched
+    data = (cache or get_default_range_cache()).get(ticker, start=start, end=end)
+    if data.empty:
+        return pd.DataFrame()
+    # Same shape as yf.download(...)["Close"]: one column named after the ticker
+    return data[["Close"]].rename(columns={"Close": ticker.upper()}).dropna()
 
 def get_stock_info(ticker):
-
-    try:
-        stock_info = yf.Ticker(ticker).info
-        stock_name = stock_info.get("longName", "")
-    except:
-        stock_name = ""
-
-    return stock_name
+    return get_default_info_cache().long_name(ticker)
 
 
 import pandas as pd
@@ -42,42 +47,53 @@ def simulate_lumpsum(data, amount):
     return shares_bought, float(portfolio_value.iloc[-1]), df
 
 
-def simulate_sip(data, monthly_amount):
-    investment = 0
-    total_shares = 0
-    results = []
-
-    # Get monthly investment dates
-    for date in pd.date_range(data.index[0], data.index[-1], freq="MS"):
-        if date not in data.index:
-            # Get nearest next available date
-            future_dates = data[data.index > date]
-            if not future_dates.empty:
-                date = future_dates.index[0]
-            else:
-                continue
-
-        price = float(data.loc[date])
-        shares = monthly_amount / price
-        total_shares += shares
-        investment += monthly_amount
-        value = total_shares * float(data.loc[date])
-        results.append((date, investment, value))
-
-    df = pd.DataFrame(results, columns=["Date", "Invested", "Value"]).set_index("Date")
+def simulate_sip(data, monthly_amount, freq="MS", dates=None):
+    """
+    Invest ``monthly_amount`` on every date of a schedule and track the value.
+
+    The schedule is ``pd.date_range(first, last, freq=freq)`` (monthly by
+    default; e.g. "W-MON" or "D" also work) or an explicit list of ``dates``.
+    Dates that are not trading days roll forward to the next available one.
+    """
+    # Make sure it's a clean 1D Series (not DataFrame or multi-column)
+    if isinstance(data, pd.DataFrame):
+        data = data['Close'] if 'Close' in data.columns else data.iloc[:, 0]
+
+    if dates is None:
+        dates = pd.date_range(data.index[0], data.index[-1], freq=freq)
+
+    # Resolve every investment date to the next available trading day at once
+    pos = data.index.searchsorted(pd.DatetimeIndex(dates), side="left")
+    pos = pos[pos < len(data)]
+
+    prices = data.to_numpy(dtype=float)[pos]
+    amounts = np.full(len(pos), monthly_amount)
+    total_shares = np.cumsum(amounts / prices)
+    investment = np.cumsum(amounts)
+
+    df = pd.DataFrame(
+        {"Invested": investment, "Value": total_shares * prices},
+        index=pd.Index(data.index[pos], name="Date"),
+    )
     return df
 
+def risk_summary(df):
+    """
+    Annualized return/risk metrics (decimals) of the first price column,
+    computed in one pass by metrics.risk_metrics.
+    """
+    price_series = df.dropna()
+    if isinstance(price_series, pd.DataFrame):
+        price_series = price_series.iloc[:, 0]
+    return risk_metrics(price_series, periods_per_year=252)
+
 def standard_deviation_of_returns(df):
     """
     Calculate the standard deviation of the portfolio returns.
     """
     if df.empty:
         return 0.0
-    price_series = df.dropna()
-    price_series = price_series.iloc[:, 0]
-
-    returns = price_series.pct_change().dropna()
-    return ((returns.std() * (252 ** 0.5))*100)  # Annualized standard deviation
+    return risk_summary(df)["volatility"] * 100  # Annualized standard deviation
 
 def mean_of_returns(df):
     """
@@ -85,8 +101,4 @@ def mean_of_returns(df):
     """
     if df.empty:
         return 0.0
-    price_series = df.dropna()
-    price_series = price_series.iloc[:, 0]
-
-    returns = price_series.pct_change().dropna()
-    return ((returns.mean() * 252 )* 100) # Annualized mean return
\ No newline at end of file
+    return risk_summary(df)["mean_return"] * 100 # Annualized mean return
\ No newline at end of file
@@ -1,31 +1,49 @@
-import yfinance as yf
 import pandas as pd
 import copy
+import numpy as np
+import os
+import sys
+# price_store, ticker_info, metrics, downsample and projection are shared by the apps
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from price_store import PriceStore, get_default_store
+from ticker_info import get_default_info_cache
+from metrics import risk_metrics
 
 
 class InvestmentSimulator:
-    def __init__(self, ticker: str, start_year: int, daily_investment: float = 1.0):
+    """
+    ``calendar="daily"`` (default) forward-fills prices to every calendar day;
+    ``calendar="trading"`` keeps only real sessions, invests once per session
+    (or, with ``contribution="accumulate"``, rolls the contributions of
+    non-trading days into the next session) and annualizes from elapsed time.
+    """
+
+    def __init__(self, ticker: str, start_year: int, daily_investment: float = 1.0, store: PriceStore = None,
+                 calendar: str = "daily", contribution: str = "session"):
+        if calendar not in ("daily", "trading"):
+            raise ValueError(f"Unknown calendar: {calendar}")
+        if contribution not in ("session", "accumulate"):
+            raise ValueError(f"Unknown contribution rule: {contribution}")
         self.ticker = ticker.upper()
         self.start_year = start_year
         self.daily_investment = daily_investment
+        self.store = store or get_default_store()
+        self.calendar = calendar
+        self.contribution = contribution
         self.data = None
 
     def fetch_data(self):
-        df = yf.download(self.ticker, start=f"{self.start_year}-01-01", interval='1d')
+        df = self.store.get(self.ticker, start=f"{self.start_year}-01-01")
+        if df.empty:
+            raise ValueError(f"No price data found for ticker: {self.ticker}")
         df = df[['Close']].dropna()
-        df = df.resample('D').ffill()
+        if self.calendar == "daily":
+            df = df.resample('D').ffill()
         self.data = df
         return df
     
     def get_stock_info(self):
-
-        try:
-            stock_info = yf.Ticker(self.ticker).info
-            stock_name = stock_info.get("longName", "")
-        except:
-            stock_name = ""
-
-        return stock_name
+        return get_default_info_cache().long_name(self.ticker)
 
 
     def simulate(self):
@@ -50,10 +68,18 @@ class InvestmentSimulator:
 
         # Step 5: Ensure index is datetime and resample to daily frequency
         df.index.name = None
-        df = df.resample('D').ffill()
+        if self.calendar == "trading":
+            df = df.dropna(subset=['Close'])
+            weights = np.ones(len(df))
+            if self.contribution == "accumulate":
+                weights[1:] = np.diff(df.index.values).astype('timedelta64[D]').astype(float)
+        else:
+            if df.index.freqstr != 'D':
+                df = df.resample('D').ffill()
+            weights = np.ones(len(df))
 
         # Step 6: Ensure 'Investment' is a Series aligned to the index
-        df['Investment'] = pd.Series(self.daily_investment, index=df.index)
+        df['Investment'] = self.daily_investment * weights
 
         # Step 7: Perform calculations
         df['Shares'] = df['Investment'] / df['Close']
@@ -65,12 +91,28 @@ class InvestmentSimulator:
         self.data = df
 
 
+    def risk_metrics(self, risk_free: float = 0.0) -> pd.Series:
+        """Return/risk metrics of the Close series, annualized on this simulator's calendar."""
+        if self.data is None:
+            self.fetch_data()
+        close = self.data['Close']
+        if isinstance(close, pd.DataFrame):
+            close = close.iloc[:, 0]
+        if self.calendar == "trading":
+            periods = (len(close) - 1) / (((close.index[-1] - close.index[0]).days + 1) / 365.25)
+        else:
+            periods = 365.25
+        return risk_metrics(close, periods_per_year=periods, risk_free=risk_free)
+
     def get_results(self):
         if self.data is None:
             self.simulate()
         df = self.data
         final_value = df['Portfolio Value'].iloc[-1]
         total_invested = df['Total Invested'].iloc[-1]
-        years = len(df) / 365.25
+        if self.calendar == "trading":
+            years = ((df.index[-1] - df.index[0]).days + 1) / 365.25
+        else:
+            years = len(df) / 365.25
         cagr = ((final_value / total_invested) ** (1 / years) - 1) * 100
         return final_value, total_invested, cagr, df
@@ -1,36 +1,86 @@
-import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from moviepy.editor import VideoClip, TextClip, CompositeVideoClip
-from moviepy.video.io.bindings import mplfig_to_npimage
+import numpy as np
 import pandas as pd
 import tempfile
 import os
 
-def generate_investment_video(df, ticker="ROST", start_year=1985, duration=8):
-    df = df.reset_index()
-    frames = len(df)
 
-    fig, ax = plt.subplots(figsize=(8, 6))
+class InvestmentAnimation:
+    """
+    Growth chart drawn with persistent artists and blitting.
 
-    def make_frame(t):
-        i = int((t / duration) * frames)
-        i = min(i, frames - 1)
-        ax.clear()
+    The axes, title, labels, grid and legend are drawn once and kept as a
+    cached background; every frame restores it, points the two lines at a
+    longer prefix of the same arrays (views, no copies) and draws only the
+    lines (plus the end labels on the last frame). The axes are fixed to the
+    full history up front so the background stays valid for every frame.
+    """
+
+    def __init__(self, df: pd.DataFrame, ticker: str = "ROST", start_year: int = 1985,
+                 width: int = 800, height: int = 600, dpi: int = 100):
+        df = df.reset_index()
+        self.x = mdates.date2num(pd.to_datetime(df['Date']))
+        self.pv = df['Portfolio Value'].to_numpy(dtype=float)
+        self.ti = df['Total Invested'].to_numpy(dtype=float)
+        self.rows = len(df)
 
-        ax.plot(df['Date'][:i+1], df['Portfolio Value'][:i+1], color='green', label='Portfolio Value')
-        ax.plot(df['Date'][:i+1], df['Total Invested'][:i+1], color='red', label='Total Invested')
+        self.fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.ax = self.fig.add_subplot()
+        self.pv_line, = ax.plot([], [], color='green', label='Portfolio Value', animated=True)
+        self.ti_line, = ax.plot([], [], color='red', label='Total Invested', animated=True)
+        self.pv_text = ax.text(self.x[-1], self.pv[-1], f"${self.pv[-1]:,.0f}", color='green', fontsize=12, ha='right', va='bottom', animated=True)
+        self.ti_text = ax.text(self.x[-1], self.ti[-1], f"${self.ti[-1]:,.0f}", color='red', fontsize=12, ha='right', va='bottom', animated=True)
+
+        ax.set_xlim(self.x[0], self.x[-1])
+        top = np.nanmax([self.pv.max(), self.ti.max()])
+        ax.set_ylim(min(0.0, np.nanmin(self.pv)), top * 1.05)
+        ax.xaxis_date()
         ax.set_title(f"$1/day in {ticker} since {start_year}", fontsize=14)
         ax.set_xlabel("Date")
         ax.set_ylabel("USD")
         ax.grid(True)
-        ax.legend()
+        ax.legend(loc='upper left')
+        self.fig.tight_layout()
+
+        # Animated artists are skipped by draw(), so this is the bare chart
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._last = None
 
-        if i == frames - 1:
-            ax.text(df['Date'][i], df['Portfolio Value'][i], f"${df['Portfolio Value'][i]:,.0f}", color='green', fontsize=12)
-            ax.text(df['Date'][i], df['Total Invested'][i], f"${df['Total Invested'][i]:,.0f}", color='red', fontsize=12)
+    def render(self, i: int) -> np.ndarray:
+        """RGB frame showing rows ``0..i`` of the history."""
+        if self._last is not None and self._last[0] == i:
+            return self._last[1]
+        self.canvas.restore_region(self._background)
+        self.pv_line.set_data(self.x[:i + 1], self.pv[:i + 1])
+        self.ti_line.set_data(self.x[:i + 1], self.ti[:i + 1])
+        self.ax.draw_artist(self.pv_line)
+        self.ax.draw_artist(self.ti_line)
+        if i == self.rows - 1:
+            self.ax.draw_artist(self.pv_text)
+            self.ax.draw_artist(self.ti_text)
+        # Copy: the canvas buffer is reused for the next frame
+        frame = np.array(self.canvas.buffer_rgba())[..., :3]
+        self._last = (i, frame)
+        return frame
 
-        return mplfig_to_npimage(fig)
 
-    animated_clip = VideoClip(make_frame, duration=duration).set_fps(24)
+def generate_investment_video(df, ticker="ROST", start_year=1985, duration=8, fps=24):
+    animation = InvestmentAnimation(df, ticker=ticker, start_year=start_year)
+    # The frame count follows duration x fps, not the data length: frame k shows
+    # an evenly spaced prefix, so a 40-year history costs as many frames as a 1-year one
+    n_frames = max(1, int(round(duration * fps)))
+    cut_points = np.linspace(0, animation.rows - 1, n_frames).round().astype(int)
+
+    def make_frame(t):
+        k = min(int(t * fps), n_frames - 1)
+        return animation.render(cut_points[k])
+
+    animated_clip = VideoClip(make_frame, duration=duration).set_fps(fps)
 
     # Add overlay title
     title = TextClip(f"$1/day in {ticker} since {start_year}",
@@ -42,6 +92,6 @@ def generate_investment_video(df, ticker="ROST", start_year=1985, duration=8):
     # Save to temp file
     temp_dir = tempfile.mkdtemp()
     video_path = os.path.join(temp_dir, f"{ticker}_investment.mp4")
-    final_clip.write_videofile(video_path, fps=24, codec='libx264', audio=False, verbose=False, logger=None)
+    final_clip.write_videofile(video_path, fps=fps, codec='libx264', audio=False, verbose=False, logger=None)
 
     return video_path
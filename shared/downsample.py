@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# About one point per horizontal pixel of a 1080 px wide reel/chart
+DEFAULT_MAX_POINTS = 1080
+
+
+def lttb_indices(x, y, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of at most ``max_points`` points
+    that keep the visual shape of ``y`` against ``x``.
+
+    The first and last points are always kept, so end-of-line annotations
+    stay exact. ``x`` must be increasing and both arrays free of NaNs.
+    """
+    n = len(y)
+    if max_points is None or n <= max_points or n <= 2:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1])
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # n - 2 interior points split into max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    lo, hi = edges[:-1], edges[1:]
+    # Third vertex of each bucket's triangles: mean of the next bucket, or the last point
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    nx = np.append((cx[hi[1:]] - cx[lo[1:]]) / (hi[1:] - lo[1:]), x[-1]).tolist()
+    ny = np.append((cy[hi[1:]] - cy[lo[1:]]) / (hi[1:] - lo[1:]), y[-1]).tolist()
+
+    # The chosen point feeds the next bucket, so this loop is sequential; buckets
+    # hold a handful of points, where plain floats beat per-bucket NumPy calls
+    xs, ys = x.tolist(), y.tolist()
+    selected = [0]
+    xa, ya = xs[0], ys[0]
+    for b_lo, b_hi, b_nx, b_ny in zip(lo.tolist(), hi.tolist(), nx, ny):
+        dx, dy = xa - b_nx, b_ny - ya
+        best, pick = -1.0, b_lo
+        for j in range(b_lo, b_hi):
+            area = abs(dx * (ys[j] - ya) - (xa - xs[j]) * dy)
+            if area > best:
+                best, pick = area, j
+        selected.append(pick)
+        xa, ya = xs[pick], ys[pick]
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+def _as_x(x) -> np.ndarray:
+    """Numeric x values: int64 nanoseconds for dates, positions for labels."""
+    if isinstance(x, pd.DatetimeIndex) or np.issubdtype(np.asarray(x).dtype, np.datetime64):
+        return pd.DatetimeIndex(x).asi8.astype(float)
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.number):
+        return x.astype(float)
+    return np.arange(len(x), dtype=float)
+
+
+def downsample_indices(x, ys, max_points: int = DEFAULT_MAX_POINTS) -> np.ndarray:
+    """
+    Sorted indices to keep for several series sharing ``x``: the union of
+    each series' LTTB selection, with the budget split between the series so
+    the union stays within ``max_points``. NaNs are skipped per series, and
+    the first and last rows are always kept.
+    """
+    n = len(x)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+    xf = _as_x(x)
+    ys = list(ys)
+    per_series = max(3, max_points // max(1, len(ys)))
+    keep = [np.array([0, n - 1])]
+    for y in ys:
+        y = np.asarray(y, dtype=float)
+        finite = np.flatnonzero(~np.isnan(y))
+        if len(finite):
+            keep.append(finite[lttb_indices(xf[finite], y[finite], per_series)])
+    return np.unique(np.concatenate(keep))
+
+
+class PrefixDownsampler:
+    """
+    Stable downsample_indices() selections for growing prefixes of the same
+    series, i.e. the frames of an animation.
+
+    Running LTTB on every prefix moves the kept points (and their markers)
+    from one frame to the next, so the line shimmers. Here it runs once per
+    rung of a ladder of prefix lengths (``max_points``, twice that, ... up to
+    the full length); a prefix of ``n`` rows shows the selection of the
+    shortest rung covering it, cut at ``n``, plus row ``n - 1`` as the live
+    tail. The kept points only change when ``n`` crosses a rung, and a frame
+    never drops much below half the budget.
+    """
+
+    def __init__(self, x, ys, max_points: int = DEFAULT_MAX_POINTS):
+        self.x = _as_x(x)
+        self.ys = [np.asarray(y, dtype=float) for y in ys]
+        self.max_points = max_points
+        self._rungs = {}
+
+    def indices(self, n: int) -> np.ndarray:
+        if self.max_points is None or n <= self.max_points:
+            return np.arange(n)
+        rung = self.max_points
+        while rung < n:
+            rung *= 2
+        rung = min(rung, len(self.x))
+        kept = self._rungs.get(rung)
+        if kept is None:
+            kept = self._rungs[rung] = downsample_indices(self.x[:rung], [y[:rung] for y in self.ys], self.max_points)
+        shown = kept[:np.searchsorted(kept, n)]
+        return shown if shown[-1] == n - 1 else np.append(shown, n - 1)
+
+
+def downsample(data, max_points: int = DEFAULT_MAX_POINTS, columns=None):
+    """LTTB-downsampled rows of a Series/DataFrame, with its index as x."""
+    if isinstance(data, pd.Series):
+        ys = [data.to_numpy(dtype=float)]
+    else:
+        ys = [data[c].to_numpy(dtype=float) for c in (columns or data.columns)]
+    return data.iloc[downsample_indices(data.index, ys, max_points)]
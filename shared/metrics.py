@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+METRICS = (
+    "mean_return", "volatility", "downside_deviation", "sharpe", "sortino",
+    "max_drawdown", "max_drawdown_duration", "periods",
+)
+
+
+def _as_matrix(prices):
+    """Return (values as 2-D float array, column labels, index, was_1d)."""
+    if isinstance(prices, pd.Series):
+        return prices.to_numpy(dtype=float)[:, None], [prices.name], prices.index, True
+    if isinstance(prices, pd.DataFrame):
+        return prices.to_numpy(dtype=float), list(prices.columns), prices.index, False
+    values = np.asarray(prices, dtype=float)
+    if values.ndim == 1:
+        return values[:, None], [None], None, True
+    return values, list(range(values.shape[1])), None, False
+
+
+def simple_returns(values: np.ndarray) -> np.ndarray:
+    """Period returns of a 2-D price array, ignoring missing prices like pct_change after dropna."""
+    # Forward-fill gaps per column so a missing day does not split a return in two
+    filled = pd.DataFrame(values).ffill().to_numpy()
+    returns = filled[1:] / filled[:-1] - 1
+    returns[np.isnan(values[1:])] = np.nan
+    return returns
+
+
+def log_return_moments(values) -> tuple:
+    """(count, mean, M2) of the log returns of a 1-D value series, skipping NaNs."""
+    values = np.asarray(values, dtype=float)
+    log_returns = np.log(values[1:] / values[:-1])
+    log_returns = log_returns[~np.isnan(log_returns)]
+    if len(log_returns) == 0:
+        return 0, 0.0, 0.0
+    mean = log_returns.mean()
+    return len(log_returns), mean, float(((log_returns - mean) ** 2).sum())
+
+
+def risk_metrics(prices, periods_per_year: float = 252, risk_free: float = 0.0, mar: float = 0.0):
+    """
+    Annualized return/risk metrics of a price series or a multi-ticker price matrix.
+
+    All metrics come from one pass over a single returns array: mean return,
+    volatility, downside deviation (below ``mar`` per period), Sharpe and
+    Sortino (against an annual ``risk_free`` rate), max drawdown and its
+    duration in periods. Returns are decimals, not percentages.
+
+    A Series (or 1-D array) gives a Series of metrics; a DataFrame gives one
+    column of metrics per ticker.
+    """
+    values, columns, _, was_1d = _as_matrix(prices)
+    returns = simple_returns(values)
+    valid = ~np.isnan(returns)
+    count = valid.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(returns, axis=0) / count
+        var = np.nansum((returns - mean) ** 2, axis=0) / (count - 1)
+        downside = np.where(valid, np.minimum(returns - mar, 0.0), 0.0)
+        downside_dev = np.sqrt((downside ** 2).sum(axis=0) / count) * np.sqrt(periods_per_year)
+
+        mean_return = mean * periods_per_year
+        volatility = np.sqrt(var) * np.sqrt(periods_per_year)
+        sharpe = (mean_return - risk_free) / volatility
+        sortino = (mean_return - risk_free) / downside_dev
+
+        # Drawdown against the running peak; duration is the longest stretch since a peak
+        filled = pd.DataFrame(values).ffill().to_numpy()
+        peak = np.fmax.accumulate(filled, axis=0)
+        drawdown = filled / peak - 1
+        steps = np.arange(len(filled))[:, None]
+        last_peak = np.maximum.accumulate(np.where((filled >= peak) | np.isnan(filled), steps, 0), axis=0)
+        max_drawdown = np.nanmin(drawdown, axis=0) if len(filled) else np.full(len(columns), np.nan)
+        duration = (steps - last_peak).max(axis=0) if len(filled) else np.zeros(len(columns))
+
+    result = pd.DataFrame({
+        "mean_return": mean_return,
+        "volatility": volatility,
+        "downside_deviation": downside_dev,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": max_drawdown,
+        "max_drawdown_duration": duration,
+        "periods": count,
+    }, index=columns).T
+    return result.iloc[:, 0] if was_1d else result
+
+
+def rolling_volatility(prices, window: int = 21, periods_per_year: float = 252):
+    """
+    Annualized rolling volatility of returns, like ``pct_change().rolling(window).std()``
+    but from cumulative sums, so the cost does not grow with the window.
+    """
+    values, columns, index, was_1d = _as_matrix(prices)
+    returns = simple_returns(values)
+    missing = np.isnan(returns)
+    returns = np.where(missing, 0.0, returns)
+
+    vol = np.full(values.shape, np.nan)
+    if len(returns) >= window:
+        def window_sums(a):
+            c = np.vstack([np.zeros((1, a.shape[1])), np.cumsum(a, axis=0)])
+            return c[window:] - c[:-window]
+
+        s1 = window_sums(returns)
+        s2 = window_sums(returns ** 2)
+        var = np.maximum((s2 - s1 ** 2 / window) / (window - 1), 0.0)
+        # Windows that include a missing return stay NaN
+        var[window_sums(missing.astype(float)) > 0] = np.nan
+        vol[window:] = np.sqrt(var * periods_per_year)
+
+    if index is None:
+        return vol[:, 0] if was_1d else vol
+    result = pd.DataFrame(vol, index=index, columns=columns)
+    return result.iloc[:, 0] if was_1d else result
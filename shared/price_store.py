@@ -0,0 +1,254 @@
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "PRICE_STORE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "finance_analysis", "prices"),
+)
+
+
+def yahoo_downloader(ticker: str, start=None, end=None) -> pd.DataFrame:
+    """
+    Default downloader: daily OHLCV bars from Yahoo Finance with flat columns.
+    """
+    import yfinance as yf
+
+    df = yf.download(ticker, start=start, end=end, interval="1d", progress=False)
+    # Handle yfinance's MultiIndex columns (e.g., ('Close', 'ROST'))
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    return df
+
+
+def _has_parquet_engine() -> bool:
+    for engine in ("pyarrow", "fastparquet"):
+        try:
+            __import__(engine)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def _now() -> pd.Timestamp:
+    return pd.Timestamp.now()
+
+
+def _tmp_path(path: str) -> str:
+    # Unique per process and thread so concurrent writers never share a temp file
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+class PriceStore:
+    """
+    On-disk daily OHLCV store, one columnar file per ticker.
+
+    Only the rows after the last stored date (and, when an earlier start is
+    requested, the rows before the first stored date) are downloaded. The
+    downloader is any callable ``(ticker, start, end) -> DataFrame`` indexed
+    by date, so a local fake can stand in for Yahoo.
+
+    New sessions are looked for once a day. A last bar fetched on its own
+    trading day may be an intraday snapshot, so it is downloaded again once
+    it is older than ``live_ttl`` seconds.
+
+    Prices are auto-adjusted, so after a split or dividend Yahoo rewrites past
+    bars. Every refresh re-downloads one bar the store already holds; if it
+    no longer matches, the whole history is downloaded again rather than
+    splicing two adjustments together.
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, downloader=yahoo_downloader, live_ttl: float = 15 * 60):
+        self.root = root
+        self.downloader = downloader
+        self.live_ttl = live_ttl
+        self.ext = "parquet" if _has_parquet_engine() else "pkl"
+        # A fixed set of locks, picked by ticker: one read-refresh-write per
+        # ticker at a time without keeping a lock for every ticker ever seen
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        os.makedirs(self.root, exist_ok=True)
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        return self._locks[hash(ticker) % len(self._locks)]
+
+    def _path(self, ticker: str, ext: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return os.path.join(self.root, f"{safe}.{ext}")
+
+    def _read(self, ticker: str):
+        path = self._path(ticker, self.ext)
+        meta_path = self._path(ticker, "json")
+        if not (os.path.exists(path) and os.path.exists(meta_path)):
+            return None, {}
+        df = pd.read_parquet(path) if self.ext == "parquet" else pd.read_pickle(path)
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        # The two files are replaced one after the other; another process may
+        # have been interrupted in between, so a mismatch means start over
+        if "rows" in meta and meta["rows"] != len(df):
+            logging.warning(f"PriceStore: {ticker} data and metadata disagree, discarding them")
+            return None, {}
+        return df, meta
+
+    def _write(self, ticker: str, df: pd.DataFrame, meta: dict):
+        path = self._path(ticker, self.ext)
+        meta_path = self._path(ticker, "json")
+        meta = dict(meta, rows=len(df))
+        # Write to temp files first so concurrent readers never see a partial file
+        tmp = _tmp_path(path)
+        if self.ext == "parquet":
+            df.to_parquet(tmp)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, path)
+        tmp = _tmp_path(meta_path)
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def _download(self, ticker: str, start=None, end=None) -> pd.DataFrame:
+        df = self.downloader(ticker, start=start, end=end)
+        if df is None or df.empty:
+            return pd.DataFrame()
+        df = df.copy()
+        df.index = pd.to_datetime(df.index)
+        if df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+        df.index.name = "Date"
+        return df.sort_index()
+
+    @staticmethod
+    def _merge(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        """Combine two frames, preferring rows from ``new`` on overlapping dates."""
+        if old is None or old.empty:
+            return new
+        if new.empty:
+            return old
+        merged = pd.concat([old[~old.index.isin(new.index)], new])
+        return merged.sort_index()
+
+    @staticmethod
+    def _agrees(old: pd.DataFrame, new: pd.DataFrame, day) -> bool:
+        """Whether ``old`` and ``new`` hold the same Close on ``day`` (True if either lacks it)."""
+        if day not in old.index or day not in new.index:
+            return True
+        return bool(np.isclose(old.at[day, "Close"], new.at[day, "Close"], rtol=1e-4))
+
+    def _full_download(self, ticker: str, meta: dict) -> pd.DataFrame:
+        logging.info(f"PriceStore: prices for {ticker} were re-adjusted, downloading the full history again")
+        covered_from = meta.get("covered_from")
+        meta["refreshed"] = _now().date().isoformat()
+        meta["fetched"] = _now().isoformat()
+        return self._download(ticker, start=pd.Timestamp(covered_from) if covered_from is not None else None)
+
+    @staticmethod
+    def _tail_due(df: pd.DataFrame, meta: dict, end_ts, max_age: float) -> bool:
+        """Whether the rows from the last stored bar on must be downloaded again."""
+        last = df.index[-1]
+        now = _now()
+        # Sessions after the last bar may have closed since (looked for once a day)
+        if (end_ts is None or end_ts > last + pd.Timedelta(days=1)) and meta.get("refreshed") != now.date().isoformat():
+            return True
+        # A last bar fetched on its own day may be an intraday snapshot
+        fetched = pd.Timestamp(meta.get("fetched") or meta["refreshed"])
+        live = last >= fetched.normalize() and (end_ts is None or end_ts > last)
+        return live and (now - fetched).total_seconds() >= max_age
+
+    def _refresh(self, ticker: str, start_ts, end_ts, max_age: float) -> pd.DataFrame:
+        """The stored frame for ``ticker``, extended/refreshed to cover the request."""
+        today = _now().date().isoformat()
+        df, meta = self._read(ticker)
+        changed = False
+
+        if df is None or df.empty:
+            logging.info(f"PriceStore: full download for {ticker}")
+            df = self._download(ticker, start=start_ts)
+            if df.empty:
+                return df
+            meta = {"covered_from": start_ts.isoformat() if start_ts is not None else None,
+                    "refreshed": today, "fetched": _now().isoformat()}
+            changed = True
+        else:
+            covered_from = meta.get("covered_from")
+            # Head: an earlier start than anything requested before; the first
+            # stored bar is included to check it was not re-adjusted since
+            if covered_from is not None and (start_ts is None or start_ts < pd.Timestamp(covered_from)):
+                logging.info(f"PriceStore: head refresh for {ticker} before {df.index[0].date()}")
+                first = df.index[0]
+                head = self._download(ticker, start=start_ts, end=first + pd.Timedelta(days=1))
+                meta["covered_from"] = start_ts.isoformat() if start_ts is not None else None
+                df = self._merge(df, head) if self._agrees(df, head, first) else self._full_download(ticker, meta)
+                changed = True
+            # Tail: only the rows from the last stored date onwards (the last
+            # bar is re-fetched because it may have been an intraday snapshot,
+            # and the settled bar before it is the re-adjustment check)
+            if not df.empty and self._tail_due(df, meta, end_ts, max_age):
+                last = df.index[-1]
+                logging.info(f"PriceStore: tail refresh for {ticker} from {last.date()}")
+                settled = df.index[-2] if len(df) > 1 else last
+                fetched = _now().isoformat()
+                tail = self._download(ticker, start=settled)
+                df = self._merge(df, tail) if self._agrees(df, tail, settled) else self._full_download(ticker, meta)
+                meta["refreshed"] = today
+                meta["fetched"] = fetched
+                changed = True
+
+        if changed and not df.empty:
+            self._write(ticker, df, meta)
+        return df
+
+    def get(self, ticker: str, start=None, end=None, max_age: float = None) -> pd.DataFrame:
+        """
+        Return daily OHLCV rows for ``start <= date < end`` (``end`` exclusive,
+        like ``yf.download``), refreshing the stored file only where needed.
+
+        ``max_age`` (seconds, ``live_ttl`` by default) is how old a same-day
+        last bar may be before it is downloaded again; 0 always re-fetches it.
+        """
+        ticker = ticker.upper()
+        start_ts = pd.Timestamp(start) if start is not None else None
+        end_ts = pd.Timestamp(end) if end is not None else None
+        max_age = self.live_ttl if max_age is None else max_age
+        with self._lock(ticker):
+            df = self._refresh(ticker, start_ts, end_ts, max_age)
+
+        if df.empty:
+            return df
+        if start_ts is not None:
+            df = df[df.index >= start_ts]
+        if end_ts is not None:
+            df = df[df.index < end_ts]
+        return df
+
+    def get_close_matrix(self, tickers, start=None, end=None) -> pd.DataFrame:
+        """Wide frame of Close prices, one column per ticker (as given)."""
+        closes = {}
+        for t in tickers:
+            df = self.get(t, start=start, end=end)
+            if not df.empty:
+                closes[t] = df["Close"]
+        matrix = pd.DataFrame(closes)
+        matrix.index.name = "Date"
+        return matrix
+
+
+_default_store = None
+
+
+def get_default_store() -> PriceStore:
+    """Process-wide store backed by Yahoo Finance."""
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore()
+    return _default_store
@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+DEFAULT_INFO_PATH = os.environ.get(
+    "TICKER_INFO_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "finance_analysis", "ticker_info.json"),
+)
+DEFAULT_TTL = 7 * 24 * 3600  # names and websites rarely change
+
+
+def yahoo_info_fetcher(ticker: str) -> dict:
+    """Default fetcher: the ``yf.Ticker(ticker).info`` dict."""
+    import yfinance as yf
+
+    return dict(yf.Ticker(ticker).info or {})
+
+
+class TickerInfoCache:
+    """
+    TTL cache of ticker metadata backed by a JSON file.
+
+    Each ticker's info dict is fetched at most once per ``ttl`` seconds and
+    shared by every lookup (``long_name``, ``website``, ...) in the process.
+    """
+
+    def __init__(self, path: str = DEFAULT_INFO_PATH, ttl: float = DEFAULT_TTL,
+                 fetcher=yahoo_info_fetcher, max_workers: int = 8):
+        self.path = path
+        self.ttl = ttl
+        self.fetcher = fetcher
+        self.max_workers = max_workers
+        # Shared by Streamlit sessions and batch threads: entries are updated
+        # and saved under the lock (fetches run outside it)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Unique per process and thread so concurrent writers never share a temp file
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, default=str)
+        os.replace(tmp, self.path)
+
+    def _is_fresh(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def _fetch(self, ticker: str):
+        try:
+            return self.fetcher(ticker)
+        except Exception as e:
+            logging.warning(f"Could not fetch info for {ticker}: {e}")
+            return None
+
+    def infos(self, tickers) -> dict:
+        """Batch lookup: ``{ticker: info}``, fetching only missing/expired tickers."""
+        tickers = list(tickers)
+        missing = [t for t in dict.fromkeys(tickers) if not self._is_fresh(t.upper())]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                fetched = list(executor.map(self._fetch, missing))
+            now = time.time()
+            with self._lock:
+                for ticker, info in zip(missing, fetched):
+                    # Failed lookups are not cached so the next call retries them
+                    if info is not None:
+                        self._entries[ticker.upper()] = {"fetched_at": now, "info": info}
+                self._save()
+        with self._lock:
+            return {t: self._entries.get(t.upper(), {}).get("info", {}) for t in tickers}
+
+    def info(self, ticker: str) -> dict:
+        return self.infos([ticker])[ticker]
+
+    def long_name(self, ticker: str, default: str = "") -> str:
+        return self.info(ticker).get("longName") or default
+
+    def website(self, ticker: str, default: str = "") -> str:
+        return self.info(ticker).get("website") or default
+
+
+_default_cache = None
+
+
+def get_default_info_cache() -> TickerInfoCache:
+    """Process-wide metadata cache backed by Yahoo Finance."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TickerInfoCache()
+    return _default_cache
@@ -0,0 +1,9 @@
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# The apps use flat imports from their own folders, plus shared/ for the modules they have in common
+ROOT = os.path.dirname(HERE)
+sys.path[:0] = [HERE, os.path.join(ROOT, "clip_creator"), os.path.join(ROOT, "shared")]
+# price_tracker after clip_creator: only its own modules (range_cache, utils) are imported from it
+sys.path.append(os.path.join(ROOT, "price_tracker"))
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+
+def make_prices(start="2020-01-01", end="2020-12-31", seed: int = None) -> pd.DataFrame:
+    """Business-day OHLCV bars; a steady climb, or a seeded random walk when ``seed`` is given."""
+    index = pd.bdate_range(start, end, name="Date")
+    if seed is None:
+        close = 100 + np.arange(len(index), dtype=float)
+    else:
+        close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0.0003, 0.015, len(index))))
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": 1000}, index=index)
+
+
+def make_simulation(start="2015-01-01", end="2018-12-31", seed: int = 0) -> pd.DataFrame:
+    """Daily frame shaped like InvestmentSimulator.simulate() output, from a seeded random walk."""
+    close = make_prices(start, end, seed=seed)["Close"].asfreq("D", method="ffill")
+    df = pd.DataFrame({"Close": close, "Daily Investment": 1.0})
+    df["Total Invested"] = df["Daily Investment"].cumsum()
+    df["Portfolio Value"] = (df["Daily Investment"] / df["Close"]).cumsum() * df["Close"]
+    return df
+
+
+class FakeYahoo:
+    """PriceStore downloader serving ``self.prices`` and recording every call."""
+
+    def __init__(self, prices: pd.DataFrame):
+        self.prices = prices
+        self.calls = []
+
+    def __call__(self, ticker, start=None, end=None):
+        self.calls.append((ticker, start, end))
+        df = self.prices
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df.index < pd.Timestamp(end)]
+        return df.copy()
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+import results_index
+from batch_reels import ReelPipeline
+from fakes import FakeYahoo, make_prices
+from price_store import PriceStore
+from profiling import Profiler
+from results_index import ResultsIndex
+from simulator import InvestmentSimulator
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    index = ResultsIndex(root=str(tmp_path / "results"))
+    monkeypatch.setattr(results_index, "_default_index", index)
+    return index
+
+
+def simulate(pipeline: ReelPipeline, tmp_path) -> dict:
+    store = PriceStore(root=str(tmp_path / "prices"), downloader=FakeYahoo(make_prices("2018-01-01", "2020-12-31", seed=1)))
+    simulator = InvestmentSimulator("ABC", 2018, daily_investment=10.0, store=store)
+    simulator.get_stock_info = lambda: "ABC Corp"
+    simulator.fetch_data()
+    pipeline._profilers["ABC"] = Profiler(enabled=False)
+    return pipeline._simulate(simulator)
+
+
+def test_final_pass_records_summary_and_index(tmp_path, index):
+    pipeline = ReelPipeline(out_dir=str(tmp_path / "reels"))
+    os.makedirs(pipeline.out_dir)
+    job = simulate(pipeline, tmp_path)
+    assert os.path.exists(job["summary"])
+    assert list(index.load()["stock_name"]) == ["ABC Corp"]
+
+
+def test_draft_pass_records_nothing(tmp_path, index):
+    pipeline = ReelPipeline(out_dir=str(tmp_path / "reels"), render_options={"draft": True})
+    os.makedirs(pipeline.out_dir)
+    job = simulate(pipeline, tmp_path)
+    assert job["summary"] is None
+    assert os.listdir(pipeline.out_dir) == []
+    assert index.load().empty
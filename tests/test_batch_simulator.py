@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_simulator import simulate_grid
+from fakes import FakeYahoo, make_prices
+from price_store import PriceStore
+from simulator import InvestmentSimulator
+
+START_YEARS = [2018, 2019, 2020]
+AMOUNTS = [10.0, 25.0]
+
+
+@pytest.fixture
+def prices():
+    # The last ticker lists mid-2019, after the first start date
+    return {
+        "AAA": make_prices("2018-01-01", "2021-06-30", seed=1),
+        "BBB": make_prices("2018-01-01", "2021-06-30", seed=2),
+        "CCC": make_prices("2019-06-03", "2021-06-30", seed=3),
+    }
+
+
+def test_grid_matches_one_simulator_per_cell(tmp_path, prices):
+    matrix = pd.DataFrame({t: p["Close"] for t, p in prices.items()})
+    grid = simulate_grid(matrix, [f"{y}-01-01" for y in START_YEARS], AMOUNTS)
+    assert len(grid) == len(prices) * len(START_YEARS) * len(AMOUNTS)
+
+    for ticker, p in prices.items():
+        store = PriceStore(root=str(tmp_path / ticker), downloader=FakeYahoo(p))
+        for year in START_YEARS:
+            for amount in AMOUNTS:
+                sim = InvestmentSimulator(ticker, year, daily_investment=amount, store=store)
+                sim.simulate()
+                final_value, total_invested, cagr, df, _ = sim.get_results()
+                row = grid.loc[(ticker, pd.Timestamp(f"{year}-01-01"), amount)]
+                assert row["first_date"] == df.index[0]
+                assert row["n_days"] == len(df)
+                np.testing.assert_allclose(row["final_value"], final_value, rtol=1e-9)
+                np.testing.assert_allclose(row["total_invested"], total_invested, rtol=1e-12)
+                np.testing.assert_allclose(row["cagr"], cagr, rtol=1e-9)
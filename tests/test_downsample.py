@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from downsample import PrefixDownsampler, downsample, downsample_indices, lttb_indices
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    y = np.cumsum(rng.normal(size=5000))
+    y[3210] += 80  # a spike LTTB must not smooth away
+    return np.arange(len(y), dtype=float), y
+
+
+def test_lttb_keeps_ends_and_budget(series):
+    x, y = series
+    kept = lttb_indices(x, y, 300)
+    assert len(kept) == 300
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert (np.diff(kept) > 0).all()
+    assert 3210 in kept
+    np.testing.assert_array_equal(lttb_indices(x[:200], y[:200], 300), np.arange(200))
+    np.testing.assert_array_equal(lttb_indices(x, y, 2), [0, len(y) - 1])
+
+
+def test_downsample_indices_splits_budget_and_skips_nans(series):
+    x, y = series
+    other = -y.copy()
+    other[:100] = np.nan
+    kept = downsample_indices(x, [y, other], 400)
+    assert len(kept) <= 400
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    frame = pd.DataFrame({"a": y, "b": other}, index=pd.date_range("2000-01-01", periods=len(y)))
+    assert len(downsample(frame, 400)) == len(kept)
+
+
+def test_prefix_selections_keep_ends_and_budget(series):
+    x, y = series
+    single = PrefixDownsampler(x, [y], max_points=250)
+    both = PrefixDownsampler(x, [y, np.sin(x / 50)], max_points=250)
+    for n in range(1, len(y) + 1, 37):
+        for prefix in (single, both):
+            shown = prefix.indices(n)
+            assert shown[0] == 0 and shown[-1] == n - 1
+            assert (np.diff(shown) > 0).all()
+            assert len(shown) <= 250
+        # At least half the rung's points fall before n
+        if n > 250:
+            assert len(single.indices(n)) >= 250 // 2
+
+
+def test_prefix_selection_is_stable_inside_a_rung(series):
+    x, y = series
+    prefix = PrefixDownsampler(x, [y], max_points=250)
+    # 1001..2000 rows all use the 2000-row rung
+    earlier, later = prefix.indices(1200), prefix.indices(1900)
+    np.testing.assert_array_equal(later[later < 1199], earlier[earlier < 1199])
+    # Crossing into the next rung is allowed to change the selection
+    assert len(prefix._rungs) == 1
+    prefix.indices(2001)
+    assert len(prefix._rungs) == 2
@@ -0,0 +1,19 @@
+from fakes import make_simulation
+from frame_cache import frame_key
+from plotter import PlotBuilderOneDay
+from renderers import AggRendererOneDay, LayeredRendererOneDay
+
+
+def test_layered_key_covers_the_whole_series():
+    df = make_simulation()
+    changed = df.copy()
+    changed.iloc[-10:, changed.columns.get_loc("Portfolio Value")] *= 0.9
+    a = PlotBuilderOneDay(df, ticker="ABC", start_year=2015)
+    b = PlotBuilderOneDay(changed, ticker="ABC", start_year=2015)
+    n = len(df) // 2
+
+    # Same first n rows: the growing-axes frame is the same, the pinned-axes one is not
+    assert frame_key(a, n, AggRendererOneDay, 1080, 1920) == frame_key(b, n, AggRendererOneDay, 1080, 1920)
+    assert frame_key(a, n, LayeredRendererOneDay, 1080, 1920) != frame_key(b, n, LayeredRendererOneDay, 1080, 1920)
+    assert frame_key(a, n, LayeredRendererOneDay, 1080, 1920) == frame_key(
+        PlotBuilderOneDay(df, ticker="ABC", start_year=2015), n, LayeredRendererOneDay, 1080, 1920)
@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pytest
+
+from frame_plan import FramePlan, cut_points
+
+
+def test_holds_fold_repeated_states():
+    plan = FramePlan([1, 1, 2, 3, 3, 3, 5])
+    np.testing.assert_array_equal(plan.rows, [1, 2, 3, 5])
+    np.testing.assert_array_equal(plan.holds, [2, 1, 3, 1])
+    np.testing.assert_array_equal(plan.first_frames, [1, 3, 4, 7])
+    assert plan.n_frames == 7 and len(plan) == 4
+    assert list(plan.expand("abcd")) == list("aabcccd")
+    np.testing.assert_allclose(plan.durations(10), [0.2, 0.1, 0.3, 0.1])
+
+
+@pytest.mark.parametrize("n,num_frames,schedule,hold_end", [
+    (5000, 200, "linear", 0), (50, 200, "linear", 10), (5000, 200, "ease_out", 30),
+])
+def test_holds_cover_every_frame(n, num_frames, schedule, hold_end):
+    cuts = cut_points(n, num_frames, schedule, hold_end)
+    plan = FramePlan(cuts)
+    assert plan.holds.sum() == len(cuts) == num_frames + hold_end
+    np.testing.assert_array_equal(np.repeat(plan.rows, plan.holds), cuts)
+    assert plan.holds[-1] >= hold_end + 1
+
+
+def test_thin_keeps_timing_and_ends():
+    plan = FramePlan(cut_points(3000, 300, "ease_out", hold_end=20))
+    thin = plan.thin(40)
+    assert len(thin) <= 40
+    assert thin.n_frames == plan.n_frames
+    assert thin.rows[0] == plan.rows[0] and thin.rows[-1] == plan.rows[-1]
+    assert thin.holds[-1] >= plan.holds[-1]
+    assert plan.thin(len(plan)) is plan
+
+
+def test_link_holds_fills_held_frames(tmp_path):
+    plan = FramePlan([1, 1, 1, 2, 3, 3])
+    paths = []
+    for first in plan.first_frames:
+        path = tmp_path / f"frame_{first:03d}.png"
+        path.write_bytes(str(first).encode())
+        paths.append(str(path))
+    plan.link_holds(str(tmp_path), paths)
+    names = sorted(os.listdir(tmp_path))
+    assert names == [f"frame_{i:03d}.png" for i in range(1, 7)]
+    assert (tmp_path / "frame_003.png").read_bytes() == b"1"
+    assert (tmp_path / "frame_006.png").read_bytes() == b"5"
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fakes import make_prices
+from metrics import risk_metrics, rolling_volatility
+
+
+@pytest.fixture
+def close():
+    return make_prices("2019-01-01", "2020-12-31", seed=4)["Close"]
+
+
+def longest_drawdown(close: pd.Series) -> int:
+    longest = current = 0
+    peak = -np.inf
+    for value in close:
+        if value >= peak:
+            peak, current = value, 0
+        else:
+            current += 1
+            longest = max(longest, current)
+    return longest
+
+
+def test_risk_metrics_match_pandas(close):
+    returns = close.pct_change().dropna()
+    downside = np.sqrt((np.minimum(returns, 0) ** 2).mean()) * np.sqrt(252)
+    mean_return = returns.mean() * 252
+    volatility = returns.std() * np.sqrt(252)
+    expected = pd.Series({
+        "mean_return": mean_return,
+        "volatility": volatility,
+        "downside_deviation": downside,
+        "sharpe": (mean_return - 0.02) / volatility,
+        "sortino": (mean_return - 0.02) / downside,
+        "max_drawdown": (close / close.cummax() - 1).min(),
+        "max_drawdown_duration": longest_drawdown(close),
+        "periods": len(returns),
+    }, name="Close")
+    pd.testing.assert_series_equal(risk_metrics(close, risk_free=0.02).astype(float), expected, rtol=1e-10)
+
+
+def test_risk_metrics_per_column_skip_missing_prices(close):
+    other = close * 0.5 + 10
+    other.iloc[100:110] = np.nan
+    matrix = pd.DataFrame({"A": close, "B": other})
+    result = risk_metrics(matrix)
+    pd.testing.assert_series_equal(result["A"], risk_metrics(close).rename("A"))
+    pd.testing.assert_series_equal(result["B"], risk_metrics(other.dropna()).rename("B"))
+
+
+def test_rolling_volatility_matches_pandas(close):
+    expected = close.pct_change().rolling(21).std() * np.sqrt(252)
+    pd.testing.assert_series_equal(rolling_volatility(close), expected, rtol=1e-8)
+
+    matrix = pd.DataFrame({"A": close, "B": close[::-1].to_numpy()}, index=close.index)
+    expected = matrix.pct_change().rolling(63).std() * np.sqrt(252)
+    pd.testing.assert_frame_equal(rolling_volatility(matrix, window=63), expected, rtol=1e-8)
@@ -0,0 +1,129 @@
+import pandas as pd
+import pytest
+
+import price_store
+from fakes import FakeYahoo, make_prices
+from price_store import PriceStore
+
+
+def set_today(monkeypatch, day: str, time: str = "18:00"):
+    monkeypatch.setattr(price_store, "_now", lambda: pd.Timestamp(f"{day} {time}"))
+
+
+@pytest.fixture
+def fake():
+    return FakeYahoo(make_prices())
+
+
+@pytest.fixture
+def store(tmp_path, fake):
+    return PriceStore(root=str(tmp_path), downloader=fake)
+
+
+def test_repeat_call_does_not_download(store, fake):
+    first = store.get("ABC", start="2020-03-01", end="2020-06-01")
+    second = store.get("ABC", start="2020-03-01", end="2020-06-01")
+    assert len(fake.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert first.index[0] >= pd.Timestamp("2020-03-01")
+    assert first.index[-1] < pd.Timestamp("2020-06-01")
+
+
+def test_narrower_request_is_served_from_disk(store, fake):
+    store.get("ABC", start="2020-03-01")
+    df = store.get("ABC", start="2020-04-01", end="2020-05-01")
+    assert len(fake.calls) == 1
+    expected = fake.prices.loc["2020-04-01":"2020-04-30"]
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+
+def test_head_extension_downloads_only_earlier_rows(store, fake):
+    store.get("ABC", start="2020-06-01")
+    first_stored = store.get("ABC", start="2020-06-01").index[0]
+    df = store.get("ABC", start="2020-02-01")
+    assert len(fake.calls) == 2
+    _, start, end = fake.calls[-1]
+    assert start == pd.Timestamp("2020-02-01")
+    assert end == first_stored + pd.Timedelta(days=1)
+    pd.testing.assert_frame_equal(df, fake.prices.loc["2020-02-01":], check_freq=False)
+
+
+def test_tail_refresh_downloads_only_new_rows(tmp_path, monkeypatch):
+    fake = FakeYahoo(make_prices(end="2020-06-30"))
+    store = PriceStore(root=str(tmp_path), downloader=fake)
+    set_today(monkeypatch, "2020-06-30")
+    store.get("ABC", start="2020-01-01")
+
+    fake.prices = make_prices(end="2020-07-31")
+    set_today(monkeypatch, "2020-07-31")
+    df = store.get("ABC", start="2020-01-01")
+    assert len(fake.calls) == 2
+    _, start, end = fake.calls[-1]
+    # From the settled bar before the last stored one, open-ended
+    assert start == pd.Timestamp("2020-06-29")
+    assert end is None
+    pd.testing.assert_frame_equal(df, fake.prices, check_freq=False)
+
+    # Same day again: nothing to refresh
+    store.get("ABC", start="2020-01-01")
+    assert len(fake.calls) == 2
+
+
+def test_same_day_last_bar_is_fetched_again_once_stale(tmp_path, monkeypatch):
+    fake = FakeYahoo(make_prices(end="2020-06-30"))
+    store = PriceStore(root=str(tmp_path), downloader=fake, live_ttl=15 * 60)
+    set_today(monkeypatch, "2020-06-30", "11:00")
+    store.get("ABC", start="2020-01-01")
+
+    # Still within live_ttl: the intraday snapshot is served from disk
+    set_today(monkeypatch, "2020-06-30", "11:10")
+    store.get("ABC", start="2020-01-01")
+    assert len(fake.calls) == 1
+
+    # The session moved on: the last bar is downloaded again, nothing else is
+    fake.prices.loc["2020-06-30", ["Open", "High", "Low", "Close"]] += 5
+    set_today(monkeypatch, "2020-06-30", "16:30")
+    df = store.get("ABC", start="2020-01-01")
+    assert len(fake.calls) == 2
+    assert fake.calls[-1][1] == pd.Timestamp("2020-06-29")
+    assert df["Close"].iloc[-1] == fake.prices["Close"].iloc[-1]
+
+    # A window ending before the last bar never needs it, and max_age=0 forces it
+    store.get("ABC", start="2020-01-01", end="2020-06-30")
+    assert len(fake.calls) == 2
+    store.get("ABC", start="2020-01-01", max_age=0)
+    assert len(fake.calls) == 3
+
+
+def test_readjusted_history_is_downloaded_again(tmp_path, monkeypatch):
+    fake = FakeYahoo(make_prices(end="2020-06-30"))
+    store = PriceStore(root=str(tmp_path), downloader=fake)
+    set_today(monkeypatch, "2020-06-30")
+    store.get("ABC", start="2020-01-01")
+
+    # A 2:1 split: Yahoo halves every past adjusted price
+    split = make_prices(end="2020-07-31")
+    split[["Open", "High", "Low", "Close"]] /= 2
+    fake.prices = split
+    set_today(monkeypatch, "2020-07-31")
+    df = store.get("ABC", start="2020-01-01")
+    assert fake.calls[-1][1:] == (pd.Timestamp("2020-01-01"), None)
+    pd.testing.assert_frame_equal(df, split, check_freq=False)
+
+
+def test_mismatched_metadata_starts_over(store, fake):
+    store.get("ABC", start="2020-03-01")
+    df, meta = store._read("ABC")
+    # Data file replaced, metadata left behind by an interrupted writer
+    if store.ext == "parquet":
+        df.iloc[:-5].to_parquet(store._path("ABC", store.ext))
+    else:
+        df.iloc[:-5].to_pickle(store._path("ABC", store.ext))
+    store.get("ABC", start="2020-03-01")
+    assert len(fake.calls) == 2
+
+
+def test_unknown_ticker_returns_empty(tmp_path):
+    # yf.download gives a bare empty frame (no DatetimeIndex) for bad tickers
+    store = PriceStore(root=str(tmp_path), downloader=lambda ticker, start=None, end=None: pd.DataFrame())
+    assert store.get("NOPE", start="2020-03-01", end="2020-06-01").empty
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fakes import FakeYahoo, make_prices
+from price_store import PriceStore
+from projection import PERCENTILES, project, project_simulator
+from simulator import InvestmentSimulator
+
+BANDS = [f"P{q}" for q in PERCENTILES]
+RETURNS = np.random.default_rng(5).normal(0.0004, 0.012, 2000)
+
+
+def run(**kwargs):
+    kwargs = dict(start_value=1000.0, mu=0.1, sigma=0.2, years=5, n_paths=20_000, n_points=40, seed=1,
+                  historical_returns=RETURNS, **kwargs)
+    return project(**kwargs)
+
+
+def test_shape_and_percentile_order():
+    df = run(contribution=10.0, start_date="2024-01-01")
+    assert list(df.columns) == BANDS + ["Portfolio Value", "Total Invested"]
+    assert len(df) == 40
+    assert df.index[0] > pd.Timestamp("2024-01-01")
+    assert abs(df.index[-1] - pd.Timestamp("2029-01-01")) <= pd.Timedelta(days=1)
+    assert (np.diff(df[BANDS].to_numpy(), axis=1) >= 0).all()
+    pd.testing.assert_series_equal(df["Portfolio Value"], df["P50"], check_names=False)
+    assert df["Total Invested"].iloc[-1] == pytest.approx(1000.0 + 10.0 * 5 * 252)
+
+
+def test_seeded_runs_do_not_depend_on_workers():
+    pd.testing.assert_frame_equal(run(contribution=10.0, max_workers=1), run(contribution=10.0, max_workers=4))
+
+
+def test_median_without_contributions_is_lognormal():
+    df = run()
+    assert df["P50"].iloc[-1] == pytest.approx(1000.0 * np.exp(0.1 * 5), rel=0.02)
+
+
+# exact=False credits each interval's contributions with their average share
+# of its return; against the step-by-step walk that stays within 0.5% on the
+# same bootstrap draws and 3% for GBM, whose paths are drawn differently
+@pytest.mark.parametrize("method,tolerance", [("bootstrap", 0.005), ("gbm", 0.03)])
+def test_checkpoint_approximation_is_close_to_exact(method, tolerance):
+    fast = run(method=method, contribution=10.0)
+    exact = run(method=method, contribution=10.0, exact=True)
+    assert (fast[BANDS] / exact[BANDS] - 1).abs().to_numpy().max() < tolerance
+
+
+def test_project_simulator_continues_the_simulation(tmp_path):
+    store = PriceStore(root=str(tmp_path), downloader=FakeYahoo(make_prices("2018-01-01", "2020-12-31", seed=1)))
+    sim = InvestmentSimulator("ABC", 2018, daily_investment=10.0, store=store)
+    sim.simulate()
+    df = project_simulator(sim, years=2, n_paths=5_000, n_points=24, seed=0)
+    last = sim.data.index[-1]
+    assert len(df) == 24
+    assert df.index[0] > last
+    rows_per_year = int(round(sim._periods_per_year(sim.data.index)))
+    assert df["Total Invested"].iloc[-1] == pytest.approx(sim.data["Total Invested"].iloc[-1] + 10.0 * 2 * rows_per_year)
+    assert (np.diff(df[BANDS].to_numpy(), axis=1) >= 0).all()
@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+import price_store
+import range_cache
+from fakes import FakeYahoo, make_prices
+from price_store import PriceStore
+from range_cache import RangeCache
+
+
+class FakeStore:
+    """PriceStore stand-in serving ``self.prices`` and recording every get()."""
+
+    def __init__(self, prices: pd.DataFrame):
+        self.prices = prices
+        self.calls = []
+
+    def get(self, ticker, start=None, end=None, max_age=None):
+        self.calls.append((start, end, max_age))
+        df = self.prices
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df.index < pd.Timestamp(end)]
+        return df.copy()
+
+
+def set_now(monkeypatch, when: str):
+    now = pd.Timestamp(when)
+    monkeypatch.setattr(range_cache, "_now", lambda: now)
+    monkeypatch.setattr(price_store, "_now", lambda: now)
+
+
+@pytest.fixture
+def store():
+    return FakeStore(make_prices(end="2020-06-30"))
+
+
+def test_only_missing_edges_are_fetched(store, monkeypatch):
+    set_now(monkeypatch, "2020-06-30 18:00")
+    cache = RangeCache(source=store)
+    cache.get("ABC", "2020-03-01", "2020-05-01")
+    cache.get("ABC", "2020-03-15", "2020-04-15")
+    assert len(store.calls) == 1
+
+    df = cache.get("ABC", "2020-02-01", "2020-06-01")
+    assert [c[:2] for c in store.calls[1:]] == [
+        (pd.Timestamp("2020-02-01"), pd.Timestamp("2020-03-01")),
+        (pd.Timestamp("2020-05-01"), pd.Timestamp("2020-06-01")),
+    ]
+    pd.testing.assert_frame_equal(df, store.prices.loc["2020-02-01":"2020-05-31"], check_freq=False)
+
+
+def test_stale_same_day_bar_is_fetched_again(store, monkeypatch):
+    cache = RangeCache(source=store, live_ttl=15 * 60)
+    set_now(monkeypatch, "2020-06-30 11:00")
+    cache.get("ABC", "2020-01-01")
+
+    set_now(monkeypatch, "2020-06-30 11:10")
+    cache.get("ABC", "2020-01-01")
+    assert len(store.calls) == 1
+
+    store.prices.loc["2020-06-30", "Close"] += 5
+    set_now(monkeypatch, "2020-06-30 16:30")
+    df = cache.get("ABC", "2020-01-01")
+    # Only from the held last bar, and the source is told the snapshot is stale too
+    assert store.calls[-1] == (pd.Timestamp("2020-06-30"), pd.Timestamp("2020-07-01"), 15 * 60)
+    assert df["Close"].iloc[-1] == store.prices["Close"].iloc[-1]
+
+    # A window that stops before the last bar does not need it
+    cache.get("ABC", "2020-01-01", "2020-06-30")
+    assert len(store.calls) == 2
+
+
+def test_stale_bar_is_refreshed_through_price_store(tmp_path, monkeypatch):
+    fake = FakeYahoo(make_prices(end="2020-06-30"))
+    cache = RangeCache(source=PriceStore(root=str(tmp_path), downloader=fake), live_ttl=0)
+    set_now(monkeypatch, "2020-06-30 11:00")
+    cache.get("ABC", "2020-01-01")
+
+    # PriceStore already refreshed today; max_age still gets the new close through
+    fake.prices.loc["2020-06-30", ["Open", "High", "Low", "Close"]] += 5
+    set_now(monkeypatch, "2020-06-30 11:01")
+    df = cache.get("ABC", "2020-01-01")
+    assert len(fake.calls) == 2
+    assert df["Close"].iloc[-1] == fake.prices["Close"].iloc[-1]
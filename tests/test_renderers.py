@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from fakes import make_simulation
+from plotter import PlotBuilderOneDay
+from renderers import make_renderer
+
+
+@pytest.fixture(scope="module")
+def plot():
+    return PlotBuilderOneDay(make_simulation(), ticker="ABC", start_year=2015, max_points=200)
+
+
+def test_layered_frame_depends_only_on_its_index(plot):
+    renderer = make_renderer(plot, "agg-layered", scale=0.25)
+    n = len(plot._pv) * 3 // 4
+    for m in range(1, n, 37):
+        renderer.render(m)
+    after_others = renderer.render(n)
+    np.testing.assert_array_equal(after_others, make_renderer(plot, "agg-layered", scale=0.25).render(n))
+    # Going backwards rebuilds the layers the same way
+    np.testing.assert_array_equal(renderer.render(n // 3), make_renderer(plot, "agg-layered", scale=0.25).render(n // 3))
@@ -0,0 +1,70 @@
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from results_index import ResultsIndex, make_record, parse_summary, render_caption
+
+
+def record(ticker: str, cagr: float = 0.12, final_value: float = 2500.0) -> dict:
+    desc = {
+        "ticker": ticker, "start_year": 2015, "daily_investment": 10.0, "data_available": True,
+        "data_length": 1826, "start_date": pd.Timestamp("2015-01-01"), "end_date": pd.Timestamp("2019-12-31"),
+        "final_value": final_value, "total_invested": 1826 * 10.0, "calendar": "daily",
+        "Duration": 4.997, "cagr": cagr * 100,
+    }
+    risk = {"max_drawdown": -0.2345, "volatility": 0.1876, "sharpe": 0.91, "sortino": 1.27}
+    return make_record("INR", final_value, 18260.0, cagr, final_value - 18260.0, f"{ticker} Ltd", desc,
+                       0.1034, 0.2156, risk)
+
+
+def parts(index: ResultsIndex) -> list:
+    return glob.glob(os.path.join(index.root, f"runs*.{index.ext}"))
+
+
+def test_append_writes_one_part_per_call(tmp_path):
+    index = ResultsIndex(root=str(tmp_path))
+    index.append(record("AAA"))
+    index.append(record("BBB"), record("CCC"))
+    assert len(parts(index)) == 2
+    df = index.load()
+    assert list(df["ticker"]) == ["AAA", "BBB", "CCC"]
+    assert str(df["recorded_at"].dtype) == "datetime64[ns]"
+    assert index.rank(by="cagr", top=1)["ticker"].iloc[0] == "AAA"
+
+
+def test_compaction_keeps_every_run(tmp_path):
+    index = ResultsIndex(root=str(tmp_path), max_parts=3)
+    for i in range(7):
+        index.append(record(f"T{i}", cagr=i / 100))
+    assert len(parts(index)) <= 3
+    df = index.load()
+    assert list(df["ticker"]) == [f"T{i}" for i in range(7)]
+    assert df["run_id"].is_unique
+
+    index.compact()
+    assert len(parts(index)) == 1
+    pd.testing.assert_frame_equal(ResultsIndex(root=str(tmp_path)).load(), df)
+
+
+def test_parse_summary_round_trips_a_caption(tmp_path):
+    original = record("ABC.NS", cagr=0.1234, final_value=31234.56)
+    path = tmp_path / "summaryABC.NS.txt"
+    path.write_text(render_caption(original), encoding="utf-8")
+    parsed = parse_summary(str(path))
+
+    for field in ("ticker", "stock_name", "currency", "start_year", "daily_investment", "calendar",
+                  "start_date", "end_date", "rows", "final_value", "total_invested", "sharpe", "sortino"):
+        assert parsed[field] == original[field], field
+    # The caption prints percentages with two decimals
+    for field in ("cagr", "mean_log_return", "stdev_log_return", "max_drawdown", "volatility"):
+        assert parsed[field] == pytest.approx(original[field], abs=5e-5), field
+    assert render_caption(parsed) == render_caption(original)
+
+
+def test_parse_summary_rejects_other_files(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("nothing to see", encoding="utf-8")
+    with pytest.raises(ValueError):
+        parse_summary(str(path))
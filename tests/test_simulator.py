@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fakes import FakeYahoo, make_prices
+from price_store import PriceStore
+from simulator import InvestmentSimulator
+
+MODES = [("daily", "session"), ("trading", "session"), ("trading", "accumulate")]
+
+
+@pytest.fixture
+def prices():
+    return make_prices("2018-01-01", "2020-12-31", seed=1)
+
+
+@pytest.fixture
+def store(tmp_path, prices):
+    return PriceStore(root=str(tmp_path), downloader=FakeYahoo(prices))
+
+
+def simulator(store, calendar, contribution) -> InvestmentSimulator:
+    return InvestmentSimulator("ABC", 2018, daily_investment=10.0, store=store,
+                               calendar=calendar, contribution=contribution)
+
+
+@pytest.mark.parametrize("calendar,contribution", MODES)
+def test_append_matches_full_simulation(store, prices, calendar, contribution):
+    full = simulator(store, calendar, contribution)
+    full.simulate()
+
+    sim = simulator(store, calendar, contribution)
+    sim.fetch_data()
+    sim.data = sim.data.loc[:"2019-12-31"]
+    sim.simulate()
+    sim.stats()  # running moments are carried through the appends
+    new = prices["Close"].loc["2020-01-01":]
+    for chunk in np.array_split(np.arange(len(new)), 4):
+        added = sim.append(new.iloc[chunk])
+        assert len(added) > 0
+
+    assert sim.stats() == pytest.approx(full.stats())
+    pd.testing.assert_frame_equal(sim.data, full.data, check_freq=False)
+    assert sim.get_results()[:3] == pytest.approx(full.get_results()[:3])
+
+
+def assert_compact_matches(result, sim, rtol=1e-12):
+    frame = result.to_frame()
+    expected = sim.data[list(result.COLUMNS)]
+    pd.testing.assert_frame_equal(frame, expected, check_freq=False, check_names=False, rtol=rtol)
+    assert result.stats() == pytest.approx(sim.stats(), rel=rtol ** 0.5)
+    assert (result.final_value, result.total_invested) == pytest.approx(sim.get_results()[:2], rel=rtol)
+
+
+@pytest.mark.parametrize("calendar,contribution", MODES)
+def test_compact_result_matches_simulate(store, calendar, contribution):
+    sim = simulator(store, calendar, contribution)
+    sim.simulate()
+    assert_compact_matches(sim.simulate_compact(), sim)
+    assert_compact_matches(sim.simulate_compact(dtype=np.float32), sim, rtol=1e-5)
+
+
+def test_compact_result_matches_after_append(store, prices):
+    full = simulator(store, "daily", "session")
+    full.simulate()
+
+    sim = simulator(store, "daily", "session")
+    sim.fetch_data()
+    sim.data = sim.data.loc[:"2019-12-31"]
+    sim.simulate()
+    sim.append(prices["Close"].loc["2020-01-01":])
+    result = sim.simulate_compact()
+    assert len(result) == len(full.data)
+    assert_compact_matches(result, full)
+    assert_compact_matches(result, sim)
+
+
+def test_append_ignores_known_dates(store, prices):
+    sim = simulator(store, "daily", "session")
+    sim.simulate()
+    rows = len(sim.data)
+    assert sim.append(prices["Close"].loc[:"2020-06-30"]).empty
+    assert len(sim.data) == rows
+
+
+@pytest.mark.parametrize("calendar,contribution", MODES)
+def test_start_date_curve_first_row_matches_get_results(store, calendar, contribution):
+    sim = simulator(store, calendar, contribution)
+    sim.simulate()
+    final_value, total_invested, cagr, df, _ = sim.get_results()
+    first = sim.start_date_curve().iloc[0]
+    assert first["Final Value"] == pytest.approx(final_value)
+    assert first["Total Invested"] == pytest.approx(total_invested)
+    assert first["Years"] == pytest.approx(sim._years(df.index))
+    assert first["CAGR"] == pytest.approx(cagr)
+
+
+@pytest.mark.parametrize("calendar,contribution", MODES)
+def test_start_date_curve_matches_late_start(store, calendar, contribution):
+    sim = simulator(store, calendar, contribution)
+    sim.simulate()
+    curve = sim.start_date_curve()
+    start = curve.index[len(curve) // 2]
+
+    late = simulator(store, calendar, contribution)
+    late.fetch_data()
+    late.data = late.data.loc[start:]
+    late.simulate()
+    final_value, total_invested, cagr, _, _ = late.get_results()
+    assert curve.loc[start, "Final Value"] == pytest.approx(final_value)
+    assert curve.loc[start, "Total Invested"] == pytest.approx(total_invested)
+    assert curve.loc[start, "CAGR"] == pytest.approx(cagr)
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from fakes import make_prices
+from utils import simulate_sip
+
+
+def reference_sip(data: pd.Series, monthly_amount: float) -> pd.DataFrame:
+    """The original row-by-row SIP loop."""
+    investment = 0
+    total_shares = 0
+    results = []
+    for date in pd.date_range(data.index[0], data.index[-1], freq="MS"):
+        if date not in data.index:
+            future_dates = data[data.index > date]
+            if future_dates.empty:
+                continue
+            date = future_dates.index[0]
+        price = float(data.loc[date])
+        total_shares += monthly_amount / price
+        investment += monthly_amount
+        results.append((date, investment, total_shares * price))
+    return pd.DataFrame(results, columns=["Date", "Invested", "Value"]).set_index("Date")
+
+
+@pytest.mark.parametrize("start", ["2019-01-01", "2019-01-15"])
+def test_simulate_sip_matches_reference_loop(start):
+    close = make_prices(start, "2021-06-30", seed=3)["Close"]
+    # First-of-month sessions missing (holidays), so those dates roll forward
+    close = close.drop(pd.to_datetime(["2019-04-01", "2020-06-01", "2021-03-01"]), errors="ignore")
+    expected = reference_sip(close, 500.0)
+    pd.testing.assert_frame_equal(simulate_sip(close, 500.0), expected, check_index_type=False)
+    pd.testing.assert_frame_equal(simulate_sip(close.to_frame("Close"), 500.0), expected, check_index_type=False)
+
+
+def test_simulate_sip_with_mid_month_start_skips_to_next_month():
+    close = make_prices("2020-03-18", "2020-07-31")["Close"]
+    df = simulate_sip(close, 100.0)
+    assert list(df.index) == list(pd.to_datetime(["2020-04-01", "2020-05-01", "2020-06-01", "2020-07-01"]))
+    assert df["Invested"].iloc[-1] == 400.0
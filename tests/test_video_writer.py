@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+from video_writer import VideoWriter
+
+
+class FakeProc:
+    killed = False
+
+    def kill(self):
+        self.killed = True
+
+
+class FakeEncoder:
+    """FFMPEG_VideoWriter stand-in: counts frames into the output file, fails on close when asked."""
+
+    def __init__(self, output, fail_on_close=False):
+        self.output = output
+        self.fail_on_close = fail_on_close
+        self.proc = FakeProc()
+        self.frames = 0
+        open(output, "wb").close()
+
+    def write_frame(self, frame):
+        if self.proc.killed:
+            raise BrokenPipeError("ffmpeg is gone")
+        self.frames += 1
+
+    def close(self):
+        if self.fail_on_close:
+            raise OSError("ffmpeg error")
+
+
+class FakeVideoWriter(VideoWriter):
+    def __init__(self, output, fail_on_close=False, **kwargs):
+        super().__init__(output, width=4, height=6, **kwargs)
+        self.fail_on_close = fail_on_close
+
+    def _encoder(self):
+        self.encoder = FakeEncoder(self.output, self.fail_on_close)
+        return self.encoder
+
+
+def frame():
+    return np.zeros((6, 4, 4), dtype=np.uint8)
+
+
+def test_holds_are_written_and_file_kept(tmp_path):
+    output = str(tmp_path / "reel.mp4")
+    with FakeVideoWriter(output) as writer:
+        writer.write(frame())
+        writer.write(frame(), repeat=3)
+    assert writer.frames_written == writer.encoder.frames == 4
+    assert os.path.exists(output)
+
+
+def test_encoder_error_is_raised_on_clean_exit(tmp_path):
+    with pytest.raises(OSError, match="ffmpeg error"):
+        with FakeVideoWriter(str(tmp_path / "reel.mp4"), fail_on_close=True) as writer:
+            writer.write(frame())
+
+
+def test_error_in_block_kills_encoder_and_removes_partial_file(tmp_path):
+    output = str(tmp_path / "reel.mp4")
+    with pytest.raises(KeyError, match="render failed"):
+        with FakeVideoWriter(output, fail_on_close=True) as writer:
+            writer.write(frame(), repeat=2)
+            raise KeyError("render failed")
+    assert writer.encoder.proc.killed
+    assert not os.path.exists(output)